@@ -0,0 +1,47 @@
+"""add body fingerprint and its unique constraint to webhook_events
+
+Revision ID: 9c2e7d4a1f30
+Revises: 634bbf55b755
+Create Date: 2026-10-18 10:12:41.503118
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9c2e7d4a1f30"
+down_revision: str | None = "634bbf55b755"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # 공급자 이벤트 ID가 없는 요청의 멱등 backstop: 본문 지문(blake2b-128 hex)을 저장하고
+    # (customer_id, source, fingerprint)에 고유제약을 건다. event_id가 있는 행은
+    # fingerprint가 NULL이라 NULL distinct 규칙으로 충돌하지 않는다.
+    op.add_column("webhook_events", sa.Column("fingerprint", sa.String(length=32), nullable=True))
+    op.create_index(
+        op.f("ix_webhook_events_fingerprint"),
+        "webhook_events",
+        ["fingerprint"],
+        unique=False,
+    )
+    op.create_unique_constraint(
+        "uq_webhook_events_customer_source_fingerprint",
+        "webhook_events",
+        ["customer_id", "source", "fingerprint"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "uq_webhook_events_customer_source_fingerprint",
+        "webhook_events",
+        type_="unique",
+    )
+    op.drop_index(op.f("ix_webhook_events_fingerprint"), table_name="webhook_events")
+    op.drop_column("webhook_events", "fingerprint")
@@ -0,0 +1,253 @@
+"""range-partition webhook_events by received_at and move idempotency to a key ledger
+
+Revision ID: b7e4c1d92a6f
+Revises: 9c2e7d4a1f30
+Create Date: 2026-10-18 15:40:12.318604
+
+"""
+
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e4c1d92a6f"
+down_revision: str | None = "9c2e7d4a1f30"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# 파티션 테이블의 고유 인덱스는 파티션 키(received_at)를 포함해야 해서 기존
+# (customer_id, source, event_id|fingerprint) 고유제약을 그대로 옮길 수 없다.
+# 대신 원장(webhook_event_keys)에 키를 먼저 등록하는 BEFORE INSERT 트리거가 중복 행을
+# 건너뛴다(RETURN NULL) — 앱의 `ON CONFLICT DO NOTHING RETURNING id`(단건·prepared·비동기·
+# bulk·COPY 병합)는 그대로 "0행 적재 = 중복"으로 동작한다.
+#
+# 원장도 수신 월(period) 단위 RANGE 파티션이다 — 전역 고유 인덱스가 끝없이 자라지 않게.
+# 고유성은 (키, 월) 단위라 같은 달과 앞 달 파티션을 보고, beat가 그보다 오래된 원장 파티션을
+# 통째로 지운다. 그래서 중복 판정 창은 최소 한 달(28일)~최대 두 달이고, 창보다 오래된
+# 수신 시각의 행(과거 적재)은 원장 없이 그대로 들어간다.
+_CLAIM_KEY_FUNCTION = """
+CREATE FUNCTION webhook_events_claim_key() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    -- 월 계산은 UTC 벽시계(timestamp)에서 — 세션 TimeZone과 무관하게
+    claim_month timestamp := date_trunc('month', NEW.received_at AT TIME ZONE 'UTC');
+    claim_period timestamptz := claim_month AT TIME ZONE 'UTC';
+    claim_key varchar;
+BEGIN
+    IF NEW.source IS NULL OR (NEW.event_id IS NULL AND NEW.fingerprint IS NULL)
+       OR claim_month < date_trunc('month', now() AT TIME ZONE 'UTC') - interval '1 month' THEN
+        RETURN NEW;
+    END IF;
+    claim_key := CASE WHEN NEW.event_id IS NOT NULL THEN 'e:' || NEW.event_id
+                      ELSE 'f:' || NEW.fingerprint END;
+    -- 달 경계를 넘긴 재전송: 앞 달 원장에 있으면 중복
+    IF EXISTS (
+        SELECT 1 FROM webhook_event_keys k
+        WHERE k.period = (claim_month - interval '1 month') AT TIME ZONE 'UTC'
+          AND k.customer_id = NEW.customer_id
+          AND k.source = NEW.source
+          AND k.dedup_key = claim_key
+    ) THEN
+        RETURN NULL;
+    END IF;
+    INSERT INTO webhook_event_keys (customer_id, source, dedup_key, period)
+    VALUES (NEW.customer_id, NEW.source, claim_key, claim_period)
+    ON CONFLICT DO NOTHING;
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+    RETURN NEW;
+END
+$$
+"""
+_CLAIM_KEY_TRIGGER = """
+CREATE TRIGGER webhook_events_claim_key
+BEFORE INSERT ON webhook_events
+FOR EACH ROW EXECUTE FUNCTION webhook_events_claim_key()
+"""
+_COLUMNS = "id, customer_id, source, payload, received_at, status, event_id, fingerprint"
+_DETACHED_PARTITIONS = r"""
+SELECT c.relname
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+LEFT JOIN pg_inherits i ON i.inhrelid = c.oid
+WHERE n.nspname = current_schema()
+  AND c.relkind = 'r'
+  AND c.relname ~ '^webhook_events_p\d{4}_\d{2}(_\d{2})?$'
+  AND (i.inhrelid IS NULL OR i.inhdetachpending)
+ORDER BY c.relname
+"""
+# 마이그레이션 시점에 고정 — 런타임 PARTITION_* 설정을 읽지 않는다(app.* import 없이 alembic만으로
+# 로드되어야 CI의 `alembic heads`가 돈다). 이후 파티션은 beat(app.partitions)가 이어서 만든다.
+_PARTITIONS_AHEAD = 3
+
+
+def _month_start(at: datetime) -> datetime:
+    at = at.astimezone(UTC)
+    return datetime(at.year, at.month, 1, tzinfo=UTC)
+
+
+def _next_month(start: datetime) -> datetime:
+    return datetime(start.year + start.month // 12, start.month % 12 + 1, 1, tzinfo=UTC)
+
+
+def _create_month_partition(parent: str, prefix: str, start: datetime) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {prefix}_p{start:%Y_%m} PARTITION OF {parent} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{_next_month(start).isoformat()}')"
+    )
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE webhook_events_partitioned (
+            id integer NOT NULL DEFAULT nextval('webhook_events_id_seq'),
+            customer_id uuid NOT NULL REFERENCES customers (id),
+            source varchar,
+            payload json,
+            received_at timestamptz NOT NULL DEFAULT now(),
+            status varchar NOT NULL,
+            event_id varchar,
+            fingerprint varchar(32),
+            CONSTRAINT webhook_events_partitioned_pkey PRIMARY KEY (id, received_at)
+        ) PARTITION BY RANGE (received_at)
+        """
+    )
+    # 기존 행의 가장 이른 달부터 _PARTITIONS_AHEAD달 뒤까지 월 단위 — 이후는 beat가 이어서 만든다
+    now = datetime.now(UTC)
+    oldest = op.get_bind().scalar(sa.text("SELECT min(received_at) FROM webhook_events"))
+    start = _month_start(oldest or now)
+    last = _month_start(now)
+    for _ in range(_PARTITIONS_AHEAD):
+        last = _next_month(last)
+    while start <= last:
+        op.execute(_create_month_partition("webhook_events_partitioned", "webhook_events", start))
+        start = _next_month(start)
+
+    op.execute(
+        f"""
+        INSERT INTO webhook_events_partitioned ({_COLUMNS})
+        SELECT id, customer_id, source, payload, coalesce(received_at, now()), status,
+               event_id, fingerprint
+        FROM webhook_events
+        """
+    )
+
+    op.execute(
+        """
+        CREATE TABLE webhook_event_keys (
+            customer_id uuid NOT NULL,
+            source varchar NOT NULL,
+            dedup_key varchar NOT NULL,
+            period timestamptz NOT NULL,
+            CONSTRAINT webhook_event_keys_pkey PRIMARY KEY (customer_id, source, dedup_key, period)
+        ) PARTITION BY RANGE (period)
+        """
+    )
+    # 원장은 앞 달(중복 판정 창)부터 — 그보다 오래된 키는 옮기지 않는다
+    start = _month_start(_month_start(now) - timedelta(days=1))
+    while start <= last:
+        op.execute(_create_month_partition("webhook_event_keys", "webhook_event_keys", start))
+        start = _next_month(start)
+    op.execute(
+        """
+        INSERT INTO webhook_event_keys (customer_id, source, dedup_key, period)
+        SELECT customer_id, source,
+               CASE WHEN event_id IS NOT NULL THEN 'e:' || event_id ELSE 'f:' || fingerprint END,
+               date_trunc('month', received_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+        FROM webhook_events_partitioned
+        WHERE source IS NOT NULL AND (event_id IS NOT NULL OR fingerprint IS NOT NULL)
+          AND received_at >= (date_trunc('month', now() AT TIME ZONE 'UTC') - interval '1 month')
+                             AT TIME ZONE 'UTC'
+        ON CONFLICT DO NOTHING
+        """
+    )
+
+    op.execute("ALTER SEQUENCE webhook_events_id_seq OWNED BY webhook_events_partitioned.id")
+    op.drop_table("webhook_events")
+    op.rename_table("webhook_events_partitioned", "webhook_events")
+    op.execute(
+        "ALTER TABLE webhook_events RENAME CONSTRAINT webhook_events_partitioned_pkey "
+        "TO webhook_events_pkey"
+    )
+    # 고객별 조회(재처리 등)는 기간 조건과 함께 — 파티션 프루닝 뒤 파티션 안에서 인덱스 탐색
+    op.create_index(
+        op.f("ix_webhook_events_customer_id_received_at"),
+        "webhook_events",
+        ["customer_id", "received_at"],
+        unique=False,
+    )
+    op.execute(_CLAIM_KEY_FUNCTION)
+    op.execute(_CLAIM_KEY_TRIGGER)
+
+
+def downgrade() -> None:
+    # 떼어 낸(detach) 파티션이나 분리 대기 파티션의 행은 부모를 읽어서는 옮길 수 없다 —
+    # 조용히 잃지 않도록 다시 붙이거나(ATTACH PARTITION) 지운 뒤에만 되돌린다
+    leftovers = op.get_bind().scalars(sa.text(_DETACHED_PARTITIONS)).all()
+    if leftovers:
+        raise RuntimeError(
+            "Cannot downgrade while detached webhook_events partitions exist "
+            f"({', '.join(leftovers)}): reattach or drop them first"
+        )
+    op.execute("DROP TRIGGER webhook_events_claim_key ON webhook_events")
+    op.execute("DROP FUNCTION webhook_events_claim_key()")
+    op.create_table(
+        "webhook_events_plain",
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('webhook_events_id_seq')"),
+            nullable=False,
+        ),
+        sa.Column("customer_id", sa.UUID(), nullable=False),
+        sa.Column("source", sa.String(), nullable=True),
+        sa.Column("payload", sa.JSON(), nullable=True),
+        sa.Column(
+            "received_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("event_id", sa.String(), nullable=True),
+        sa.Column("fingerprint", sa.String(length=32), nullable=True),
+        sa.ForeignKeyConstraint(["customer_id"], ["customers.id"]),
+        sa.PrimaryKeyConstraint("id", name="webhook_events_plain_pkey"),
+    )
+    op.execute(
+        f"INSERT INTO webhook_events_plain ({_COLUMNS}) SELECT {_COLUMNS} FROM webhook_events"
+    )
+    op.execute("ALTER SEQUENCE webhook_events_id_seq OWNED BY webhook_events_plain.id")
+    op.drop_table("webhook_events")  # 파티션도 함께 삭제
+    op.drop_table("webhook_event_keys")  # 원장 파티션도 함께 삭제
+    op.rename_table("webhook_events_plain", "webhook_events")
+    op.execute(
+        "ALTER TABLE webhook_events RENAME CONSTRAINT webhook_events_plain_pkey "
+        "TO webhook_events_pkey"
+    )
+    for column in (
+        "customer_id",
+        "id",
+        "received_at",
+        "source",
+        "status",
+        "event_id",
+        "fingerprint",
+    ):
+        op.create_index(op.f(f"ix_webhook_events_{column}"), "webhook_events", [column])
+    op.create_unique_constraint(
+        "uq_webhook_events_customer_source_event",
+        "webhook_events",
+        ["customer_id", "source", "event_id"],
+    )
+    op.create_unique_constraint(
+        "uq_webhook_events_customer_source_fingerprint",
+        "webhook_events",
+        ["customer_id", "source", "fingerprint"],
+    )
@@ -0,0 +1,57 @@
+"""add webhook_event_archives segment index for cold-archived events
+
+Revision ID: c3a8f5e27b14
+Revises: b7e4c1d92a6f
+Create Date: 2026-10-18 17:05:48.902115
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3a8f5e27b14"
+down_revision: str | None = "b7e4c1d92a6f"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # 콜드 보관 세그먼트 목록(app/archive.py) — 재처리가 고객·이벤트 ID로 세그먼트 파일을 찾는다
+    op.create_table(
+        "webhook_event_archives",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("customer_id", sa.UUID(), nullable=False),
+        sa.Column("first_event_id", sa.Integer(), nullable=False),
+        sa.Column("last_event_id", sa.Integer(), nullable=False),
+        sa.Column("received_from", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("received_to", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("row_count", sa.Integer(), nullable=False),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["customer_id"], ["customers.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("path"),
+    )
+    op.create_index(
+        "ix_webhook_event_archives_customer_id_event_range",
+        "webhook_event_archives",
+        ["customer_id", "first_event_id", "last_event_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_webhook_event_archives_customer_id_event_range",
+        table_name="webhook_event_archives",
+    )
+    op.drop_table("webhook_event_archives")
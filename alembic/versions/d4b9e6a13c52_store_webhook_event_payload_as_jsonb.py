@@ -0,0 +1,80 @@
+"""store webhook_events.payload as jsonb with lz4 toast compression and path indexes
+
+Revision ID: d4b9e6a13c52
+Revises: c3a8f5e27b14
+Create Date: 2026-10-18 18:21:07.554630
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d4b9e6a13c52"
+down_revision: str | None = "c3a8f5e27b14"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# lz4 TOAST 압축(PostgreSQL 14+, --with-lz4 빌드)이면 타입 변경으로 다시 쓰는 행부터 lz4로.
+# 없으면(이전 버전·lz4 없는 빌드) 기본 pglz로 진행한다.
+_TRY_LZ4 = """
+DO $$
+BEGIN
+    SET LOCAL default_toast_compression = 'lz4';
+EXCEPTION WHEN undefined_object OR invalid_parameter_value THEN
+    RAISE NOTICE 'lz4 TOAST compression unavailable, keeping pglz';
+END
+$$
+"""
+_SET_LZ4 = """
+DO $$
+BEGIN
+    IF current_setting('default_toast_compression', true) = 'lz4' THEN
+        ALTER TABLE webhook_events ALTER COLUMN payload SET COMPRESSION lz4;
+    END IF;
+END
+$$
+"""
+_RESET_COMPRESSION = """
+DO $$
+BEGIN
+    IF current_setting('server_version_num')::int >= 140000 THEN
+        ALTER TABLE webhook_events ALTER COLUMN payload SET COMPRESSION default;
+    END IF;
+END
+$$
+"""
+
+# 기본 경로 식 인덱스(app.payload_paths의 기본 PAYLOAD_PATH_INDEXES) — 마이그레이션 시점에 고정.
+# 설정에 따른 추가·삭제(GIN 포함)는 `python -m app.payload_paths`가 맞춘다.
+_PATH_INDEXES = {
+    "ix_webhook_events_payload_stripe_type": (
+        "(customer_id, (payload #>> '{type}')) WHERE source = 'stripe'"
+    ),
+    "ix_webhook_events_payload_stripe_object_id": (
+        "(customer_id, (payload #>> '{data,object,id}')) WHERE source = 'stripe'"
+    ),
+    "ix_webhook_events_payload_github_repository": (
+        "(customer_id, (payload #>> '{repository,full_name}')) WHERE source = 'github'"
+    ),
+}
+_GIN_INDEX = "ix_webhook_events_payload_gin"
+
+
+def upgrade() -> None:
+    # json(텍스트) → jsonb(분해된 바이너리): 경로 조회가 문서를 다시 파싱하지 않는다.
+    # 모든 파티션을 다시 쓰며 ACCESS EXCLUSIVE를 잡는다 — 큰 테이블은 점검 시간에.
+    op.execute(_TRY_LZ4)
+    op.execute("ALTER TABLE webhook_events ALTER COLUMN payload TYPE jsonb USING payload::jsonb")
+    op.execute(_SET_LZ4)
+    for name, definition in _PATH_INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON webhook_events {definition}")
+
+
+def downgrade() -> None:
+    # CLI가 만들었을 수 있는 GIN까지 — 되돌린 json 컬럼에는 남길 수 없다
+    for name in [*_PATH_INDEXES, _GIN_INDEX]:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute(_RESET_COMPRESSION)
+    op.execute("ALTER TABLE webhook_events ALTER COLUMN payload TYPE json USING payload::json")
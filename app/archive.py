@@ -0,0 +1,259 @@
+"""webhook_events 콜드 보관 — 오래된 행을 압축 NDJSON 세그먼트로 옮기고 DB에서 지운다.
+
+감사용 이력은 남겨야 하지만 hot 테이블에 둘 필요는 없다. `ARCHIVE_AFTER_DAYS`보다 오래된
+행을 서버 측 커서로 흘려 읽어(한 번에 `ARCHIVE_DELETE_BATCH_ROWS`행) 세그먼트 파일에 쓴다.
+
+- 세그먼트: `ARCHIVE_DIR/<customer_id>/<YYYY>/<MM>/<DD>/<첫 id>-<끝 id>.ndjson.gz` — 고객·수신
+  날짜(UTC)마다, 최대 `ARCHIVE_SEGMENT_ROWS`행. 한 줄이 행 하나이고 `app.bulk_loader` 입력과
+  같은 형식이라 `zcat 세그먼트 | python -m app.bulk_loader -`로 되돌릴 수 있다
+- payload는 DB 텍스트를 그대로 옮긴다(디코드·재인코딩 없음)
+- 파일을 fsync·rename으로 완성한 뒤, 목록(webhook_event_archives) 등록과 원본 행 DELETE
+  (`ARCHIVE_DELETE_BATCH_ROWS`행씩)를 한 트랜잭션으로 커밋 — 중간에 죽으면 다음 실행이 같은
+  행을 같은 파일 이름으로 다시 쓴다
+- 재처리(`replay_event`)는 DB에 행이 없으면 `find_event`로 목록을 찾아 세그먼트에서 읽는다
+
+gzip(표준 라이브러리)을 쓴다 — 추가 의존성 없이 `zcat`으로 바로 감사할 수 있다.
+파티션 만료(`PARTITION_RETENTION_DAYS`)는 보관보다 늦게 잡을 것 — 보관 뒤 빈 파티션은
+`PARTITION_EXPIRE_ACTION=drop`으로 떨어진다.
+
+사용법:
+    python -m app.archive [--older-than-days N]
+"""
+
+import argparse
+import gzip
+import logging
+import os
+import uuid
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from typing import IO, Any
+from uuid import UUID
+
+import orjson
+from sqlalchemy import Row, text
+from sqlalchemy.orm import Session
+
+from . import database
+from .celery_worker import celery
+from .config import settings
+from .database import SessionLocal
+from .metrics import EVENT_ARCHIVE_TOTAL
+from .repositories.webhook_event_archive_repository import WebhookEventArchiveRepository
+from .repositories.webhook_event_repository import WebhookEventRepository
+
+logger = logging.getLogger(__name__)
+
+SUFFIX = ".ndjson.gz"
+# 겹친 실행(beat 주기보다 긴 보관)을 막는 PostgreSQL advisory lock 키
+_LOCK_KEY = 0x7765_6261
+
+
+@dataclass
+class ArchiveResult:
+    segments: int = 0
+    rows: int = 0
+
+
+class _Segment:
+    """세그먼트 파일 하나 — 임시 이름으로 쓰고 `close`에서 fsync 후 최종 이름으로 바꾼다."""
+
+    def __init__(self, root: Path, customer_id: UUID, day: date):
+        self.customer_id = customer_id
+        self.day = day
+        self.directory = root / str(customer_id) / f"{day:%Y/%m/%d}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ids: list[int] = []
+        self.received_from: datetime | None = None
+        self.received_to: datetime | None = None
+        self._temp = self.directory / f".{uuid.uuid4().hex}.tmp"
+        self._raw: IO[bytes] = open(self._temp, "wb")  # noqa: SIM115 — close()에서 닫는다
+        self._gzip = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=6)
+
+    def write(self, row: Row) -> None:
+        # id를 첫 키로 — 재처리 조회가 줄 앞부분만 보고 건너뛸 수 있다
+        record = {
+            "id": row.id,
+            "customer_id": row.customer_id,
+            "source": row.source,
+            "event_id": row.event_id,
+            "fingerprint": row.fingerprint,
+            "status": row.status,
+            "received_at": row.received_at,
+            "payload": None if row.payload is None else orjson.Fragment(row.payload),
+        }
+        self._gzip.write(orjson.dumps(record) + b"\n")
+        self.ids.append(row.id)
+        self.received_from = self.received_from or row.received_at
+        self.received_to = row.received_at
+
+    def close(self) -> Path:
+        self._gzip.close()
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        self._raw.close()
+        path = self.directory / f"{min(self.ids)}-{max(self.ids)}{SUFFIX}"
+        os.replace(self._temp, path)
+        return path
+
+    def discard(self) -> None:
+        self._gzip.close()
+        self._raw.close()
+        self._temp.unlink(missing_ok=True)
+
+
+def archive_events(
+    before: datetime,
+    *,
+    archive_dir: str | Path,
+    segment_rows: int = 50_000,
+    delete_batch_rows: int = 5_000,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> ArchiveResult:
+    """`before` 이전 행을 세그먼트로 옮기고 지운다 — 세그먼트마다 커밋."""
+    root = Path(archive_dir)
+    result = ArchiveResult()
+    # 읽기(서버 측 커서)와 쓰기(세그먼트마다 커밋)는 연결을 나눈다 — 커밋이 커서를 닫지 않게
+    with session_factory() as reader, session_factory() as writer:
+        rows = WebhookEventRepository.stream_received_before(
+            reader, before, yield_per=delete_batch_rows
+        )
+        segment: _Segment | None = None
+        try:
+            for row in rows:
+                day = _utc(row.received_at).date()
+                if segment is not None and (
+                    segment.customer_id != row.customer_id
+                    or segment.day != day
+                    or len(segment.ids) >= segment_rows
+                ):
+                    _commit_segment(writer, root, segment, before, delete_batch_rows, result)
+                    segment = None
+                if segment is None:
+                    segment = _Segment(root, row.customer_id, day)
+                segment.write(row)
+            if segment is not None:
+                _commit_segment(writer, root, segment, before, delete_batch_rows, result)
+                segment = None
+        finally:
+            if segment is not None:
+                segment.discard()
+    return result
+
+
+def _commit_segment(
+    db: Session,
+    root: Path,
+    segment: _Segment,
+    before: datetime,
+    delete_batch_rows: int,
+    result: ArchiveResult,
+) -> None:
+    path = segment.close()
+    WebhookEventArchiveRepository.create(
+        db,
+        customer_id=segment.customer_id,
+        path=path.relative_to(root).as_posix(),
+        event_ids=segment.ids,
+        received_from=segment.received_from,  # type: ignore[arg-type]  # 행을 쓴 세그먼트
+        received_to=segment.received_to,  # type: ignore[arg-type]
+    )
+    for start in range(0, len(segment.ids), delete_batch_rows):
+        ids = segment.ids[start : start + delete_batch_rows]
+        WebhookEventRepository.delete_received_before(db, ids, before)
+    db.commit()
+    result.segments += 1
+    result.rows += len(segment.ids)
+    EVENT_ARCHIVE_TOTAL.labels(op="segments").inc()
+    EVENT_ARCHIVE_TOTAL.labels(op="archived").inc(len(segment.ids))
+    logger.info("Archived %d webhook_events rows to %s", len(segment.ids), path)
+
+
+def find_event(
+    db: Session,
+    *,
+    customer_id: UUID,
+    event_id: int,
+    received_on: date | None = None,
+    archive_dir: str | Path | None = None,
+) -> dict[str, Any] | None:
+    """보관된 이벤트 행(dict) — 목록에서 후보 세그먼트를 찾아 차례로 읽는다. 없으면 None."""
+    root = Path(archive_dir or settings.archive_dir)
+    segments = WebhookEventArchiveRepository.find_segments(
+        db, customer_id=customer_id, event_id=event_id, received_on=received_on
+    )
+    for segment in segments:
+        try:
+            with gzip.open(root / segment.path, "rb") as stream:
+                record = _scan(stream, event_id)
+        except FileNotFoundError:
+            EVENT_ARCHIVE_TOTAL.labels(op="missing").inc()
+            logger.warning("Archive segment %s is missing", segment.path)
+            continue
+        if record is not None:
+            EVENT_ARCHIVE_TOTAL.labels(op="replayed").inc()
+            return record
+    return None
+
+
+def _scan(lines: Iterable[bytes], event_id: int) -> dict[str, Any] | None:
+    # 줄마다 JSON을 디코드하지 않고 `{"id":<id>,` 접두사만 비교한다
+    prefix = b'{"id":%d,' % event_id
+    for line in lines:
+        if line.startswith(prefix):
+            return orjson.loads(line)
+    return None
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite(테스트)는 tz 없는 값을 돌려준다 — UTC로 간주
+    return value.astimezone(UTC) if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+@celery.task(name="tasks.archive_events")
+def archive_aged_events() -> None:
+    if not settings.archive_after_days:
+        return
+    before = datetime.now(UTC) - timedelta(days=settings.archive_after_days)
+    with database.engine.connect() as lock:
+        postgres = lock.dialect.name == "postgresql"
+        if postgres and not lock.scalar(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": _LOCK_KEY}
+        ):
+            logger.info("Skipping archive run: another run holds the lock")
+            return
+        try:
+            result = archive_events(
+                before,
+                archive_dir=settings.archive_dir,
+                segment_rows=settings.archive_segment_rows,
+                delete_batch_rows=settings.archive_delete_batch_rows,
+            )
+        finally:
+            if postgres:
+                lock.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _LOCK_KEY})
+    if result.rows:
+        logger.info("Archived %d rows in %d segments", result.rows, result.segments)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--older-than-days", type=int, default=settings.archive_after_days)
+    options = parser.parse_args()
+    if options.older_than_days <= 0:
+        parser.error("--older-than-days (또는 ARCHIVE_AFTER_DAYS)가 필요하다")
+
+    logging.basicConfig(level=logging.INFO)
+    result = archive_events(
+        datetime.now(UTC) - timedelta(days=options.older_than_days),
+        archive_dir=settings.archive_dir,
+        segment_rows=settings.archive_segment_rows,
+        delete_batch_rows=settings.archive_delete_batch_rows,
+    )
+    print(f"segments={result.segments} rows={result.rows}")
+
+
+if __name__ == "__main__":
+    main()
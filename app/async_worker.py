@@ -0,0 +1,250 @@
+"""asyncio 워커 — Celery prefork 대신 한 프로세스에서 여러 태스크를 동시에 처리한다.
+
+prefork + `worker_prefetch_multiplier=1`은 프로세스당 한 번에 태스크 하나를 처리하고,
+그 시간 대부분을 Postgres 응답을 기다리며 보낸다. 이 워커는 같은 큐(`default`·
+`high_priority`·`dead_letters`)의 Celery 메시지를 받아 이벤트 루프에서 동시에 실행한다.
+
+- 웹훅 태스크는 `process_webhook_async`(async_engine/asyncpg)로, 그 밖의 태스크
+  (`send_to_dlq` 등)는 동기 본문을 스레드에서 실행한다.
+- 동시 처리 상한은 `ASYNC_WORKER_MAX_IN_FLIGHT` — 브로커 prefetch(미확인 메시지 수)를
+  같은 값으로 두어 상한 이상은 받지도 않는다.
+- 태스크 의미는 그대로 유지한다:
+  - acks-late: 처리(적재·재발행·DLQ)가 끝난 뒤 ack. 프로세스가 죽으면 미확인 메시지는
+    브로커 visibility timeout 뒤 다시 전달된다.
+  - 재시도: `autoretry_for` 예외면 `retry_backoff` 규칙의 countdown으로 `retries + 1` 재발행.
+  - `max_retries` 초과·비재시도 오류는 태스크의 `on_failure`(DLQ)를 호출.
+
+kombu 채널은 스레드 안전하지 않으므로 소비·ack는 전용 스레드 하나가 전담하고,
+이벤트 루프는 처리 결과(ack/requeue)를 그 스레드에 넘긴다.
+
+    python -m app.async_worker -Q default,high_priority,dead_letters
+"""
+
+import argparse
+import asyncio
+import contextlib
+import functools
+import logging
+import queue
+import signal
+import threading
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from celery.utils.time import get_exponential_backoff_interval
+from kombu import Connection, Consumer, Queue
+from kombu.message import Message
+from prometheus_client import start_http_server
+
+from . import webhooks  # noqa: F401 — 태스크 레지스트리 등록
+from .celery_worker import celery
+from .config import settings
+from .metrics import ASYNC_WORKER_IN_FLIGHT, ASYNC_WORKER_TASKS_TOTAL
+from .publisher import task_publisher
+from .services.webhook_handler import process_webhook_async
+from .webhook_registry import TASK_REGISTRY
+
+logger = logging.getLogger(__name__)
+
+_DRAIN_TIMEOUT = 0.05  # 소비 스레드가 ack 요청을 확인하는 주기(초)
+
+
+class AsyncWorker:
+    def __init__(self, connection: Connection, queues: list[Queue], *, max_in_flight: int = 64):
+        self.connection = connection
+        self.queues = queues
+        self.max_in_flight = max_in_flight
+        self._handlers: dict[str, Callable[..., Awaitable[None]]] = {
+            task.name: functools.partial(process_webhook_async, source)
+            for source, task in TASK_REGISTRY.items()
+        }
+        self._settlements: queue.SimpleQueue[Callable[[], Any]] = queue.SimpleQueue()
+        self._in_flight: set[asyncio.Task] = set()
+        self._stopped = threading.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def run(self) -> None:
+        """소비 스레드를 띄우고 stop() 후 진행 중인 태스크가 끝날 때까지 기다린다."""
+        self._loop = asyncio.get_running_loop()
+        consumer = threading.Thread(target=self._consume, name="async-worker-consumer")
+        consumer.start()
+        try:
+            await asyncio.to_thread(self._stopped.wait)
+            if self._in_flight:
+                await asyncio.wait(self._in_flight)
+        finally:
+            self._stopped.set()
+            await asyncio.to_thread(consumer.join)
+
+    def stop(self, *_: Any) -> None:
+        self._stopped.set()
+
+    def _consume(self) -> None:
+        try:
+            self._consume_until_stopped()
+        finally:
+            # 연결 오류로 소비가 끝나도 run()이 멈추지 않게 — 미확인 메시지는 재전달된다
+            self._stopped.set()
+
+    def _consume_until_stopped(self) -> None:
+        with Consumer(
+            self.connection,
+            self.queues,
+            callbacks=[self._on_message],
+            accept=celery.conf.accept_content,
+        ) as consumer:
+            consumer.qos(prefetch_count=self.max_in_flight)
+            while not self._stopped.is_set():
+                with contextlib.suppress(TimeoutError):
+                    self.connection.drain_events(timeout=_DRAIN_TIMEOUT)
+                self._settle()
+        # 받기를 멈춘 뒤에도 진행 중인 태스크의 결과는 ack해야 한다
+        while self._in_flight:
+            self._settle(timeout=_DRAIN_TIMEOUT)
+        self._settle()
+
+    def _settle(self, timeout: float | None = None) -> None:
+        try:
+            settle = self._settlements.get(timeout=timeout) if timeout else None
+        except queue.Empty:
+            return
+        if settle is not None:
+            settle()
+        while True:
+            try:
+                settle = self._settlements.get_nowait()
+            except queue.Empty:
+                return
+            settle()
+
+    def _on_message(self, body: Any, message: Message) -> None:
+        # 소비 스레드 → 이벤트 루프
+        assert self._loop is not None
+        self._loop.call_soon_threadsafe(self._start, message)
+
+    def _start(self, message: Message) -> None:
+        task = asyncio.create_task(self.handle(message))
+        self._in_flight.add(task)
+        ASYNC_WORKER_IN_FLIGHT.set(len(self._in_flight))
+        task.add_done_callback(functools.partial(self._finished, message))
+
+    def _finished(self, message: Message, task: asyncio.Task) -> None:
+        # 어떤 식으로 끝나도 정산한다 — 미정산 메시지는 prefetch 자리를 영영 차지한다
+        self._in_flight.discard(task)
+        ASYNC_WORKER_IN_FLIGHT.set(len(self._in_flight))
+        if task.cancelled():
+            self._settlements.put(message.requeue)
+        elif (exc := task.exception()) is not None:
+            logger.error("Unhandled error in message handler", exc_info=exc)
+            ASYNC_WORKER_TASKS_TOTAL.labels(result="rejected").inc()
+            self._settlements.put(message.reject)
+        else:
+            self._settlements.put(task.result())
+
+    async def handle(self, message: Message) -> Callable[[], Any]:
+        """메시지 하나를 처리하고 소비 스레드가 실행할 정산(ack/requeue)을 돌려준다."""
+        headers = message.headers or {}
+        task_id = headers.get("id", "Unknown")
+        try:
+            retries = int(headers.get("retries") or 0)
+            task_id = headers["id"]
+            task = celery.tasks[headers["task"]]
+            args, kwargs, _ = message.decode()
+        except Exception:
+            # Celery 워커와 같이 알 수 없는 태스크·깨진 메시지는 버린다(재전달해도 같은 결과)
+            logger.exception("Discarding unprocessable message %s", task_id)
+            ASYNC_WORKER_TASKS_TOTAL.labels(result="rejected").inc()
+            return message.reject
+        try:
+            handler = self._handlers.get(task.name)
+            if handler is not None:
+                await handler(*args, **kwargs)
+            else:
+                await asyncio.to_thread(task.run, *args, **kwargs)
+        except Exception as exc:
+            if isinstance(exc, tuple(getattr(task, "autoretry_for", ()))) and (
+                task.max_retries is None or retries < task.max_retries
+            ):
+                return await self._retry(task, message, args, kwargs, retries, exc)
+            logger.exception("Task %s[%s] failed", task.name, task_id)
+            ASYNC_WORKER_TASKS_TOTAL.labels(result="failed").inc()
+            try:
+                # Celery와 같이 on_failure(DLQ) — 동기 발행이라 스레드에서
+                await asyncio.to_thread(task.on_failure, exc, task_id, args, kwargs, None)
+            except Exception:
+                logger.exception("Could not dead-letter %s[%s]", task.name, task_id)
+                return message.requeue
+            return message.ack
+        ASYNC_WORKER_TASKS_TOTAL.labels(result="succeeded").inc()
+        return message.ack
+
+    async def _retry(
+        self,
+        task: Any,
+        message: Message,
+        args: list[Any],
+        kwargs: dict[str, Any],
+        retries: int,
+        exc: Exception,
+    ) -> Callable[[], Any]:
+        """`autoretry_for` + `retry_backoff`와 같은 countdown으로 재발행 후 원본을 ack한다."""
+        # 기본값은 celery.app.autoretry와 같다(데코레이터에 없으면 태스크 속성도 없다)
+        countdown = task.default_retry_delay
+        retry_backoff = int(getattr(task, "retry_backoff", False))
+        if retry_backoff:
+            countdown = get_exponential_backoff_interval(
+                factor=retry_backoff,
+                retries=retries,
+                maximum=getattr(task, "retry_backoff_max", 600),
+                full_jitter=getattr(task, "retry_jitter", True),
+            )
+        logger.warning(
+            "Retrying %s[%s] in %ss: %r", task.name, message.headers["id"], countdown, exc
+        )
+        try:
+            await task_publisher.publish(
+                task,
+                args,
+                kwargs=kwargs,
+                task_id=message.headers["id"],
+                retries=retries + 1,
+                countdown=countdown,
+                queue=message.delivery_info.get("routing_key"),
+            )
+        except Exception:
+            # 재발행 실패 — 원본을 되돌려 다시 받는다(유실 방지)
+            logger.exception("Could not republish %s for retry", task.name)
+            return message.requeue
+        ASYNC_WORKER_TASKS_TOTAL.labels(result="retried").inc()
+        return message.ack
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-Q", "--queues", default="default,high_priority,dead_letters")
+    parser.add_argument("--metrics-port", type=int, default=None)
+    options = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if options.metrics_port:
+        start_http_server(options.metrics_port)
+    queues = [q for q in celery.conf.task_queues if q.name in options.queues.split(",")]
+
+    async def serve() -> None:
+        with Connection(settings.celery_broker_url) as connection:
+            worker = AsyncWorker(
+                connection, queues, max_in_flight=settings.async_worker_max_in_flight
+            )
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                loop.add_signal_handler(sig, worker.stop)
+            try:
+                await worker.run()
+            finally:
+                task_publisher.stop()
+
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
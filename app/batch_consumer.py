@@ -0,0 +1,253 @@
+"""배치 워커 — 큐에서 최대 N건/T ms를 모아 한 트랜잭션의 multi-row INSERT로 적재한다.
+
+Celery 워커는 메시지마다 세션을 열고 INSERT → COMMIT → REFRESH(왕복 3회 + fsync 1회)를
+한다. 배치 워커는 같은 큐(`default`·`high_priority`)의 Celery 메시지를 kombu로 직접 받아
+
+1. 최대 `WORKER_BATCH_SIZE`건 또는 첫 메시지 후 `WORKER_BATCH_MAX_DELAY_MS`까지 모으고
+2. 페이로드 검증(태스크와 같은 스키마) — 실패한 메시지만 DLQ
+3. `INSERT ... VALUES (...), (...) ON CONFLICT DO NOTHING` 한 문장 + COMMIT 한 번
+   (`WORKER_BATCH_LOADER=copy`면 COPY → 스테이징 → 병합, app/bulk_loader.py 참고) —
+   적재·행 단위 대체 규칙은 스트림 워커와 공용(app/event_batch.py)
+4. 메시지별로 ack 또는 재시도
+
+결과는 메시지마다 따로 정한다. 배치 문장이 데이터 오류(FK 위반 등)로 실패하면 행 단위로
+다시 적재해 문제 행만 DLQ로 보내고, 연결·일시적 오류면 배치 전체를 Celery와 같은
+지수 백오프로 재발행(`retries` + 1)한다 — `max_retries`를 넘으면 DLQ. 중복(고유제약 충돌)은
+태스크와 마찬가지로 정상 처리(ack)다.
+
+Celery 워커를 대체하는 별도 프로세스로 실행한다(opt-in):
+
+    python -m app.batch_consumer -Q high_priority
+"""
+
+import argparse
+import contextlib
+import logging
+import signal
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from celery.utils.time import get_exponential_backoff_interval
+from kombu import Connection, Consumer, Queue
+from kombu.message import Message
+from prometheus_client import start_http_server
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from . import claim_check, webhooks  # noqa: F401 — 태스크 레지스트리 등록
+from .celery_worker import celery
+from .config import settings
+from .database import SessionLocal
+from .event_batch import count_error, dead_letter_event, event_row, persist_events
+from .metrics import (
+    WORKER_BATCH_FLUSH_SECONDS,
+    WORKER_BATCH_MESSAGES_TOTAL,
+    WORKER_BATCH_SIZE,
+)
+from .repositories.webhook_event_repository import WebhookEventRepository
+from .webhook_registry import TASK_REGISTRY
+
+logger = logging.getLogger(__name__)
+
+_IDLE_POLL_SECONDS = 1.0
+
+
+@dataclass
+class _Delivery:
+    message: Message
+    task_name: str
+    task_id: str
+    args: list[Any]
+    kwargs: dict[str, Any]
+    retries: int
+    row: dict[str, Any]
+
+    @property
+    def raw_payload(self) -> Any:
+        return self.kwargs.get("raw_payload", self.args[1] if len(self.args) > 1 else None)
+
+
+class BatchConsumer:
+    def __init__(
+        self,
+        connection: Connection,
+        queues: list[Queue],
+        *,
+        batch_size: int = 100,
+        max_delay: float = 0.05,
+        session_factory: Callable[[], Session] = SessionLocal,
+        copy: bool = False,
+    ):
+        self.connection = connection
+        self.queues = queues
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.session_factory = session_factory
+        # copy=True면 배치를 COPY + 스테이징 병합으로(대량 따라잡기용, PostgreSQL 전용)
+        self._insert_batch = (
+            WebhookEventRepository.copy_insert_ignore_duplicates
+            if copy
+            else WebhookEventRepository.bulk_insert_ignore_duplicates
+        )
+        self._sources = {task.name: source for source, task in TASK_REGISTRY.items()}
+        self._buffer: list[Message] = []
+        self._first_at = 0.0
+        self._stopped = False
+
+    def run(self) -> None:
+        with Consumer(
+            self.connection,
+            self.queues,
+            callbacks=[self._on_message],
+            accept=celery.conf.accept_content,
+        ) as consumer:
+            # 배치 크기만큼만 미리 받는다 — 나머지는 다른 워커 몫
+            consumer.qos(prefetch_count=self.batch_size)
+            while not self._stopped:
+                with contextlib.suppress(TimeoutError):
+                    self.connection.drain_events(timeout=self._poll_timeout())
+                if self._due():
+                    self.flush()
+            self.flush()
+
+    def stop(self, *_: Any) -> None:
+        self._stopped = True
+
+    def _on_message(self, body: Any, message: Message) -> None:
+        if not self._buffer:
+            self._first_at = time.monotonic()
+        self._buffer.append(message)
+
+    def _poll_timeout(self) -> float:
+        if not self._buffer:
+            return _IDLE_POLL_SECONDS
+        return max(self.max_delay - (time.monotonic() - self._first_at), 0.001)
+
+    def _due(self) -> bool:
+        if not self._buffer:
+            return False
+        return (
+            len(self._buffer) >= self.batch_size
+            or time.monotonic() - self._first_at >= self.max_delay
+        )
+
+    def flush(self) -> None:
+        messages, self._buffer = self._buffer, []
+        if messages:
+            self.handle_batch(messages)
+
+    def handle_batch(self, messages: list[Message]) -> None:
+        """메시지 묶음을 적재하고 각 메시지를 ack(적재·중복·DLQ) 또는 재발행한다."""
+        WORKER_BATCH_SIZE.observe(len(messages))
+        started = time.perf_counter()
+        deliveries = [d for d in map(self._decode, messages) if d is not None]
+        if deliveries:
+            self._persist(deliveries)
+        WORKER_BATCH_FLUSH_SECONDS.observe(time.perf_counter() - started)
+
+    def _decode(self, message: Message) -> _Delivery | None:
+        """Celery 프로토콜 v2 메시지를 적재할 행으로 — 검증 실패는 여기서 DLQ 후 ack."""
+        headers = message.headers or {}
+        # 헤더가 빠진 메시지도 DLQ 후 ack — 예외가 새면 소비 루프가 죽고 배치가 ack되지 않는다
+        task_name = task_id = "Unknown"
+        source: str | None = None
+        args: list[Any] = []
+        kwargs: dict[str, Any] = {}
+        customer_id: Any = "Unknown"
+        try:
+            task_name, task_id = headers["task"], headers["id"]
+            source = self._sources.get(task_name)
+            retries = int(headers.get("retries") or 0)
+            args, kwargs, _ = message.decode()
+            customer_id = args[0] if args else kwargs.get("customer_id", customer_id)
+            if source is None:
+                raise ValueError(f"Task '{task_name}' is not a webhook task")
+            row = event_row(source, args, kwargs)
+        except Exception as e:
+            # 비일시적 오류 — 태스크의 on_failure와 같이 DLQ
+            self._dead_letter(task_name, task_id, customer_id, source, e)
+            message.ack()
+            return None
+        return _Delivery(message, task_name, task_id, args, kwargs, retries, row)
+
+    def _persist(self, deliveries: list[_Delivery]) -> None:
+        outcome = persist_events(self.session_factory, self._insert_batch, deliveries)
+        WORKER_BATCH_MESSAGES_TOTAL.labels(result="inserted").inc(outcome.inserted)
+        WORKER_BATCH_MESSAGES_TOTAL.labels(result="duplicate").inc(outcome.duplicates)
+        for delivery in outcome.stored:
+            delivery.message.ack()
+            claim_check.release(delivery.raw_payload)
+        for delivery, exc in outcome.rejected:
+            self._dead_letter(
+                delivery.task_name,
+                delivery.task_id,
+                delivery.row["customer_id"],
+                delivery.row["source"],
+                exc,
+            )
+            delivery.message.ack()
+        # 연결·일시적 오류 — Celery와 같은 백오프로 재발행
+        for delivery, exc in outcome.failed:
+            self._retry(delivery, exc)
+
+    def _retry(self, delivery: _Delivery, exc: SQLAlchemyError) -> None:
+        """Celery autoretry(`retry_backoff`)와 같은 규칙으로 재발행 후 원본을 ack한다."""
+        count_error(delivery.row["customer_id"], delivery.row["source"], exc)
+        task = celery.tasks[delivery.task_name]
+        if delivery.retries >= task.max_retries:
+            self._dead_letter(
+                delivery.task_name, delivery.task_id, delivery.row["customer_id"], None, exc
+            )
+        else:
+            task.apply_async(
+                args=delivery.args,
+                kwargs=delivery.kwargs,
+                task_id=delivery.task_id,
+                retries=delivery.retries + 1,
+                countdown=get_exponential_backoff_interval(
+                    factor=1, retries=delivery.retries, maximum=600, full_jitter=True
+                ),
+                queue=delivery.message.delivery_info.get("routing_key"),
+            )
+            WORKER_BATCH_MESSAGES_TOTAL.labels(result="retried").inc()
+        delivery.message.ack()
+
+    def _dead_letter(
+        self,
+        task_name: str,
+        task_id: str,
+        customer_id: Any,
+        source: str | None,
+        exc: BaseException,
+    ) -> None:
+        dead_letter_event(task_name, task_id, customer_id, source, exc)
+        WORKER_BATCH_MESSAGES_TOTAL.labels(result="dead_lettered").inc()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-Q", "--queues", default="default,high_priority")
+    parser.add_argument("--metrics-port", type=int, default=None)
+    options = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if options.metrics_port:
+        start_http_server(options.metrics_port)
+    queues = [q for q in celery.conf.task_queues if q.name in options.queues.split(",")]
+    with Connection(settings.celery_broker_url) as connection:
+        consumer = BatchConsumer(
+            connection,
+            queues,
+            batch_size=settings.worker_batch_size,
+            max_delay=settings.worker_batch_max_delay_ms / 1000,
+            copy=settings.worker_batch_loader == "copy",
+        )
+        signal.signal(signal.SIGTERM, consumer.stop)
+        signal.signal(signal.SIGINT, consumer.stop)
+        consumer.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""webhook_events 대량 적재 — 백필·장애 후 따라잡기용 COPY 경로.
+
+행은 청크(`--chunk-rows`) 단위로 `WebhookEventRepository.copy_insert_ignore_duplicates`
+(COPY → 임시 스테이징 → `INSERT ... ON CONFLICT DO NOTHING`)에 흘려 넣고 청크마다 커밋한다.
+중간에 멈춰도 커밋된 청크는 남고, 같은 입력을 다시 돌리면 고유제약(event_id·fingerprint)
+덕에 이미 들어간 행은 건너뛴다(fingerprint·event_id가 모두 없는 행은 예외).
+
+사용법:
+    python -m app.bulk_loader events.ndjson [--chunk-rows 50000]
+
+입력은 한 줄에 JSON 객체 하나(`-`면 표준입력):
+    {"customer_id": "...", "source": "github", "payload": {...},
+     "event_id": "...", "fingerprint": null, "status": "PROCESSED", "received_at": "..."}
+"""
+
+import argparse
+import itertools
+import logging
+import sys
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import IO, Any
+
+import orjson
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+from .repositories.webhook_event_repository import WebhookEventRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LoadResult:
+    rows: int = 0
+    inserted: int = 0
+    seconds: float = 0.0
+
+    @property
+    def duplicates(self) -> int:
+        return self.rows - self.inserted
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def load_events(
+    rows: Iterable[dict[str, Any]],
+    *,
+    chunk_rows: int = 50_000,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> LoadResult:
+    """행을 청크마다 COPY + 병합 + 커밋하고, 처리량(rows/sec)을 로그로 남긴다."""
+    result = LoadResult()
+    started = time.perf_counter()
+    iterator = iter(rows)
+    with session_factory() as db:
+        while chunk := list(itertools.islice(iterator, chunk_rows)):
+            result.inserted += WebhookEventRepository.copy_insert_ignore_duplicates(db, chunk)
+            db.commit()
+            result.rows += len(chunk)
+            result.seconds = time.perf_counter() - started
+            logger.info(
+                "Loaded %d rows (%d inserted) at %.0f rows/s",
+                result.rows,
+                result.inserted,
+                result.rows_per_second,
+            )
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def read_ndjson(stream: IO[bytes]) -> Iterator[dict[str, Any]]:
+    for line in stream:
+        if line.strip():
+            yield orjson.loads(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="NDJSON 파일 경로(- 는 표준입력)")
+    parser.add_argument("--chunk-rows", type=int, default=50_000)
+    options = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if options.path == "-":
+        result = load_events(read_ndjson(sys.stdin.buffer), chunk_rows=options.chunk_rows)
+    else:
+        with open(options.path, "rb") as stream:
+            result = load_events(read_ndjson(stream), chunk_rows=options.chunk_rows)
+    print(
+        f"rows={result.rows} inserted={result.inserted} duplicates={result.duplicates} "
+        f"seconds={result.seconds:.2f} rows/s={result.rows_per_second:.0f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,22 @@
+from typing import Any
+
 from celery import Celery
+from celery.signals import worker_process_init
+from celery.utils.log import current_process_index
 from kombu import Exchange, Queue
+from prometheus_client import start_http_server
 
+from . import database
 from .config import settings
+from .serialization import SERIALIZER, register_serializer
+
+register_serializer()
 
 celery = Celery(
     __name__,
     broker=settings.celery_broker_url,
     backend=settings.celery_result_backend,
-    include=["app.services.webhook_handler"],
+    include=["app.services.webhook_handler", "app.partitions", "app.archive"],
 )
 
 # Define exchanges
@@ -42,4 +51,29 @@ celery.conf.update(
     task_track_started=True,
     task_acks_late=True,
     worker_prefetch_multiplier=1,
+    # 전환 중에도 이전 형식 메시지를 소비하도록 두 형식을 모두 받는다
+    task_serializer=settings.celery_task_serializer,
+    accept_content=["json", SERIALIZER],
 )
+
+# Celery beat — webhook_events 파티션 미리 만들기·만료 처리(app/partitions.py),
+# 오래된 행 콜드 보관(app/archive.py, ARCHIVE_AFTER_DAYS가 0이면 바로 끝남)
+celery.conf.beat_schedule = {
+    "maintain-webhook-event-partitions": {
+        "task": "tasks.maintain_partitions",
+        "schedule": settings.partition_maintenance_interval_seconds,
+    },
+    "archive-webhook-events": {
+        "task": "tasks.archive_events",
+        "schedule": settings.archive_interval_seconds,
+    },
+}
+
+
+@worker_process_init.connect
+def _init_worker_process(**_: Any) -> None:
+    # prefork 자식마다 — fork로 물려받은 DB 풀을 자식용 풀로 교체
+    database.init_worker_process()
+    if settings.worker_metrics_port:
+        # 자식마다 자기 포트로 풀·태스크 메트릭을 노출(자식 i → port + i)
+        start_http_server(settings.worker_metrics_port + (current_process_index(base=0) or 0))
@@ -0,0 +1,159 @@
+"""claim-check — 큰 웹훅 본문은 블롭 저장소에 한 번 쓰고, 브로커에는 참조만 보낸다.
+
+멀티 MB GitHub push가 태스크 인자로 브로커 Redis를 지나가면 대기하는 동안 브로커
+메모리를 차지하고 큐 지연이 본문 크기에 따라 출렁인다. `CLAIM_CHECK_THRESHOLD_BYTES`
+이상 본문은 저장소(`CLAIM_CHECK_STORE`)에 쓰고 태스크에는 `claim-check:<키>:<sha256>`
+참조를 넘긴다.
+
+- 수신 경로: 멱등 예약 뒤 발행 직전에 `check_in` — 중복이면 쓰지 않는다
+- 워커: `load_payload`가 참조를 보면 `check_out`(다이제스트 검증) — 본문은 필요할 때 읽는다
+- 적재(또는 중복 판정)가 커밋된 뒤 `release`로 지운다. 실패해 DLQ로 간 블롭은 남겨 둔다
+  (redis는 TTL로 만료, file은 주기적으로 정리)
+
+저장소:
+- redis — `REDIS_URL`에 `webhook:blob:<키>`, TTL `CLAIM_CHECK_TTL_SECONDS`(재시도 기간보다 길게)
+- file — `CLAIM_CHECK_DIR`(웹·워커가 공유하는 볼륨)에 `<키 앞 2자>/<키>`
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Protocol, TypeGuard
+
+import redis
+
+from .config import settings
+from .metrics import CLAIM_CHECK_BLOBS_TOTAL
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "claim-check:"
+
+
+class ClaimCheckMissing(LookupError):
+    """참조한 블롭이 없음 — 만료·삭제됨(재시도해도 같은 결과라 DLQ 대상)."""
+
+
+class BlobStore(Protocol):
+    def put(self, key: str, body: bytes) -> None: ...
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def delete(self, key: str) -> None: ...
+
+
+class RedisBlobStore:
+    def __init__(self, client: redis.Redis, ttl_seconds: int):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _key(key: str) -> str:
+        return f"webhook:blob:{key}"
+
+    def put(self, key: str, body: bytes) -> None:
+        self.client.set(self._key(key), body, ex=self.ttl_seconds)
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(self._key(key))  # type: ignore[return-value]
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self._key(key))
+
+
+class FileBlobStore:
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def put(self, key: str, body: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 임시 파일에 쓰고 rename — 워커가 반쯤 쓴 파일을 읽지 않게
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(body)
+        os.replace(tmp, path)
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+
+_blob_store: BlobStore | None = None
+
+
+def get_blob_store() -> BlobStore:
+    global _blob_store
+    if _blob_store is None:
+        if settings.claim_check_store == "file":
+            _blob_store = FileBlobStore(Path(settings.claim_check_dir))
+        else:
+            _blob_store = RedisBlobStore(
+                redis.Redis.from_url(settings.redis_url), settings.claim_check_ttl_seconds
+            )
+    return _blob_store
+
+
+def is_reference(value: object) -> TypeGuard[bytes | str]:
+    if isinstance(value, bytes):
+        return value.startswith(PREFIX.encode())
+    return isinstance(value, str) and value.startswith(PREFIX)
+
+
+def _parse(reference: bytes | str) -> tuple[str, str]:
+    text = reference.decode() if isinstance(reference, bytes) else reference
+    key, digest = text.removeprefix(PREFIX).split(":", 1)
+    return key, digest
+
+
+async def check_in(body: bytes) -> bytes | str:
+    """임계값 이상이면 본문을 저장소에 쓰고 참조를, 아니면 본문을 그대로 돌려준다."""
+    threshold = settings.claim_check_threshold_bytes
+    if not threshold or len(body) < threshold:
+        return body
+    # 해시·쓰기 모두 큰 버퍼 작업 — 이벤트 루프 밖에서
+    reference = await asyncio.to_thread(_store, uuid.uuid4().hex, body)
+    CLAIM_CHECK_BLOBS_TOTAL.labels(op="stored").inc()
+    return reference
+
+
+def _store(key: str, body: bytes) -> str:
+    digest = hashlib.sha256(body).hexdigest()
+    get_blob_store().put(key, body)
+    return f"{PREFIX}{key}:{digest}"
+
+
+def check_out(reference: bytes | str) -> bytes:
+    """참조한 본문을 읽고 다이제스트를 확인한다."""
+    key, digest = _parse(reference)
+    body = get_blob_store().get(key)
+    if body is None:
+        CLAIM_CHECK_BLOBS_TOTAL.labels(op="missing").inc()
+        raise ClaimCheckMissing(f"Claim-check blob {key} not found")
+    if hashlib.sha256(body).hexdigest() != digest:
+        raise ValueError(f"Claim-check blob {key} does not match its digest")
+    CLAIM_CHECK_BLOBS_TOTAL.labels(op="fetched").inc()
+    return body
+
+
+def release(value: object) -> None:
+    """참조면 블롭을 지운다(best-effort — 실패해도 TTL·정리 작업이 치운다)."""
+    if not is_reference(value):
+        return
+    key, _ = _parse(value)
+    try:
+        get_blob_store().delete(key)
+    except Exception:
+        logger.warning("Could not delete claim-check blob %s", key, exc_info=True)
+        return
+    CLAIM_CHECK_BLOBS_TOTAL.labels(op="released").inc()
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -19,6 +21,126 @@ class Settings(BaseSettings):
     keycloak_realm: str = "webhook-service"
     keycloak_client_id: str = "webhook-admin-client"
     keycloak_client_secret: str | None = None
+
+    # 테넌트 캐시 — WebhookVerifier의 customers 조회를 프로세스 내 TTL/LRU로 흡수
+    tenant_cache_enabled: bool = True
+    tenant_cache_max_size: int = 10_000
+    tenant_cache_ttl_seconds: float = 60.0
+    # 존재하지 않는 tenant_id 음성 캐시 — 신규 테넌트 반영 지연 상한이기도 함
+    tenant_cache_negative_ttl_seconds: float = 10.0
+    # Stripe-Signature 타임스탬프 허용오차(초) — stripe SDK 기본값과 동일
+    stripe_signature_tolerance_seconds: int = 300
+    # 이 크기(바이트) 이상 본문의 HMAC은 스레드풀에서 계산 — 이벤트 루프 블로킹 방지
+    hmac_offload_threshold_bytes: int = 256 * 1024
+    hmac_offload_max_workers: int = 4
+    # 스트리밍 수신 — 헤더·Content-Length를 먼저 확인하고 청크 단위 증분 HMAC으로 검증
+    ingest_streaming_enabled: bool = False
+    # 소스별 본문 상한(바이트) — GitHub는 공급자 상한(25MB)에 맞춤
+    webhook_max_body_bytes: dict[str, int] = {
+        "github": 25 * 1024 * 1024,
+        "stripe": 2 * 1024 * 1024,
+    }
+    # Celery 발행 스레드 — async 엔드포인트가 동기 apply_async로 루프를 막지 않게 한다
+    task_publisher_threads: int = 2
+    # 핸드오프 큐 상한 — 초과 시 503(멱등키 해제)으로 백프레셔
+    task_publisher_max_pending: int = 1000
+    # 마이크로 배치 큐잉 — 동시 요청의 멱등 예약·발행을 Redis 파이프라인으로 묶음(Redis 브로커 전용)
+    ingest_batching_enabled: bool = False
+    ingest_batch_max_size: int = 64
+    ingest_batch_max_delay_ms: float = 2.0
+    # fast-ack 스풀 — 로컬 세그먼트 파일에 fsync 후 202, 큐잉은 백그라운드 드레이너가 담당
+    ingest_spool_enabled: bool = False
+    # 워커 프로세스마다 하위 슬롯 디렉터리(0, 1, …)를 잠가 쓴다 — 재시작 간 보존되는 볼륨
+    ingest_spool_dir: str = "/var/lib/webhook-service/spool"
+    ingest_spool_segment_max_bytes: int = 64 * 1024 * 1024
+    ingest_spool_drain_batch: int = 100
+    # 웹훅 수신 레이트 리밋(테넌트별, 분당)
+    webhook_rate_limit_per_minute: int = 120
+    # Lua 수신 게이트 — 검증 뒤 공유(Redis) 리밋 + 멱등 예약을 EVALSHA 한 번으로(slowapi 유지)
+    ingest_lua_gate_enabled: bool = False
+    # 로컬 중복 필터 — 큐잉이 확정된 멱등키를 프로세스 내 TTL/LRU로 기억(Redis 키가 원본)
+    duplicate_filter_enabled: bool = True
+    duplicate_filter_max_size: int = 50_000
+    duplicate_filter_ttl_seconds: float = 600.0
+    # 멱등 저장 방식 — keys(이벤트당 키) | compact(테넌트·소스·시간 버킷 해시 + 8바이트 다이제스트)
+    idempotency_store: Literal["keys", "compact"] = "keys"
+    # compact 저장소의 소스별 보존 시간(미지정 소스는 24h)
+    idempotency_retention_hours: dict[str, int] = {}
+    # 본문 지문 중복 제거 — 공급자 event_id가 없는 요청을 본문 다이제스트로 멱등 처리
+    fingerprint_dedup_enabled: bool = False
+    # 배치 워커(python -m app.batch_consumer) — N건 또는 첫 메시지 후 T ms마다 한 트랜잭션으로 적재
+    worker_batch_size: int = 100
+    worker_batch_max_delay_ms: float = 50.0
+    # 배치 적재 방식 — insert(multi-row INSERT) | copy(COPY → 스테이징 → 병합, 대량 따라잡기용)
+    worker_batch_loader: Literal["insert", "copy"] = "insert"
+    # asyncio 워커(python -m app.async_worker) — 프로세스당 동시 처리 상한(= 브로커 prefetch)
+    async_worker_max_in_flight: int = 64
+    # 수신→워커 전송 — celery(태스크 메시지) | streams(Redis Streams XADD, Redis 브로커 전용)
+    ingest_transport: Literal["celery", "streams"] = "celery"
+    # 스트림 길이 상한(XADD MAXLEN ~) — 트림은 미확인 항목도 지우므로 최악의 적체보다 크게
+    stream_max_len: int = 1_000_000
+    # 스트림 나이 상한(초, 스트림 워커가 XTRIM MINID) — 0이면 길이 상한만
+    stream_max_age_seconds: int = 0
+    stream_consumer_group: str = "webhook-workers"
+    # 스트림 워커(python -m app.stream_consumer) — XREADGROUP 한 번에 스트림당 N건, 없으면 T ms 대기
+    stream_read_count: int = 100
+    stream_block_ms: int = 1000
+    # 이 시간(ms) 넘게 미확인인 항목은 XAUTOCLAIM으로 회수해 재처리(재전달 = 재시도)
+    stream_claim_idle_ms: int = 60_000
+    # 동기 엔진 커넥션 풀 — 웹·배치/스트림 워커 프로세스
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    # 이 시간(초)보다 오래된 연결은 체크아웃 때 새로 연결(-1이면 끔)
+    db_pool_recycle_seconds: int = -1
+    # 이 시간(초) 안에 반납된 연결은 체크아웃 ping 생략(0이면 매번 ping = pool_pre_ping)
+    db_pool_pre_ping_idle_seconds: float = 30.0
+    # 단건 적재 INSERT를 연결마다 서버측 PREPARE(psycopg2) — PgBouncer transaction 모드면 끌 것
+    db_prepared_statements: bool = False
+    # Celery prefork 자식당 풀 — 자식은 태스크를 한 번에 하나씩 처리한다
+    worker_db_pool_size: int = 1
+    worker_db_max_overflow: int = 2
+    # Celery prefork 자식 메트릭 포트(자식 i는 port + i) — 미설정이면 노출하지 않음
+    worker_metrics_port: int | None = None
+    # claim-check — 이 크기(바이트) 이상 본문은 블롭 저장소에 두고 태스크에는 참조만(0이면 끔)
+    claim_check_threshold_bytes: int = 0
+    # 블롭 저장소 — redis(REDIS_URL, TTL) | file(웹·워커 공유 디렉터리)
+    claim_check_store: Literal["redis", "file"] = "redis"
+    # redis 블롭 TTL — 재시도·DLQ 재처리 기간보다 길게
+    claim_check_ttl_seconds: int = 7 * 24 * 3600
+    # file 저장소 디렉터리 — 웹·워커가 같은 볼륨을 마운트해야 한다
+    claim_check_dir: str = "/var/lib/webhook-service/blobs"
+    # 태스크 메시지 직렬화 — json(Celery 기본) | orjson(+ 임계값 이상 zlib) — 워커는 둘 다 수신
+    celery_task_serializer: Literal["json", "orjson"] = "json"
+    # orjson 메시지 본문이 이 크기(바이트) 이상이면 zlib 압축(0이면 압축 안 함)
+    task_compression_threshold_bytes: int = 1024
+    # 워커가 이 크기(바이트) 이상 본문은 필요한 최상위 키만 지연 추출·원본 적재(0이면 끔)
+    lazy_json_threshold_bytes: int = 0
+    # webhook_events 범위 파티션 단위(received_at) — 바꾸면 기존 파티션과 겹치지 않는 기간부터
+    partition_interval: Literal["month", "day"] = "month"
+    # 현재 기간 뒤로 미리 만들어 둘 파티션 수 — 파티션이 없으면 INSERT가 실패한다
+    partitions_ahead: int = 3
+    # 이 일수보다 오래된 파티션을 떼어 낸다(0이면 보존)
+    partition_retention_days: int = 0
+    # 만료 파티션 처리 — detach(분리만, 보관 작업용) | drop(삭제)
+    partition_expire_action: Literal["detach", "drop"] = "detach"
+    # Celery beat 파티션 관리 주기(초)
+    partition_maintenance_interval_seconds: int = 3600
+    # 이 일수보다 오래된 행을 압축 세그먼트로 옮기고 DB에서 지운다(0이면 끔)
+    # — PARTITION_RETENTION_DAYS보다 짧게: 파티션이 먼저 떨어지면 보관되지 않는다
+    archive_after_days: int = 0
+    # 세그먼트 디렉터리 — 보관 작업(워커)과 재처리(웹)가 같은 볼륨을 마운트해야 한다
+    archive_dir: str = "/var/lib/webhook-service/archive"
+    # 세그먼트 하나의 최대 행 수(고객·날짜가 바뀌어도 나뉜다)
+    archive_segment_rows: int = 50_000
+    # 보관한 행을 지우는 DELETE 한 번의 행 수
+    archive_delete_batch_rows: int = 5_000
+    # Celery beat 보관 작업 주기(초)
+    archive_interval_seconds: int = 3600
+    # payload 경로 식 인덱스(PAYLOAD_PATHS 이름) — 바꾸면 python -m app.payload_paths로 반영
+    payload_path_indexes: list[str] = ["stripe_type", "stripe_object_id", "github_repository"]
+    # payload 전체 GIN(jsonb_path_ops) 인덱스 — 임의 포함 조회용, 적재 비용이 커서 기본 끔
+    payload_gin_index: bool = False
+
     model_config = SettingsConfigDict(env_file=".env")
 
 
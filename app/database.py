@@ -1,17 +1,119 @@
-from sqlalchemy import create_engine
+import time
+from typing import Any
+
+import orjson
+from sqlalchemy import Connection, Engine, create_engine, event, exc
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from .config import settings
+from .metrics import DB_POOL_CONNECTIONS, DB_POOL_PINGS_TOTAL
+
+# 연결마다 한 번 PREPARE할 문장(이름 → SQL) — 리포지토리가 등록한다
+_PREPARED_STATEMENTS: dict[str, str] = {}
+
+
+def register_prepared_statement(name: str, sql: str) -> None:
+    """새 연결마다 서버측 PREPARE할 문장을 등록한다(`DB_PREPARED_STATEMENTS`, psycopg2 전용)."""
+    _PREPARED_STATEMENTS[name] = sql
+
+
+def prepared_statements(connection: Connection) -> set[str]:
+    """이 연결에서 PREPARE된 문장 이름 — 없으면 빈 집합(일반 SQL 경로)."""
+    return connection.connection.info.get("prepared_statements", set())
+
+
+def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+    # 막 연결했으니 첫 체크아웃의 ping은 생략된다
+    connection_record.info["last_used"] = time.monotonic()
+
+
+def _prepare_statements(dbapi_connection: Any, connection_record: Any) -> None:
+    if not (settings.db_prepared_statements and _PREPARED_STATEMENTS):
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        for sql in _PREPARED_STATEMENTS.values():
+            cursor.execute(sql)
+    finally:
+        cursor.close()
+    dbapi_connection.commit()
+    connection_record.info["prepared_statements"] = set(_PREPARED_STATEMENTS)
+
+
+def _ping_if_idle(dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+    # pool_pre_ping 대체 — 최근에 쓰고 반납한 연결은 살아 있다고 보고 왕복을 아낀다
+    idle = time.monotonic() - connection_record.info.get("last_used", 0.0)
+    if idle < settings.db_pool_pre_ping_idle_seconds:
+        DB_POOL_PINGS_TOTAL.labels(result="skipped").inc()
+        return
+    try:
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        finally:
+            cursor.close()
+    except Exception as e:
+        # 풀이 이 연결을 버리고 새 연결로 다시 체크아웃한다
+        DB_POOL_PINGS_TOTAL.labels(result="failed").inc()
+        raise exc.DisconnectionError() from e
+    DB_POOL_PINGS_TOTAL.labels(result="ok").inc()
+
+
+def _on_checkin(dbapi_connection: Any, connection_record: Any) -> None:
+    connection_record.info["last_used"] = time.monotonic()
 
-engine = create_engine(
-    settings.database_url,
-    connect_args={"options": "-c timezone=utc"},
-    pool_pre_ping=True,
-)
+
+def _json_serializer(value: Any) -> str:
+    # orjson — 지연 추출 경로가 넘기는 `orjson.Fragment`(원본 JSON 바이트)는 다시 인코딩하지 않는다
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def create_sync_engine(pool_size: int, max_overflow: int) -> Engine:
+    sync_engine = create_engine(
+        settings.database_url,
+        connect_args={"options": "-c timezone=utc"},
+        json_serializer=_json_serializer,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=settings.db_pool_recycle_seconds,
+    )
+    event.listen(sync_engine, "checkout", _ping_if_idle)
+    event.listen(sync_engine, "checkin", _on_checkin)
+    event.listen(sync_engine, "connect", _on_connect)
+    if sync_engine.dialect.driver == "psycopg2":
+        event.listen(sync_engine, "connect", _prepare_statements)
+    return sync_engine
+
+
+engine = create_sync_engine(settings.db_pool_size, settings.db_max_overflow)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def init_worker_process() -> None:
+    """Celery prefork 자식 초기화 — 부모에게서 물려받은 풀을 버리고 자식 크기 풀로 교체한다.
+
+    fork 전에 열린 연결은 부모와 소켓을 공유하므로 자식이 쓰면 안 된다. `close=False`로
+    부모 쪽 연결은 건드리지 않고 참조만 버린다.
+    """
+    global engine
+    engine.dispose(close=False)
+    engine = create_sync_engine(settings.worker_db_pool_size, settings.worker_db_max_overflow)
+    SessionLocal.configure(bind=engine)
+
+
+# 풀 상태는 스크레이프 시점에 현재 엔진에서 읽는다(init_worker_process 교체 후에도)
+DB_POOL_CONNECTIONS.labels(state="checked_out").set_function(
+    lambda: engine.pool.checkedout()  # type: ignore[attr-defined]
+)
+DB_POOL_CONNECTIONS.labels(state="idle").set_function(
+    lambda: engine.pool.checkedin()  # type: ignore[attr-defined]
+)
+DB_POOL_CONNECTIONS.labels(state="overflow").set_function(
+    lambda: max(engine.pool.overflow(), 0)  # type: ignore[attr-defined]
+)
+
 Base = declarative_base()
 
 _async_url = settings.database_url
@@ -22,9 +124,21 @@ elif _async_url.startswith("postgresql://"):
 async_engine = create_async_engine(
     _async_url,
     connect_args={"server_settings": {"TimeZone": "UTC"}},
+    json_serializer=_json_serializer,
     pool_pre_ping=True,
 )
-AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+
+class AsyncBackedSession(Session):
+    """AsyncSessionLocal 세션 안쪽의 동기 Session — 세션 이벤트를 비동기 경로에만 걸 때 쓴다.
+
+    커밋 훅은 이벤트 루프 스레드에서 돈다 — 여기서 블로킹 I/O를 하면 루프가 멈춘다.
+    """
+
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, expire_on_commit=False, sync_session_class=AsyncBackedSession
+)
 
 
 def get_db():
@@ -1,20 +1,29 @@
 import asyncio
-import hashlib
-import hmac
+import functools
 import logging
 import time
+from dataclasses import dataclass
 from typing import Any
 
 import redis.asyncio as aioredis
-import stripe
 from fastapi import HTTPException, Request, status
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from . import hmac_offload
+from .config import settings
 from .models.customer import Customer
 from .repositories.customer_repository import CustomerRepository
+from .signatures import (
+    GitHubSignature,
+    SignatureVerificationError,
+    StripeSignature,
+    verify_github_signature,
+    verify_stripe_signature,
+)
+from .tenant_cache import CachedCustomer, TenantCache
 
 logger = logging.getLogger(__name__)
 
@@ -106,6 +115,30 @@ async def get_current_user(request: Request) -> dict[str, Any]:
         ) from e
 
 
+# 소스별 상한이 설정되지 않은 경우의 본문 상한(스트리밍 수신)
+_DEFAULT_MAX_BODY_BYTES = 1024 * 1024
+
+_SIGNATURE_HEADERS = {"github": "x-hub-signature-256", "stripe": "stripe-signature"}
+_MISSING_SIGNATURE_DETAIL = {
+    "github": "X-Hub-Signature-256 header is missing.",
+    "stripe": "Stripe-Signature header is missing.",
+}
+_INVALID_SIGNATURE_DETAIL = {
+    "github": "Invalid GitHub signature.",
+    "stripe": "Invalid Stripe signature.",
+}
+
+
+@dataclass
+class VerifiedWebhook:
+    """서명 검증을 통과한 요청 — 검증에 쓴 원본 바이트를 그대로 들고 다닌다."""
+
+    customer: Customer | CachedCustomer
+    body: bytes
+    # 본문 지문(FINGERPRINT_DEDUP_ENABLED) — HMAC과 같은 패스에서 계산
+    fingerprint: str | None = None
+
+
 class WebhookVerifier:
     """
     A generic webhook signature verifier that can be configured for different providers.
@@ -115,26 +148,30 @@ class WebhookVerifier:
     def __init__(self, source: str):
         self.source = source
 
-    async def __call__(self, request: Request, tenant_id: str, db: AsyncSession):
-        customer = await self._get_customer_async(db, tenant_id)
+    async def __call__(self, request: Request, tenant_id: str, db: AsyncSession) -> VerifiedWebhook:
+        customer = await self._resolve_customer(request, db, tenant_id)
         if not customer:
             raise HTTPException(status_code=404, detail="Tenant not found.")
 
-        body = await request.body()
         # 레거시 Column 타입을 str로 좁힘 — 런타임 값은 이미 str
         secret: str = customer.webhook_secret  # type: ignore[assignment]
 
-        if self.source == "github":
-            await self._verify_github(request, body, secret)
-        elif self.source == "stripe":
-            await self._verify_stripe(request, body, secret)
-        else:
+        if self.source not in _SIGNATURE_HEADERS:
             logger.error("Verifier for source '%s' is not implemented.", self.source)
             raise HTTPException(
                 status_code=501,
                 detail=f"Verifier for source '{self.source}' is not implemented.",
             )
-        return customer
+
+        if settings.ingest_streaming_enabled:
+            body, fingerprint = await self._read_and_verify_stream(request, secret)
+        else:
+            body = await request.body()
+            if self.source == "github":
+                fingerprint = await self._verify_github(request, body, secret)
+            else:
+                fingerprint = await self._verify_stripe(request, body, secret)
+        return VerifiedWebhook(customer=customer, body=body, fingerprint=fingerprint)
 
     def _get_customer(self, db: Session, tenant_id: str) -> Customer | None:
         customer = CustomerRepository.get_by_tenant_id(db, tenant_id)
@@ -148,27 +185,125 @@ class WebhookVerifier:
             raise HTTPException(status_code=403, detail="Tenant is inactive.")
         return customer
 
-    async def _verify_github(self, request: Request, body: bytes, secret: str):
-        secret_bytes = secret.encode("utf-8")
+    async def _resolve_customer(
+        self, request: Request, db: AsyncSession, tenant_id: str
+    ) -> Customer | CachedCustomer | None:
+        """테넌트 캐시 우선 조회 — 미스일 때만 DB를 조회한다.
+
+        AsyncSession은 첫 execute 시점에 커넥션을 체크아웃하므로, 캐시 적중(음성 포함)
+        요청은 풀 커넥션을 전혀 잡지 않는다. 캐시가 없으면(lifespan 미기동) 기존 경로.
+        """
+        cache: TenantCache | None = getattr(request.app.state, "tenant_cache", None)
+        if cache is None:
+            return await self._get_customer_async(db, tenant_id)
+
+        hit, cached = cache.get(tenant_id)
+        if not hit:
+            version = cache.version
+            customer = await CustomerRepository.get_by_tenant_id_async(db, tenant_id)
+            cached = CachedCustomer.from_model(customer) if customer else None
+            cache.put(tenant_id, cached, version=version)
+        if cached and not cached.is_active:
+            raise HTTPException(status_code=403, detail="Tenant is inactive.")
+        return cached
+
+    def _start_signature(self, request: Request, secret: str) -> GitHubSignature | StripeSignature:
+        """본문을 읽기 전에 서명 헤더를 확인한다 — 없음 400, 형식 오류·만료 401."""
+        signature_header = request.headers.get(_SIGNATURE_HEADERS[self.source])
+        if not signature_header:
+            raise HTTPException(status_code=400, detail=_MISSING_SIGNATURE_DETAIL[self.source])
+        fingerprint = settings.fingerprint_dedup_enabled
+        if self.source == "github":
+            return GitHubSignature(signature_header, secret, fingerprint=fingerprint)
+        try:
+            return StripeSignature(
+                signature_header,
+                secret,
+                tolerance=settings.stripe_signature_tolerance_seconds,
+                fingerprint=fingerprint,
+            )
+        except SignatureVerificationError as e:
+            raise HTTPException(status_code=401, detail=_INVALID_SIGNATURE_DETAIL["stripe"]) from e
+
+    async def _read_and_verify_stream(
+        self, request: Request, secret: str
+    ) -> tuple[bytes, str | None]:
+        """request.stream() 청크를 받는 대로 증분 HMAC에 넣으며 본문을 읽는다.
+
+        테넌트·서명 헤더·Content-Length(소스별 상한)를 본문보다 먼저 확인해
+        서명 없는 요청이나 과대 업로드는 본문을 한 바이트도 버퍼링하지 않고 거부한다.
+        Content-Length가 없거나(chunked) 거짓이어도 누적 크기가 상한을 넘는 즉시 끊는다.
+        청크 단위 HMAC 갱신은 짧아 이벤트 루프를 오래 잡지 않는다(오프로드 불필요).
+        (본문, 본문 지문)을 돌려준다 — 지문 모드가 꺼져 있으면 지문은 None.
+        """
+        signature = self._start_signature(request, secret)
+        max_bytes = settings.webhook_max_body_bytes.get(self.source, _DEFAULT_MAX_BODY_BYTES)
+
+        content_length = request.headers.get("content-length")
+        if content_length is not None:
+            try:
+                declared = int(content_length)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail="Invalid Content-Length header.") from e
+            if declared > max_bytes:
+                raise HTTPException(status_code=413, detail="Payload too large.")
+
+        chunks: list[bytes] = []
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_bytes:
+                raise HTTPException(status_code=413, detail="Payload too large.")
+            signature.update(chunk)
+            chunks.append(chunk)
+
+        try:
+            signature.verify()
+        except SignatureVerificationError as e:
+            raise HTTPException(
+                status_code=401, detail=_INVALID_SIGNATURE_DETAIL[self.source]
+            ) from e
+        return b"".join(chunks), signature.fingerprint()
+
+    async def _verify_github(self, request: Request, body: bytes, secret: str) -> str | None:
         signature_header = request.headers.get("x-hub-signature-256")
 
         if not signature_header:
             raise HTTPException(status_code=400, detail="X-Hub-Signature-256 header is missing.")
 
-        signature = hmac.new(secret_bytes, body, hashlib.sha256).hexdigest()
-        expected_signature = f"sha256={signature}"
-
-        if not hmac.compare_digest(expected_signature, signature_header):
-            raise HTTPException(status_code=401, detail="Invalid GitHub signature.")
+        try:
+            return await hmac_offload.run_verification(
+                self.source,
+                len(body),
+                functools.partial(
+                    verify_github_signature, fingerprint=settings.fingerprint_dedup_enabled
+                ),
+                body,
+                signature_header,
+                secret,
+            )
+        except SignatureVerificationError as e:
+            raise HTTPException(status_code=401, detail="Invalid GitHub signature.") from e
 
-    async def _verify_stripe(self, request: Request, body: bytes, secret: str):
+    async def _verify_stripe(self, request: Request, body: bytes, secret: str) -> str | None:
         signature_header = request.headers.get("stripe-signature")
         if not signature_header:
             raise HTTPException(status_code=400, detail="Stripe-Signature header is missing.")
 
         try:
-            # Use the official Stripe library to construct and verify the event
-            stripe.Webhook.construct_event(payload=body, sig_header=signature_header, secret=secret)
-        except stripe.SignatureVerificationError as e:
+            # 서명만 검증 — SDK(construct_event)처럼 본문 전체를 StripeObject로 만들지 않는다
+            return await hmac_offload.run_verification(
+                self.source,
+                len(body),
+                functools.partial(
+                    verify_stripe_signature,
+                    tolerance=settings.stripe_signature_tolerance_seconds,
+                    fingerprint=settings.fingerprint_dedup_enabled,
+                ),
+                body,
+                signature_header,
+                secret,
+            )
+        except SignatureVerificationError as e:
             # The signature is invalid
             raise HTTPException(status_code=401, detail="Invalid Stripe signature.") from e
@@ -0,0 +1,121 @@
+"""웹훅 이벤트 배치 적재 — 배치 워커와 스트림 워커가 같이 쓰는 적재·DLQ 규칙.
+
+1. 배치 전체를 한 문장(multi-row `INSERT ... ON CONFLICT DO NOTHING` 또는 COPY) + COMMIT 한 번
+2. 데이터 오류(FK 위반 등)면 행 단위로 다시 적재해 문제 행만 골라낸다
+3. 연결·일시적 오류면 배치(또는 그 행) 전체가 재시도 대상
+
+결과(`PersistOutcome`)는 항목을 적재·중복(stored)·DLQ(rejected)·재시도(failed)로 나눌
+뿐이다. ack·재발행·XACK 같은 정산은 전송 방식마다 다르므로 각 소비자가 한다.
+"""
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, Generic, Protocol, TypeVar
+from uuid import UUID
+
+from sqlalchemy.exc import DataError, IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .metrics import CUSTOMER_WEBHOOK_ERRORS_TOTAL
+from .repositories.webhook_event_repository import WebhookEventRepository
+from .services.webhook_handler import dead_letter, read_payload
+from .webhook_registry import WEBHOOK_TASK_PARAMS
+
+logger = logging.getLogger(__name__)
+
+
+def event_row(source: str, args: list[Any], kwargs: dict[str, Any]) -> dict[str, Any]:
+    """웹훅 태스크 인자를 검증(태스크와 같은 스키마)해 적재할 webhook_events 행으로."""
+    bound = dict(zip(WEBHOOK_TASK_PARAMS, args, strict=False))
+    bound.update(kwargs)
+    payload, _ = read_payload(source, bound["raw_payload"])
+    return {
+        "customer_id": UUID(str(bound["customer_id"])),
+        "source": source,
+        "payload": payload,
+        "event_id": bound.get("event_id"),
+        "fingerprint": bound.get("fingerprint"),
+        "status": "PROCESSED",
+    }
+
+
+class _Event(Protocol):
+    row: dict[str, Any]
+
+
+E = TypeVar("E", bound=_Event)
+
+
+@dataclass
+class PersistOutcome(Generic[E]):
+    stored: list[E] = field(default_factory=list)
+    inserted: int = 0
+    rejected: list[tuple[E, SQLAlchemyError]] = field(default_factory=list)
+    failed: list[tuple[E, SQLAlchemyError]] = field(default_factory=list)
+
+    @property
+    def duplicates(self) -> int:
+        return len(self.stored) - self.inserted
+
+
+def persist_events(
+    session_factory: Callable[[], Session],
+    insert_batch: Callable[[Session, list[dict[str, Any]]], int],
+    events: list[E],
+) -> PersistOutcome[E]:
+    """`events`의 행을 한 트랜잭션으로 적재하고 항목별 결과를 돌려준다."""
+    outcome: PersistOutcome[E] = PersistOutcome()
+    db = session_factory()
+    try:
+        try:
+            outcome.inserted = insert_batch(db, [e.row for e in events])
+            db.commit()
+        except (IntegrityError, DataError):
+            # 특정 행의 데이터 문제 — 행 단위로 다시 적재해 문제 행만 골라낸다
+            db.rollback()
+            logger.warning("Batch insert of %d events failed; retrying per row", len(events))
+            for event in events:
+                _persist_one(db, event, outcome)
+            return outcome
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning("Batch insert of %d events failed: %s", len(events), e)
+            outcome.failed = [(event, e) for event in events]
+            return outcome
+    finally:
+        db.close()
+    outcome.stored = events
+    return outcome
+
+
+def _persist_one(db: Session, event: E, outcome: PersistOutcome[E]) -> None:
+    try:
+        inserted = WebhookEventRepository.bulk_insert_ignore_duplicates(db, [event.row])
+        db.commit()
+    except (IntegrityError, DataError) as e:
+        db.rollback()
+        outcome.rejected.append((event, e))
+        return
+    except SQLAlchemyError as e:
+        db.rollback()
+        outcome.failed.append((event, e))
+        return
+    outcome.stored.append(event)
+    outcome.inserted += inserted
+
+
+def count_error(customer_id: Any, source: str, exc: BaseException) -> None:
+    CUSTOMER_WEBHOOK_ERRORS_TOTAL.labels(
+        customer_id=str(customer_id), source=source, error_type=type(exc).__name__
+    ).inc()
+
+
+def dead_letter_event(
+    task_name: str, task_id: str, customer_id: Any, source: str | None, exc: BaseException
+) -> None:
+    """처리를 포기한 이벤트를 DLQ로 — 소스를 알면 오류 메트릭도 남긴다."""
+    if source is not None:
+        count_error(customer_id, source, exc)
+    logger.error("Dead-lettering %s (%s): %s", task_name, task_id, exc)
+    dead_letter(task_name, task_id, customer_id, exc)
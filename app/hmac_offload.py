@@ -0,0 +1,52 @@
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from .config import settings
+from .metrics import HMAC_OFFLOAD_QUEUE_WAIT_SECONDS, HMAC_VERIFICATIONS_TOTAL
+
+_executor: ThreadPoolExecutor | None = None
+
+T = TypeVar("T")
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.hmac_offload_max_workers,
+            thread_name_prefix="hmac-verify",
+        )
+    return _executor
+
+
+async def run_verification(source: str, body_size: int, verify: Callable[..., T], *args: Any) -> T:
+    """서명 검증을 본문 크기에 따라 인라인 또는 전용 스레드풀에서 실행한다.
+
+    hashlib은 큰 버퍼(2KiB 초과)를 해시하는 동안 GIL을 놓으므로, 임계값 이상
+    본문은 스레드에서 계산해 이벤트 루프(다른 in-flight 웹훅)를 막지 않는다.
+    작은 본문은 스레드 전환 비용이 더 크므로 인라인으로 처리한다.
+    검증 실패 예외는 그대로 전파되고, 검증 함수의 반환값(본문 지문 등)은 그대로 돌려준다.
+    """
+    if body_size < settings.hmac_offload_threshold_bytes:
+        HMAC_VERIFICATIONS_TOTAL.labels(source=source, mode="inline").inc()
+        return verify(*args)
+
+    HMAC_VERIFICATIONS_TOTAL.labels(source=source, mode="offloaded").inc()
+    submitted_at = time.perf_counter()
+
+    def _run() -> T:
+        HMAC_OFFLOAD_QUEUE_WAIT_SECONDS.observe(time.perf_counter() - submitted_at)
+        return verify(*args)
+
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), _run)
+
+
+def shutdown() -> None:
+    """lifespan 종료 시 스레드풀 정리."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,235 @@
+"""웹훅 멱등키 예약 — 공급자 재시도(Stripe/GitHub) 중복 큐잉 방지.
+
+키는 NX로 예약(reserve)하고, 큐잉이 실패하면 해제(release)해 재시도가
+"already processed"로 조용히 드롭되지 않게 한다. 키에 tenant_id를 포함해
+테넌트 간 충돌을 없앤다(L4).
+
+저장 방식은 두 가지다(`IDEMPOTENCY_STORE`).
+
+- `keys`(기본): 이벤트마다 문자열 키 하나 + TTL.
+- `compact`: 테넌트·소스·시간(1h) 버킷 해시에 event_id의 8바이트 다이제스트를 필드로 담고,
+  버킷 단위로 만료시킨다. 키당 오버헤드(키 객체·만료 엔트리)가 사라진다.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import redis.asyncio as aioredis
+from redis.commands.core import AsyncScript
+
+from .config import settings
+from .metrics import IDEMPOTENCY_LOCAL_LOOKUPS_TOTAL
+
+IDEMPOTENCY_TTL_SECONDS = 86400
+
+
+@dataclass(frozen=True)
+class IdempotencyKey:
+    tenant_id: str
+    source: str
+    event_id: str
+
+    def __str__(self) -> str:
+        return f"webhook:idempotency:{self.tenant_id}:{self.source}:{self.event_id}"
+
+    @classmethod
+    def for_event(
+        cls, tenant_id: str, source: str, event_id: str | None, fingerprint: str | None = None
+    ) -> "IdempotencyKey | None":
+        """공급자 event_id 우선, 없으면 본문 지문(`fp:` 접두) — 둘 다 없으면 멱등 처리 안 함."""
+        if event_id:
+            return cls(tenant_id, source, event_id)
+        if fingerprint:
+            return cls(tenant_id, source, f"fp:{fingerprint}")
+        return None
+
+
+class IdempotencyStore:
+    """Redis `SET NX EX` 기반 예약 저장소.
+
+    `reserve_in`/`release_in`은 같은 명령을 파이프라인에 쌓는다 — 배치 큐잉이
+    여러 요청의 예약을 한 번의 왕복으로 보낼 때 쓴다. 결과 해석은 `is_reserved`.
+    """
+
+    # 키 하나가 예약 하나 — Lua 수신 게이트가 같은 키로 직접 예약할 수 있다
+    single_key = True
+
+    def __init__(self, redis_client: aioredis.Redis, ttl: int = IDEMPOTENCY_TTL_SECONDS):
+        self.redis = redis_client
+        self.ttl = ttl
+
+    async def reserve(self, key: IdempotencyKey, token: str = "1") -> bool:
+        """처음 보는 이벤트면 True(예약됨), 이미 예약·처리된 이벤트면 False.
+
+        `token`은 예약자 식별값 — 재시작 후 같은 예약자가 자기 예약인지 `holder`로 확인한다.
+        """
+        return bool(await self.redis.set(str(key), token, ex=self.ttl, nx=True))
+
+    async def holder(self, key: IdempotencyKey) -> str | None:
+        value = await self.redis.get(str(key))
+        if isinstance(value, bytes):
+            return value.decode("utf-8")
+        return value
+
+    async def release(self, key: IdempotencyKey) -> None:
+        await self.redis.delete(str(key))
+
+    async def reserve_in(self, pipe: Any, key: IdempotencyKey) -> None:
+        pipe.set(str(key), "1", ex=self.ttl, nx=True)
+
+    async def release_in(self, pipe: Any, key: IdempotencyKey) -> None:
+        pipe.delete(str(key))
+
+    @staticmethod
+    def is_reserved(result: Any) -> bool:
+        return bool(result)
+
+
+# KEYS = 보존 기간을 덮는 버킷들(KEYS[1]이 현재 버킷)
+# ARGV = 다이제스트, 예약 값, 현재 버킷 만료 시각
+_COMPACT_RESERVE = """
+for i = 1, #KEYS do
+    if redis.call('HEXISTS', KEYS[i], ARGV[1]) == 1 then
+        return 0
+    end
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('EXPIREAT', KEYS[1], ARGV[3])
+return 1
+"""
+
+_COMPACT_RELEASE = """
+for i = 1, #KEYS do
+    redis.call('HDEL', KEYS[i], ARGV[1])
+end
+return 0
+"""
+
+_BUCKET_SECONDS = 3600
+
+
+class CompactIdempotencyStore(IdempotencyStore):
+    """시간 버킷 해시 기반 예약 저장소 — 수천만 건 규모에서 Redis 메모리를 줄인다.
+
+    `webhook:idem:{<tenant>}:<source>:<hour>` 해시의 필드 = blake2b(event_id) 8바이트,
+    값 = 예약 값. 해시 태그로 한 테넌트의 버킷을 같은 슬롯에 둔다(클러스터에서도 Lua 가능).
+    예약은 보존 기간을 덮는 버킷 전부를 HEXISTS로 확인한 뒤 현재 버킷에 HSET —
+    Lua 한 번(왕복 1회)이다. 버킷은 `끝 시각 + 보존 기간`에 통째로 만료된다.
+
+    8바이트 다이제스트 충돌은 같은 테넌트·소스·보존 창 안에서만 의미가 있다
+    (창당 1천만 건에서 약 3e-6) — 충돌 시 그 이벤트는 중복으로 드롭된다.
+    """
+
+    single_key = False
+
+    def __init__(
+        self,
+        redis_client: aioredis.Redis,
+        retention_hours: dict[str, int] | None = None,
+        default_retention_hours: int = IDEMPOTENCY_TTL_SECONDS // _BUCKET_SECONDS,
+        now: Any = time.time,
+    ):
+        super().__init__(redis_client)
+        self.retention_hours = retention_hours or {}
+        self.default_retention_hours = default_retention_hours
+        self._now = now
+        self._reserve = AsyncScript(redis_client, _COMPACT_RESERVE.encode())
+        self._release = AsyncScript(redis_client, _COMPACT_RELEASE.encode())
+
+    @staticmethod
+    def digest(event_id: str) -> bytes:
+        return hashlib.blake2b(event_id.encode("utf-8"), digest_size=8).digest()
+
+    def _buckets(self, key: IdempotencyKey) -> tuple[list[str], int]:
+        """(현재 버킷부터 과거로 보존 기간을 덮는 버킷 키들, 현재 버킷 만료 시각)."""
+        retention = self.retention_hours.get(key.source, self.default_retention_hours)
+        current = int(self._now()) // _BUCKET_SECONDS
+        prefix = f"webhook:idem:{{{key.tenant_id}}}:{key.source}"
+        buckets = [f"{prefix}:{current - i}" for i in range(retention + 1)]
+        expire_at = (current + 1 + retention) * _BUCKET_SECONDS
+        return buckets, expire_at
+
+    async def reserve(self, key: IdempotencyKey, token: str = "1") -> bool:
+        buckets, expire_at = self._buckets(key)
+        return bool(await self._reserve(buckets, [self.digest(key.event_id), token, expire_at]))
+
+    async def holder(self, key: IdempotencyKey) -> str | None:
+        buckets, _ = self._buckets(key)
+        field = self.digest(key.event_id)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for bucket in buckets:
+                pipe.hget(bucket, field)  # type: ignore[arg-type]  # 필드는 원시 바이트
+            values = await pipe.execute()
+        for value in values:
+            if value is not None:
+                return value.decode("utf-8") if isinstance(value, bytes) else value
+        return None
+
+    async def release(self, key: IdempotencyKey) -> None:
+        buckets, _ = self._buckets(key)
+        await self._release(buckets, [self.digest(key.event_id)])
+
+    async def reserve_in(self, pipe: Any, key: IdempotencyKey) -> None:
+        buckets, expire_at = self._buckets(key)
+        await self._reserve(buckets, [self.digest(key.event_id), "1", expire_at], client=pipe)
+
+    async def release_in(self, pipe: Any, key: IdempotencyKey) -> None:
+        buckets, _ = self._buckets(key)
+        await self._release(buckets, [self.digest(key.event_id)], client=pipe)
+
+
+def create_idempotency_store(redis_client: aioredis.Redis) -> IdempotencyStore:
+    if settings.idempotency_store == "compact":
+        return CompactIdempotencyStore(
+            redis_client, retention_hours=settings.idempotency_retention_hours
+        )
+    return IdempotencyStore(redis_client)
+
+
+class RecentEnqueues:
+    """큐잉이 확정된 멱등키의 프로세스 내 TTL/LRU — 재시도 폭주의 핫 중복을 로컬에서 거른다.
+
+    적중은 "확실한 중복"(Redis 왕복 없음), 미스는 "모름" — Redis 키가 여전히 원본이다.
+    발행까지 끝난(더 이상 해제되지 않는) 키만 넣는다. Redis의 중복 응답은 넣지 않는다:
+    다른 요청의 예약이 발행 실패로 해제될 수 있어, 로컬에 남기면 공급자 재시도를 잘못 드롭한다.
+    TTL은 Redis 키 TTL보다 짧아야 한다.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[IdempotencyKey, float] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def seen(self, key: IdempotencyKey) -> bool:
+        expires_at = self._entries.get(key)
+        if expires_at is None:
+            IDEMPOTENCY_LOCAL_LOOKUPS_TOTAL.labels(result="miss").inc()
+            return False
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            IDEMPOTENCY_LOCAL_LOOKUPS_TOTAL.labels(result="miss").inc()
+            return False
+        self._entries.move_to_end(key)
+        IDEMPOTENCY_LOCAL_LOOKUPS_TOTAL.labels(result="hit").inc()
+        return True
+
+    def add(self, key: IdempotencyKey) -> None:
+        self._entries[key] = time.monotonic() + self.ttl
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+def create_recent_enqueues() -> RecentEnqueues | None:
+    if not settings.duplicate_filter_enabled:
+        return None
+    return RecentEnqueues(
+        max_size=settings.duplicate_filter_max_size,
+        ttl=min(settings.duplicate_filter_ttl_seconds, IDEMPOTENCY_TTL_SECONDS),
+    )
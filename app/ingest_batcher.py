@@ -0,0 +1,272 @@
+"""버스트 수신용 마이크로 배치 큐잉 — 멱등 예약과 Celery 발행을 Redis 파이프라인으로 묶는다.
+
+요청마다 `SET NX` 왕복 + 브로커 발행 왕복을 하는 대신, 짧은 창(기본 2ms 또는 64건)
+동안 모인 요청을 한 번에 처리한다.
+
+1. 멱등 예약 — `SET NX` 전부를 한 파이프라인으로(왕복 1회)
+2. 예약된 항목 중 큰 본문만 블롭 저장소에(claim-check) — 중복은 쓰지 않는다
+3. 발행 — 예약된 항목의 Celery 메시지를 브로커 Redis에 `LPUSH` 파이프라인으로(왕복 1회)
+4. 실패 항목만 멱등키 `DEL`(왕복 1회, 실패가 있을 때만) + 블롭 삭제
+
+발행은 예약 결과에 의존하므로 1과 2를 한 파이프라인으로 합칠 수는 없다 — 배치당
+왕복 2회가 요청당 2회를 대체한다. 각 요청의 결과(큐잉·중복·실패)는 요청별 future로
+따로 돌려준다.
+
+kombu를 거치지 않고 Celery 프로토콜 v2 메시지를 직접 만들어 큐 리스트에 넣으므로
+Redis 브로커(`priority_steps`·`global_keyprefix` 미사용)에서만 쓴다 — 시작 시
+`unsupported_broker`가 확인하고 맞지 않으면 요청별 발행으로 돌아간다.
+`before/after_task_publish` 시그널은 발생하지 않는다.
+"""
+
+import asyncio
+import base64
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import redis.asyncio as aioredis
+from celery import Celery, Task
+from kombu.serialization import dumps as serialize
+from kombu.utils.json import dumps as json_dumps
+from kombu.utils.uuid import uuid
+
+from . import claim_check
+from .idempotency import IdempotencyKey, IdempotencyStore
+from .metrics import INGEST_BATCH_FLUSH_SECONDS, INGEST_BATCH_SIZE
+from .webhook_registry import WEBHOOK_TASK_PARAMS
+
+logger = logging.getLogger(__name__)
+
+_PAYLOAD_ARG = WEBHOOK_TASK_PARAMS.index("raw_payload")
+
+
+def unsupported_broker(app: Celery) -> str | None:
+    """이 브로커 설정에서 직접 LPUSH한 메시지가 kombu와 어긋나는 이유(없으면 None).
+
+    kombu Redis 전송은 `global_keyprefix`를 큐 키 앞에 붙이고, `priority_steps`에 따라
+    우선순위별 리스트(`<queue>\x06\x16<n>`)로 나눠 읽는다 — 둘 다 우리가 만드는 키와 다르다.
+    """
+    broker_url = app.conf.broker_url or ""
+    if not broker_url.startswith(("redis://", "rediss://")):
+        return "a Redis broker"
+    options = app.conf.broker_transport_options or {}
+    for option in ("global_keyprefix", "priority_steps"):
+        if options.get(option):
+            return f"broker_transport_options without {option}"
+    return None
+
+
+def build_redis_message(task: Task, args: list[Any], queue: str) -> bytes:
+    """`task.apply_async(args, queue=queue)`가 Redis 큐 리스트에 LPUSH하는 것과 같은 메시지."""
+    task_id = uuid()
+    message = task.app.amqp.as_task_v2(task_id, task.name, args=args, kwargs={})
+    content_type, content_encoding, body = serialize(
+        message.body, serializer=task.app.conf.task_serializer
+    )
+    if isinstance(body, str):
+        body = body.encode(content_encoding)
+    envelope = {
+        "body": base64.b64encode(body).decode("ascii"),
+        "content-encoding": content_encoding,
+        "content-type": content_type,
+        "headers": message.headers,
+        "properties": {
+            **message.properties,
+            "body_encoding": "base64",
+            "delivery_info": {"exchange": "", "routing_key": queue},
+            "delivery_mode": 2,
+            "delivery_tag": uuid(),
+            "priority": 0,
+        },
+    }
+    return json_dumps(envelope).encode("utf-8")
+
+
+@dataclass
+class _Submission:
+    key: IdempotencyKey | None
+    task: Task
+    args: list[Any]
+    queue: str
+    future: asyncio.Future
+    # False면 이미 예약된 키(수신 게이트) — 발행 실패 시 해제에만 쓴다
+    reserve: bool = True
+
+
+def _resolve(item: _Submission, result: bool | None = None, error: Exception | None = None):
+    # 요청이 이미 취소(클라이언트 끊김)됐으면 결과를 버린다
+    if item.future.done():
+        return
+    if error is not None:
+        item.future.set_exception(error)
+    else:
+        item.future.set_result(result)
+
+
+class IngestBatcher:
+    """요청을 모아 파이프라인 두 번(예약·발행)으로 처리하는 배치기.
+
+    `submit`은 큐잉되면 True, 멱등키가 이미 있으면(중복) False를 돌려준다.
+    `args`는 웹훅 태스크 인자 — 본문(`raw_payload`)의 claim-check는 예약 뒤에 배치기가 한다.
+    발행 실패 시에는 해당 항목의 멱등키를 해제한 뒤 예외를 그 요청에만 전파한다.
+    """
+
+    def __init__(
+        self,
+        idempotency: IdempotencyStore,
+        broker: aioredis.Redis,
+        *,
+        max_size: int = 64,
+        max_delay: float = 0.002,
+    ):
+        self.idempotency = idempotency
+        self.broker = broker
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._pending: list[_Submission] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def submit(
+        self,
+        key: IdempotencyKey | None,
+        task: Task,
+        args: list[Any],
+        queue: str,
+        *,
+        reserve: bool = True,
+    ) -> bool:
+        loop = asyncio.get_running_loop()
+        item = _Submission(key, task, args, queue, loop.create_future(), reserve)
+        self._pending.append(item)
+        if len(self._pending) >= self.max_size:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush_now)
+        return await item.future
+
+    def _flush_now(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        flush = asyncio.create_task(self._flush(batch))
+        self._flushes.add(flush)
+        flush.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list[_Submission]) -> None:
+        started = time.perf_counter()
+        INGEST_BATCH_SIZE.observe(len(batch))
+        try:
+            reserved = await self._reserve(batch)
+            if reserved:
+                reserved = await self._check_in(reserved)
+            if reserved:
+                await self._publish(reserved)
+        except Exception as e:
+            # 예상 밖 오류 — 아직 결과를 못 받은 요청 모두에 전파(루프에 남기지 않음)
+            logger.exception("Ingest batch flush failed")
+            for item in batch:
+                _resolve(item, error=e)
+        finally:
+            INGEST_BATCH_FLUSH_SECONDS.observe(time.perf_counter() - started)
+
+    async def _reserve(self, batch: list[_Submission]) -> list[_Submission]:
+        keyed = [(item, item.key) for item in batch if item.reserve and item.key is not None]
+        results: list[Any] = []
+        if keyed:
+            try:
+                async with self.idempotency.redis.pipeline(transaction=False) as pipe:
+                    for _, key in keyed:
+                        await self.idempotency.reserve_in(pipe, key)
+                    results = await pipe.execute(raise_on_error=False)
+            except Exception as e:
+                # 예약 단계 실패는 단건 경로와 같이 해제 없이 실패(5xx → 공급자 재시도)
+                for item in batch:
+                    _resolve(item, error=e)
+                return []
+
+        reserved = [item for item in batch if not item.reserve or item.key is None]
+        for (item, _), result in zip(keyed, results, strict=True):
+            if isinstance(result, Exception):
+                _resolve(item, error=result)
+            elif not self.idempotency.is_reserved(result):
+                _resolve(item, result=False)
+            else:
+                reserved.append(item)
+        return reserved
+
+    async def _check_in(self, reserved: list[_Submission]) -> list[_Submission]:
+        results = await asyncio.gather(
+            *(claim_check.check_in(item.args[_PAYLOAD_ARG]) for item in reserved),
+            return_exceptions=True,
+        )
+        ready: list[_Submission] = []
+        failed: list[tuple[_Submission, Exception]] = []
+        for item, result in zip(reserved, results, strict=True):
+            if isinstance(result, Exception):
+                failed.append((item, result))
+            else:
+                item.args[_PAYLOAD_ARG] = result
+                ready.append(item)
+        if failed:
+            await self._fail(failed)
+        return ready
+
+    async def _publish(self, reserved: list[_Submission]) -> None:
+        failed: list[tuple[_Submission, Exception]] = []
+        ready: list[tuple[_Submission, bytes]] = []
+        for item in reserved:
+            try:
+                ready.append((item, build_redis_message(item.task, item.args, item.queue)))
+            except Exception as e:
+                failed.append((item, e))
+
+        if ready:
+            try:
+                async with self.broker.pipeline(transaction=False) as pipe:
+                    for item, message in ready:
+                        pipe.lpush(item.queue, message)
+                    results = await pipe.execute(raise_on_error=False)
+            except Exception as e:
+                failed.extend((item, e) for item, _ in ready)
+            else:
+                for (item, _), result in zip(ready, results, strict=True):
+                    if isinstance(result, Exception):
+                        failed.append((item, result))
+                    else:
+                        _resolve(item, result=True)
+
+        if failed:
+            await self._fail(failed)
+
+    async def _fail(self, failed: list[tuple[_Submission, Exception]]) -> None:
+        # 큐잉되지 못한 항목 — 멱등키를 해제해 공급자 재시도가 드롭되지 않게, 블롭도 지운다
+        await self._release([item for item, _ in failed])
+        for item, error in failed:
+            payload = item.args[_PAYLOAD_ARG]
+            if claim_check.is_reference(payload):
+                await asyncio.to_thread(claim_check.release, payload)
+            _resolve(item, error=error)
+
+    async def _release(self, items: list[_Submission]) -> None:
+        keys = [item.key for item in items if item.key is not None]
+        if not keys:
+            return
+        try:
+            async with self.idempotency.redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    await self.idempotency.release_in(pipe, key)
+                await pipe.execute(raise_on_error=False)
+        except Exception:
+            # 해제 실패 — 키는 TTL(24h) 동안 남아 공급자 재시도가 중복으로 드롭될 수 있다
+            logger.exception("Failed to release idempotency keys for %d events", len(keys))
+
+    async def stop(self) -> None:
+        """대기 중인 요청을 마저 보내고 진행 중인 배치를 기다린다(lifespan 종료 시)."""
+        self._flush_now()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
@@ -0,0 +1,107 @@
+"""수신 게이트 — 테넌트 레이트 리밋과 멱등 예약을 Lua 스크립트 한 번(EVALSHA)으로.
+
+slowapi 리밋은 이 트리에서 프로세스 메모리 저장소라 인스턴스마다 따로 센다. 게이트는
+서명 검증 뒤 공유 리밋(Redis)과 멱등 `SET NX`를 원자적으로 처리하고 판정 코드 하나를
+돌려준다 — 검증된 요청 하나당 Redis 왕복은 예약만 하던 종전과 같은 한 번이다.
+
+- 리밋: 테넌트별 고정 창 카운터(`INCR` + 첫 요청에 `EXPIRE`), 창을 넘으면 남은 TTL을
+  Retry-After로 돌려준다. 리밋에 걸린 요청은 멱등키를 예약하지 않는다(재시도가 드롭되지 않게).
+- 예약: `SET key token NX EX ttl` — 단건 경로(`IdempotencyStore.reserve`)와 같은 키·TTL.
+- 검증 전 폭주(무서명·위조)는 엔드포인트의 slowapi 리밋이 막는다 — 게이트는 검증 뒤에만
+  돌므로 검증 안 된 요청이 키를 선점하지 못한다.
+
+스크립트는 리밋 키와 멱등키 두 개를 건드린다 — 두 키의 슬롯이 갈리는 Redis Cluster에서는
+쓸 수 없어 lifespan이 `unsupported_redis`로 확인하고 끈다. 스크립트는 lifespan에서
+`SCRIPT LOAD`로 미리 올려 두고, Redis 재시작·페일오버로 스크립트 캐시가 비면(NOSCRIPT)
+다시 올린 뒤 한 번 재시도한다.
+"""
+
+from dataclasses import dataclass
+from enum import IntEnum
+
+import redis.asyncio as aioredis
+from redis.exceptions import NoScriptError
+
+from .idempotency import IDEMPOTENCY_TTL_SECONDS, IdempotencyKey
+
+# KEYS[1] = 레이트 리밋 카운터, KEYS[2] = 멱등키(없을 수 있음)
+# ARGV[1] = 창당 허용 수, ARGV[2] = 창 길이(초), ARGV[3] = 멱등 TTL(초), ARGV[4] = 예약 값
+_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+if count > tonumber(ARGV[1]) then
+    return {2, redis.call('TTL', KEYS[1])}
+end
+if #KEYS < 2 then
+    return {0, 0}
+end
+if redis.call('SET', KEYS[2], ARGV[4], 'NX', 'EX', ARGV[3]) then
+    return {0, 0}
+end
+return {1, 0}
+"""
+
+
+class Verdict(IntEnum):
+    ACCEPTED = 0
+    DUPLICATE = 1
+    RATE_LIMITED = 2
+
+
+@dataclass(frozen=True)
+class GateResult:
+    verdict: Verdict
+    retry_after: int = 0
+
+
+def rate_limit_key(tenant_id: str) -> str:
+    return f"webhook:ratelimit:{tenant_id}"
+
+
+async def unsupported_redis(redis_client: aioredis.Redis) -> str | None:
+    """이 Redis에서 게이트 스크립트를 쓸 수 없는 이유(없으면 None).
+
+    리밋 키와 멱등키는 해시 태그를 공유하지 않는다 — 클러스터에서는 CROSSSLOT으로 실패한다.
+    """
+    info = await redis_client.info("cluster")
+    if int(info.get("cluster_enabled", 0)):
+        return "a non-cluster Redis"
+    return None
+
+
+class IngestGate:
+    def __init__(
+        self,
+        redis_client: aioredis.Redis,
+        *,
+        limit: int,
+        window_seconds: int = 60,
+        idempotency_ttl: int = IDEMPOTENCY_TTL_SECONDS,
+    ):
+        self.redis = redis_client
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.idempotency_ttl = idempotency_ttl
+        self._sha: str | None = None
+
+    async def load(self) -> str:
+        """스크립트를 서버 캐시에 올린다(lifespan 시작 시)."""
+        self._sha = await self.redis.script_load(_SCRIPT)
+        return self._sha
+
+    async def check(self, tenant_id: str, key: IdempotencyKey | None) -> GateResult:
+        """리밋 카운트 + (키가 있으면) 멱등 예약을 한 번의 왕복으로."""
+        keys = [rate_limit_key(tenant_id)]
+        if key is not None:
+            keys.append(str(key))
+        args = [str(self.limit), str(self.window_seconds), str(self.idempotency_ttl), "1"]
+        sha = self._sha or await self.load()
+        try:
+            result = await self.redis.evalsha(sha, len(keys), *keys, *args)  # type: ignore[misc]
+        except NoScriptError:
+            sha = await self.load()
+            result = await self.redis.evalsha(sha, len(keys), *keys, *args)  # type: ignore[misc]
+        code, retry_after = result
+        return GateResult(Verdict(int(code)), max(int(retry_after), 0))
@@ -0,0 +1,106 @@
+"""대형 JSON 본문에서 필요한 최상위 키만 읽는 지연 추출기.
+
+수신·워커가 쓰는 값은 최상위 키 몇 개(`id`·`type`·`action`·`sender`·`repository`)뿐인데,
+수 MB GitHub push를 orjson으로 통째로 읽으면 본문 크기만큼 객체 그래프가 생긴다.
+여기서는 최상위 멤버를 정규식으로 하나씩 훑고, 원하는 키의 값만 orjson으로 디코드한다.
+나머지 값은 디코드하지 않고 건너뛴다.
+
+- 건너뛰기는 소유(possessive) 수량자 정규식 한 번 — 문자열 안의 괄호·이스케이프를 고려하고
+  `_MAX_DEPTH` 단계까지 중첩을 따라간다. 되추적이 없어 입력 크기에 선형
+- 원하는 키를 모두 찾으면 나머지 본문은 보지 않는다(Stripe `id`는 보통 첫 키)
+- 정규식 건너뛰기는 orjson 파싱보다 바이트당 약 2배 느리다 — 건너뛴 바이트가 본문의
+  1/`_SKIP_RATIO`를 넘으면(필요한 키가 큰 값 뒤에 있거나 없으면 — GitHub push에는
+  `action`이 없다) 그 자리에서 orjson 전체 파싱으로 대체한다. 대체해도 낭비는 그 앞부분뿐
+- 중첩이 더 깊거나 형식이 예상과 다르면 orjson 전체 파싱으로 대체 — 결과는 같다
+- 건너뛴 값의 문법은 검증하지 않는다(괄호 짝과 문자열 경계만 본다)
+"""
+
+import re
+from collections.abc import Iterable
+from typing import Any
+
+import orjson
+
+# 이보다 깊은 중첩은 전체 파싱으로 대체(GitHub·Stripe 페이로드는 10단계 미만)
+_MAX_DEPTH = 16
+# 건너뛸 수 있는 바이트 = 본문 길이 // _SKIP_RATIO — 넘으면 전체 파싱이 더 싸다
+# (benchmarks/bench_json_fields.py)
+_SKIP_RATIO = 64
+
+_WS = rb"[ \t\r\n]*+"
+_STRING = rb'"[^"\\]*+(?:\\.[^"\\]*+)*+"'
+# 괄호·문자열이 아닌 구간(숫자·리터럴·구분자·공백)과 문자열
+_FLAT = rb'(?:[^"\[\]{}]++|' + _STRING + rb")"
+
+
+def _nested(depth: int) -> bytes:
+    # 괄호 안의 내용 — 한 단계마다 바깥 패턴이 안쪽 패턴을 한 번 감싼다(길이 선형)
+    inner = _FLAT + rb"*+"
+    for _ in range(depth - 1):
+        inner = rb"(?:" + _FLAT + rb"|[\[{]" + inner + rb"[\]}])*+"
+    return inner
+
+
+# 값 종류마다 정규식을 따로 둔다 — 한 패턴의 분기(|)로 묶으면 엔진이 되돌아갈 자리를
+# 반복마다 스택에 쌓아 큰 값에서 느려진다
+_KEY = re.compile(_WS + rb"(" + _STRING + rb")" + _WS + rb":" + _WS)
+_VALUES = {
+    ord('"'): re.compile(_STRING),
+    ord("{"): re.compile(rb"\{" + _nested(_MAX_DEPTH) + rb"\}"),
+    ord("["): re.compile(rb"\[" + _nested(_MAX_DEPTH) + rb"\]"),
+}
+_SCALAR = re.compile(rb'[^\s"\[\]{},:]++')
+_SEPARATOR = re.compile(_WS + rb"([,}])")
+_OPEN = re.compile(_WS + rb"\{")
+_CLOSE = re.compile(_WS + rb"\}")
+
+
+def extract(body: bytes, keys: Iterable[str]) -> dict[str, Any]:
+    """본문 최상위 객체에서 `keys` 값만 디코드해 돌려준다(없는 키는 결과에서 빠짐).
+
+    최상위가 JSON 객체가 아니면 ValueError.
+    """
+    wanted = set(keys)
+    opened = _OPEN.match(body)
+    if opened is None:
+        raise ValueError("JSON body is not an object")
+    found: dict[str, Any] = {}
+    budget = len(body) // _SKIP_RATIO
+    pos = opened.end()
+    if _CLOSE.match(body, pos):
+        return found
+    while wanted:
+        member = _KEY.match(body, pos)
+        if member is None or member.end() == len(body):
+            return _extract_parsed(body, keys)
+        key = _key(member.group(1))
+        start = member.end()
+        # 원하지 않는 값은 남은 예산 안에서만 훑는다 — 다 못 훑으면 매치 실패로 대체
+        end = len(body) if key in wanted else min(len(body), start + budget)
+        value = _VALUES.get(body[start], _SCALAR).match(body, start, end)
+        if value is None:
+            return _extract_parsed(body, keys)
+        if key in wanted:
+            found[key] = orjson.loads(memoryview(body)[value.start() : value.end()])
+            wanted.discard(key)
+        else:
+            budget -= value.end() - start
+        separator = _SEPARATOR.match(body, value.end())
+        if separator is None:
+            return _extract_parsed(body, keys)
+        if separator.group(1) == b"}":
+            break
+        pos = separator.end()
+    return found
+
+
+def _key(raw: bytes) -> str:
+    # 이스케이프가 없는 키(대부분)는 따옴표만 벗긴다
+    return orjson.loads(raw) if b"\\" in raw else raw[1:-1].decode()
+
+
+def _extract_parsed(body: bytes, keys: Iterable[str]) -> dict[str, Any]:
+    payload = orjson.loads(body)
+    if not isinstance(payload, dict):
+        raise ValueError("JSON body is not an object")
+    return {key: payload[key] for key in keys if key in payload}
@@ -1,10 +1,15 @@
+import asyncio
+import contextlib
 import logging
 import time
 from contextlib import asynccontextmanager
+from datetime import date, datetime
+from pathlib import Path
 from typing import Any
 
+import orjson
 import redis.asyncio as aioredis
-from fastapi import Depends, FastAPI, HTTPException, Request, status
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
@@ -18,7 +23,8 @@ from starlette.middleware.sessions import SessionMiddleware
 
 from keycloak import KeycloakOpenID  # type: ignore[attr-defined]
 
-from . import admin, database, webhooks  # noqa: F401
+from . import admin, archive, claim_check, database, hmac_offload, webhooks  # noqa: F401
+from .celery_worker import celery
 from .config import settings
 from .dependencies import (
     WebhookVerifier,
@@ -27,14 +33,27 @@ from .dependencies import (
     get_tenant_id_from_path,
     limiter,
 )
+from .idempotency import (
+    IdempotencyKey,
+    RecentEnqueues,
+    create_idempotency_store,
+    create_recent_enqueues,
+)
+from .ingest_batcher import IngestBatcher, unsupported_broker
+from .ingest_gate import IngestGate, Verdict, unsupported_redis
 from .logging_config import setup_logging
 from .metrics import (
     CUSTOMER_WEBHOOK_ERRORS_TOTAL,
     CUSTOMER_WEBHOOK_TOTAL,
     WEBHOOK_PROCESSING_DURATION,
 )
+from .payload_paths import PathName
+from .publisher import PublisherOverloaded, TaskPublisher, task_publisher
 from .repositories.webhook_event_repository import WebhookEventRepository
-from .webhook_registry import get_task
+from .spool import Spool, SpoolDrainer, SpoolRecord
+from .streams import StreamPublisher
+from .tenant_cache import create_tenant_cache
+from .webhook_registry import get_queue, get_task
 
 setup_logging()
 logger = logging.getLogger(__name__)
@@ -50,12 +69,98 @@ keycloak_openid = KeycloakOpenID(
 )
 
 
+def _create_stream_publisher() -> StreamPublisher | None:
+    if settings.ingest_transport != "streams":
+        return None
+    if not settings.celery_broker_url.startswith(("redis://", "rediss://")):
+        logger.warning("Streams transport requires a Redis broker; falling back to Celery.")
+        return None
+    return StreamPublisher(
+        aioredis.from_url(settings.celery_broker_url, decode_responses=False),
+        max_len=settings.stream_max_len,
+    )
+
+
+def _create_ingest_batcher(redis_client: aioredis.Redis) -> IngestBatcher | None:
+    if not settings.ingest_batching_enabled:
+        return None
+    if settings.ingest_transport == "streams":
+        # 배치기는 Celery 메시지를 직접 LPUSH한다 — 스트림 전송에서는 요청별 XADD
+        logger.warning("Ingest batching is not supported with the streams transport; disabled.")
+        return None
+    requirement = unsupported_broker(celery)
+    if requirement is not None:
+        logger.warning(
+            "Ingest batching requires %s; falling back to per-request publish.", requirement
+        )
+        return None
+    return IngestBatcher(
+        create_idempotency_store(redis_client),
+        aioredis.from_url(settings.celery_broker_url, decode_responses=False),
+        max_size=settings.ingest_batch_max_size,
+        max_delay=settings.ingest_batch_max_delay_ms / 1000,
+    )
+
+
+async def _create_ingest_gate(redis_client: aioredis.Redis) -> IngestGate | None:
+    if not settings.ingest_lua_gate_enabled:
+        return None
+    requirement = await unsupported_redis(redis_client)
+    if requirement is not None:
+        logger.warning(
+            "Ingest Lua gate requires %s; falling back to separate reservation.", requirement
+        )
+        return None
+    gate = IngestGate(redis_client, limit=settings.webhook_rate_limit_per_minute)
+    await gate.load()
+    return gate
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Application startup.")
     app.state.redis = aioredis.from_url(settings.redis_url, decode_responses=False)
+    app.state.tenant_cache = create_tenant_cache()
+    invalidation_listener = None
+    if app.state.tenant_cache is not None:
+        invalidation_listener = asyncio.create_task(app.state.tenant_cache.listen(app.state.redis))
+    app.state.recent_enqueues = create_recent_enqueues()
+    app.state.ingest_gate = await _create_ingest_gate(app.state.redis)
+    app.state.stream_publisher = _create_stream_publisher()
+    app.state.ingest_batcher = _create_ingest_batcher(app.state.redis)
+    app.state.spool = None
+    spool_drainer = None
+    if settings.ingest_spool_enabled:
+        app.state.spool = Spool.open(
+            Path(settings.ingest_spool_dir), settings.ingest_spool_segment_max_bytes
+        )
+        drainer = SpoolDrainer(
+            app.state.spool,
+            create_idempotency_store(app.state.redis),
+            batch_size=settings.ingest_spool_drain_batch,
+            recent=app.state.recent_enqueues,
+            publisher=app.state.stream_publisher,
+        )
+        spool_drainer = asyncio.create_task(drainer.run())
+    app.state.spool_drainer = spool_drainer
     yield
+    if spool_drainer is not None:
+        spool_drainer.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await spool_drainer
+        app.state.spool.close()
+    if app.state.ingest_batcher is not None:
+        await app.state.ingest_batcher.stop()
+        await app.state.ingest_batcher.broker.close()
+    if invalidation_listener is not None:
+        invalidation_listener.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await invalidation_listener
+    task_publisher.stop()
+    if app.state.stream_publisher is not None:
+        await app.state.stream_publisher.close()
     await app.state.redis.close()
+    hmac_offload.shutdown()
     logger.info("Application shutdown.")
 
 
@@ -146,10 +251,15 @@ async def read_root():
 
 
 @app.get("/health", tags=["Health"])
-async def health_check(db: AsyncSession = Depends(database.get_async_db)) -> dict:
+async def health_check(request: Request, db: AsyncSession = Depends(database.get_async_db)) -> dict:
     """
     Health check endpoint to verify service status.
     """
+    # fast-ack 스풀 드레이너가 멈췄으면 202는 나가도 아무것도 발행되지 않는다
+    spool_drainer: asyncio.Task | None = getattr(request.app.state, "spool_drainer", None)
+    if spool_drainer is not None and spool_drainer.done():
+        logger.error("Health check failed: spool drainer stopped")
+        raise HTTPException(status_code=503, detail="Service Unavailable")
     try:
         # 비동기 세션으로 DB 연결 확인 — 이벤트 루프를 블로킹하지 않음
         await db.execute(text("SELECT 1"))
@@ -163,6 +273,46 @@ async def health_check(db: AsyncSession = Depends(database.get_async_db)) -> dic
 # --- Webhook Endpoints --- #
 
 
+def _parse_payload(body: bytes) -> dict[str, Any]:
+    """원본 바이트를 orjson으로 한 번만 디코드 — JSON 객체가 아니면 422.
+
+    FastAPI의 `payload: dict` 바디 파싱을 대체한다. 오류 형식은 FastAPI 기본
+    검증 오류와 같게 맞춰 공통 Envelope(422)로 나간다.
+    """
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        raise RequestValidationError(
+            [
+                {
+                    "type": "json_invalid",
+                    "loc": ("body", e.pos),
+                    "msg": "JSON decode error",
+                    "input": {},
+                    "ctx": {"error": e.msg},
+                }
+            ]
+        ) from e
+    if not isinstance(payload, dict):
+        raise RequestValidationError(
+            [
+                {
+                    "type": "dict_type",
+                    "loc": ("body",),
+                    "msg": "Input should be a valid dictionary",
+                    "input": payload,
+                }
+            ]
+        )
+    return payload
+
+
+async def _release_claim(value: Any) -> None:
+    # 큐잉되지 않은 claim-check 블롭 정리(중복·발행 실패)
+    if claim_check.is_reference(value):
+        await asyncio.to_thread(claim_check.release, value)
+
+
 def _extract_event_id(source: str, request: Request, payload: dict) -> str | None:
     if source == "github":
         return request.headers.get("X-GitHub-Delivery")
@@ -175,69 +325,152 @@ def _extract_event_id(source: str, request: Request, payload: dict) -> str | Non
     "/webhooks/{tenant_id}/{source}",
     tags=["Webhooks"],
     status_code=status.HTTP_202_ACCEPTED,
+    # 바디는 원본 바이트로 직접 읽는다 — 문서(OpenAPI)에는 JSON 객체로 표기
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": {"type": "object"}}},
+        }
+    },
 )
-@limiter.limit("120/minute")  # Override default limit for this specific endpoint
+# Override default limit for this specific endpoint (프로세스 메모리 — 서명 검증 전이라
+# 위조·무서명 폭주도 걸린다. Lua 게이트가 켜지면 검증 뒤 공유 리밋을 한 번 더 센다)
+@limiter.limit(f"{settings.webhook_rate_limit_per_minute}/minute")
 async def receive_webhook(
     tenant_id: str,
     source: str,
     request: Request,
-    payload: dict[Any, Any],
     db: AsyncSession = Depends(database.get_async_db),
     redis_client: aioredis.Redis = Depends(get_redis),
 ):
     """
     Receives webhooks from a specific tenant and source, verifies them,
     and queues them for processing.
+
+    The body is read once as raw bytes: the same buffer is used for the HMAC,
+    decoded once (orjson) for the event id, and forwarded unchanged to the worker.
+    The full decode also rejects malformed JSON with 422 before anything is queued.
     """
+    # 버퍼링 모드: Starlette가 바디를 캐시하므로 verifier의 request.body()는 같은 버퍼를
+    # 재사용한다. 스트리밍 모드: 본문은 검증하면서 읽으므로 파싱은 검증 뒤로 미룬다.
+    payload: dict[str, Any] | None = None
+    if not settings.ingest_streaming_enabled:
+        payload = _parse_payload(await request.body())
+
     start_time = time.time()  # 시간 측정 시작
     try:
         # The verifier dependency will handle tenant validation and signature checks.
         if source == "github":
-            customer = await verify_github(request, tenant_id, db)
+            verified = await verify_github(request, tenant_id, db)
         elif source == "stripe":
-            customer = await verify_stripe(request, tenant_id, db)
+            verified = await verify_stripe(request, tenant_id, db)
         else:
             raise HTTPException(status_code=404, detail=f"Source '{source}' not supported.")
+        customer, body = verified.customer, verified.body
+        if payload is None:
+            payload = _parse_payload(body)
 
         # Idempotency check — 중복 웹훅 방지 (Stripe/GitHub 재시도 대응)
         # 멱등키는 NX로 예약(reserve)하되, 큐잉 실패 시 해제해 공급자 재시도가
-        # "already processed"로 조용히 드롭되는 유실 창을 없앤다.
-        # 키에 tenant_id를 포함해 테넌트 간 충돌 가능성을 제거(L4).
+        # "already processed"로 조용히 드롭되는 유실 창을 없앤다(app/idempotency.py).
         event_id = _extract_event_id(source, request, payload)
-        idempotency_key: str | None = None
-        if event_id:
-            idempotency_key = f"webhook:idempotency:{tenant_id}:{source}:{event_id}"
-            if not await redis_client.set(idempotency_key, "1", ex=86400, nx=True):
+        # 공급자 ID가 없으면 본문 지문(FINGERPRINT_DEDUP_ENABLED)으로 같은 예약 경로를 탄다
+        fingerprint = None if event_id else verified.fingerprint
+        idempotency_key = IdempotencyKey.for_event(tenant_id, source, event_id, fingerprint)
+        task = get_task(source)
+        queue_name = get_queue(source)
+        task_args = [customer.id, body, event_id]
+        if fingerprint:
+            task_args.append(fingerprint)
+        spool: Spool | None = getattr(request.app.state, "spool", None)
+        idempotency = create_idempotency_store(redis_client)
+
+        # 로컬 중복 필터 — 이 프로세스가 최근 큐잉을 확정한 키면 Redis를 거치지 않는다
+        recent: RecentEnqueues | None = getattr(request.app.state, "recent_enqueues", None)
+        if recent is not None and idempotency_key and recent.seen(idempotency_key):
+            logger.info("Duplicate %s webhook ignored: %s", source, event_id)
+            return {"message": "Webhook already processed."}
+
+        # Lua 게이트 — 공유 리밋 판정과 멱등 예약을 한 번의 왕복으로(검증 뒤라 위조 요청은
+        # 키를 선점하지 못한다). 스풀 모드는 드레이너가, compact 저장소는 저장소 스크립트가 예약
+        reserved = False
+        gate: IngestGate | None = getattr(request.app.state, "ingest_gate", None)
+        if gate is not None:
+            gate_key = idempotency_key if spool is None and idempotency.single_key else None
+            result = await gate.check(tenant_id, gate_key)
+            if result.verdict is Verdict.RATE_LIMITED:
+                raise HTTPException(
+                    status_code=429,
+                    detail=f"{gate.limit} per 1 minute",
+                    headers={"Retry-After": str(result.retry_after)},
+                )
+            if result.verdict is Verdict.DUPLICATE:
+                logger.info("Duplicate %s webhook ignored: %s", source, event_id)
+                return {"message": "Webhook already processed."}
+            reserved = gate_key is not None
+
+        if spool is not None:
+            # fast-ack — fsync까지만 기다리고 응답, 멱등 예약·발행은 드레이너가 한다
+            await spool.append(
+                SpoolRecord(tenant_id, source, event_id, str(customer.id), body, fingerprint)
+            )
+            CUSTOMER_WEBHOOK_TOTAL.labels(customer_id=str(customer.id), source=source).inc()
+            return {"message": "Webhook received and queued for processing."}
+
+        batcher: IngestBatcher | None = getattr(request.app.state, "ingest_batcher", None)
+        if batcher is not None:
+            # 배치 큐잉 — 예약·claim-check·발행·실패 시 해제를 배치기가 요청별로 처리한다
+            queued = await batcher.submit(
+                idempotency_key, task, task_args, queue_name, reserve=not reserved
+            )
+            if not queued:
                 logger.info("Duplicate %s webhook ignored: %s", source, event_id)
                 return {"message": "Webhook already processed."}
+            if recent is not None and idempotency_key:
+                recent.add(idempotency_key)
+            CUSTOMER_WEBHOOK_TOTAL.labels(customer_id=str(customer.id), source=source).inc()
+            return {"message": "Webhook received and queued for processing."}
+
+        if idempotency_key and not reserved and not await idempotency.reserve(idempotency_key):
+            logger.info("Duplicate %s webhook ignored: %s", source, event_id)
+            return {"message": "Webhook already processed."}
 
         # Increment webhook total counter
         CUSTOMER_WEBHOOK_TOTAL.labels(customer_id=str(customer.id), source=source).inc()
 
         logger.info(f"Received {source} webhook for tenant {tenant_id}. Queuing for processing.")
-        task = get_task(source)
 
+        # 스트림 전송이면 XADD 한 번, 아니면 Celery 발행 스레드
+        publisher: StreamPublisher | TaskPublisher = (
+            getattr(request.app.state, "stream_publisher", None) or task_publisher
+        )
         try:
-            # Route tasks to different queues based on source or customer priority
-            if source == "github":  # Example of routing
-                task.apply_async(
-                    args=[customer.id, payload, event_id],
-                    queue="high_priority",
-                )
-            else:
-                task.apply_async(args=[customer.id, payload, event_id], queue="default")
-        except Exception:
+            # 큰 본문은 블롭 저장소에 두고 참조만 발행(claim-check, 예약 뒤라 중복은 쓰지 않음)
+            task_args[1] = await claim_check.check_in(body)
+            # 발행은 전용 스레드(또는 async XADD)로 — 브로커 왕복 동안 이벤트 루프를 막지 않는다
+            await publisher.publish(task, task_args, queue=queue_name)
+        except Exception as e:
             # 큐잉 실패 — 예약한 멱등키를 해제해 공급자 재시도가 드롭되지 않게 함
             if idempotency_key:
-                await redis_client.delete(idempotency_key)
+                await idempotency.release(idempotency_key)
+            await _release_claim(task_args[1])
+            if isinstance(e, PublisherOverloaded):
+                raise HTTPException(
+                    status_code=503, detail="Webhook queue is temporarily overloaded."
+                ) from e
             raise
 
+        if recent is not None and idempotency_key:
+            recent.add(idempotency_key)
         return {"message": "Webhook received and queued for processing."}
     except HTTPException as e:
         CUSTOMER_WEBHOOK_ERRORS_TOTAL.labels(
             customer_id=tenant_id, source=source, error_type=e.detail
         ).inc()
         raise e
+    except RequestValidationError:
+        # 스트리밍 모드의 검증 후 파싱 실패 — 422 Envelope 유지(5xx 흡수 금지)
+        raise
     except Exception as e:
         CUSTOMER_WEBHOOK_ERRORS_TOTAL.labels(
             customer_id=tenant_id,
@@ -262,12 +495,14 @@ def replay_event(
     tenant_id: str,
     event_id: int,
     request: Request,
+    received_on: date | None = None,
     db: Session = Depends(database.get_db),
     current_user: dict[str, Any] = Depends(get_current_user),
 ):
     """
     Re-queues a specific event for processing for a given tenant.
     Requires authentication via Keycloak.
+    Passing `received_on` (UTC date) limits the lookup to that day's partition.
     """
     logger.info(
         f"User {current_user.get('preferred_username')} "
@@ -292,25 +527,84 @@ def replay_event(
         db,
         event_id=event_id,
         customer_id=customer.id,  # type: ignore[arg-type]  # 레거시 Column 타입
+        received_on=received_on,
     )
 
-    if not db_event:
-        logger.warning("Event with id %s not found for tenant %s.", event_id, tenant_id)
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Event not found for this tenant",
+    if db_event:
+        source, payload = db_event.source, db_event.payload
+    else:
+        # DB에서 지워진(콜드 보관된) 이벤트는 보관 세그먼트에서 읽는다
+        archived = archive.find_event(
+            db,
+            customer_id=customer.id,  # type: ignore[arg-type]  # 레거시 Column 타입
+            event_id=event_id,
+            received_on=received_on,
         )
+        if archived is None:
+            logger.warning("Event with id %s not found for tenant %s.", event_id, tenant_id)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found for this tenant",
+            )
+        source, payload = archived["source"], archived["payload"]
 
     try:
-        task = get_task(db_event.source)  # type: ignore[arg-type]  # 레거시 Column 타입
+        task = get_task(source)  # type: ignore[arg-type]  # 레거시 Column 타입
         # Pass customer_id to the task for replay
-        task.delay(db_event.customer_id, db_event.payload)
+        task.delay(customer.id, payload)
     except NotImplementedError as e:
-        logger.error("Replay not implemented for source: %s", db_event.source)
+        logger.error("Replay not implemented for source: %s", source)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Replay not implemented for source '{db_event.source}'",
+            detail=f"Replay not implemented for source '{source}'",
         ) from e
 
     logger.info("Successfully re-queued event_id: %s for tenant %s.", event_id, tenant_id)
     return {"message": f"Event {event_id} has been re-queued for processing."}
+
+
+@app.get("/webhooks/{tenant_id}/events", tags=["Events"])
+@limiter.limit("30/minute", key_func=get_tenant_id_from_path)  # type: ignore[arg-type]
+def search_events(
+    tenant_id: str,
+    request: Request,
+    path: PathName,
+    value: str,
+    received_after: datetime | None = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(database.get_db),
+    current_user: dict[str, Any] = Depends(get_current_user),
+):
+    """
+    Finds a tenant's events by a provider object in the payload (see app/payload_paths.py),
+    most recent first. Requires the admin role.
+    """
+    roles = current_user.get("realm_access", {}).get("roles", [])
+    if "admin" not in roles:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to search events. Admin role required.",
+        )
+
+    customer = WebhookVerifier(source="any")._get_customer(db, tenant_id)
+    if not customer:
+        raise HTTPException(status_code=404, detail="Tenant not found or inactive.")
+
+    events = WebhookEventRepository.find_by_payload_path(
+        db,
+        customer_id=customer.id,  # type: ignore[arg-type]  # 레거시 Column 타입
+        path=path,
+        value=value,
+        received_after=received_after,
+        limit=limit,
+    )
+    return [
+        {
+            "id": event.id,
+            "source": event.source,
+            "event_id": event.event_id,
+            "status": event.status,
+            "received_at": event.received_at,
+        }
+        for event in events
+    ]
@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 CUSTOMER_WEBHOOK_TOTAL = Counter(
     "customer_webhook_total",
@@ -17,3 +17,155 @@ CUSTOMER_WEBHOOK_ERRORS_TOTAL = Counter(
     "Total number of webhook processing errors per customer and source",
     ["customer_id", "source", "error_type"],
 )
+
+TENANT_CACHE_LOOKUPS_TOTAL = Counter(
+    "tenant_cache_lookups_total",
+    "Tenant cache lookups by result (hit, negative_hit, miss)",
+    ["result"],
+)
+
+HMAC_VERIFICATIONS_TOTAL = Counter(
+    "hmac_verifications_total",
+    "Webhook signature verifications by execution mode (inline or offloaded)",
+    ["source", "mode"],
+)
+
+HMAC_OFFLOAD_QUEUE_WAIT_SECONDS = Histogram(
+    "hmac_offload_queue_wait_seconds",
+    "Time an offloaded signature verification waited for a thread-pool worker",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+TASK_PUBLISH_QUEUE_WAIT_SECONDS = Histogram(
+    "task_publish_queue_wait_seconds",
+    "Time a Celery publish waited in the publisher hand-off queue",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+TASK_PUBLISH_REJECTED_TOTAL = Counter(
+    "task_publish_rejected_total",
+    "Publishes rejected because the publisher hand-off queue was full",
+)
+
+INGEST_BATCH_SIZE = Histogram(
+    "ingest_batch_size",
+    "Number of webhook requests flushed together by the ingest batcher",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+
+INGEST_BATCH_FLUSH_SECONDS = Histogram(
+    "ingest_batch_flush_seconds",
+    "Time to reserve idempotency keys and publish one ingest batch",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+SPOOL_FSYNC_BATCH_SIZE = Histogram(
+    "spool_fsync_batch_size",
+    "Number of spooled webhook records made durable by one fsync (group commit)",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+
+SPOOL_FSYNC_SECONDS = Histogram(
+    "spool_fsync_seconds",
+    "Time to write and fsync one spool group commit",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+SPOOL_PENDING_BYTES = Gauge(
+    "spool_pending_bytes",
+    "Spooled bytes not yet forwarded to the broker by the drainer",
+)
+
+SPOOL_DRAINED_TOTAL = Counter(
+    "spool_drained_total",
+    "Spooled webhook records handled by the drainer (published, duplicate, failed)",
+    ["result"],
+)
+
+SPOOL_DRAIN_ERRORS_TOTAL = Counter(
+    "spool_drain_errors_total",
+    "Spool drain passes that failed (read, checkpoint or segment cleanup) and were retried",
+)
+
+IDEMPOTENCY_LOCAL_LOOKUPS_TOTAL = Counter(
+    "idempotency_local_lookups_total",
+    "In-process duplicate filter lookups by result (hit skips the Redis round-trip)",
+    ["result"],
+)
+
+WORKER_BATCH_SIZE = Histogram(
+    "worker_batch_size",
+    "Messages persisted per batch by the batch worker",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+
+WORKER_BATCH_FLUSH_SECONDS = Histogram(
+    "worker_batch_flush_seconds",
+    "Time to persist one batch (multi-row INSERT ... ON CONFLICT + commit) and settle its messages",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+WORKER_BATCH_MESSAGES_TOTAL = Counter(
+    "worker_batch_messages_total",
+    "Batch worker message outcomes (inserted, duplicate, retried, dead_lettered)",
+    ["result"],
+)
+
+ASYNC_WORKER_IN_FLIGHT = Gauge(
+    "async_worker_in_flight",
+    "Tasks currently running concurrently in the asyncio worker",
+)
+
+ASYNC_WORKER_TASKS_TOTAL = Counter(
+    "async_worker_tasks_total",
+    "asyncio worker task outcomes (succeeded, retried, failed, rejected)",
+    ["result"],
+)
+
+STREAM_LAG = Gauge(
+    "stream_lag",
+    "Entries in the ingest stream not yet delivered to the consumer group (XINFO GROUPS lag)",
+    ["stream"],
+)
+
+STREAM_PENDING_ENTRIES = Gauge(
+    "stream_pending_entries",
+    "Entries delivered to the consumer group but not yet acknowledged",
+    ["stream"],
+)
+
+STREAM_MESSAGES_TOTAL = Counter(
+    "stream_messages_total",
+    "Stream worker entry outcomes (inserted, duplicate, retried, claimed, dead_lettered, trimmed)",
+    ["result"],
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Sync engine pool connections in this process by state (checked_out, idle, overflow)",
+    ["state"],
+)
+
+DB_POOL_PINGS_TOTAL = Counter(
+    "db_pool_pings_total",
+    "Checkout liveness pings by result (skipped for recently used connections, ok, failed)",
+    ["result"],
+)
+
+CLAIM_CHECK_BLOBS_TOTAL = Counter(
+    "claim_check_blobs_total",
+    "Claim-check blob operations (stored, fetched, released, missing)",
+    ["op"],
+)
+
+PARTITION_MAINTENANCE_TOTAL = Counter(
+    "partition_maintenance_total",
+    "webhook_events partition maintenance actions (created, detached, dropped)",
+    ["action"],
+)
+
+EVENT_ARCHIVE_TOTAL = Counter(
+    "event_archive_total",
+    "Cold archive operations (archived rows, segments written, replayed, missing segments)",
+    ["op"],
+)
@@ -1,2 +1,4 @@
 from .customer import Customer  # noqa
 from .webhook_event import WebhookEvent  # noqa
+from .webhook_event_key import WebhookEventKey  # noqa
+from .webhook_event_archive import WebhookEventArchive  # noqa
@@ -1,11 +1,20 @@
+import asyncio
+import logging
 import uuid
 from datetime import datetime
 
-from sqlalchemy import JSON, Boolean, Column, DateTime, String
+import redis
+from sqlalchemy import JSON, Boolean, Column, DateTime, String, event, inspect
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Session, relationship
 
-from ..database import Base
+from ..config import settings
+from ..database import AsyncBackedSession, Base, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# 테넌트 캐시(app.tenant_cache)의 인스턴스 간 무효화 채널 — 메시지 본문은 변경된 tenant_id
+INVALIDATION_CHANNEL = "webhook:tenant-cache:invalidate"
 
 
 class Customer(Base):
@@ -21,3 +30,69 @@ class Customer(Base):
     allowed_event_types = Column(JSON, default=list, nullable=False)
 
     events = relationship("WebhookEvent", back_populates="customer")
+
+
+# ─── 테넌트 캐시 변경 통지 (publish) ───────────────────────────────────────────
+# 모델 옆에 둔다 — Customer를 쓰는 모든 곳(seed 스크립트·alembic·워커 등 앱 밖 포함)에서
+# 리스너가 등록돼 커밋이 무효화를 발행한다.
+
+_sync_redis: redis.Redis | None = None
+# 이벤트 루프에 띄운 발행 태스크 — 끝나기 전에 GC되지 않게 참조를 쥔다
+_publishing: set[asyncio.Task] = set()
+
+
+def publish_invalidation(tenant_ids: set[str]) -> None:
+    """변경된 tenant_id를 무효화 채널에 발행(best-effort, 동기 — 이벤트 루프에서 직접 부르지 말 것).
+
+    발행 실패는 커밋을 되돌리지 않는다 — 다른 인스턴스는 TTL 만료로 수렴한다.
+    """
+    global _sync_redis
+    if not tenant_ids:
+        return
+    try:
+        if _sync_redis is None:
+            _sync_redis = redis.Redis.from_url(settings.redis_url, socket_connect_timeout=1.0)
+        for tenant_id in tenant_ids:
+            _sync_redis.publish(INVALIDATION_CHANNEL, tenant_id)
+    except redis.RedisError:
+        logger.warning("Could not publish tenant cache invalidation", exc_info=True)
+
+
+_PENDING_KEY = "tenant_cache_invalidations"
+
+
+@event.listens_for(Customer, "after_insert")
+@event.listens_for(Customer, "after_update")
+@event.listens_for(Customer, "after_delete")
+def _collect_changed_tenant(mapper, connection, target: Customer) -> None:
+    # 커밋 전에는 발행하지 않는다 — 롤백되면 무효화할 이유가 없다.
+    session = Session.object_session(target)
+    if session is None:
+        return
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    pending.add(target.tenant_id)
+    # tenant_id 자체가 바뀐 경우 이전 값의 캐시도 비운다
+    pending.update(inspect(target).attrs.tenant_id.history.deleted or ())
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _publish_after_commit(session: Session) -> None:
+    publish_invalidation(session.info.pop(_PENDING_KEY, set()))
+
+
+@event.listens_for(AsyncBackedSession, "after_commit")
+def _publish_after_async_commit(session: Session) -> None:
+    # AsyncSession 커밋은 이벤트 루프 스레드에서 끝난다 — 동기 발행은 스레드로 넘긴다
+    tenant_ids = session.info.pop(_PENDING_KEY, set())
+    if not tenant_ids:
+        return
+    task = asyncio.get_running_loop().create_task(
+        asyncio.to_thread(publish_invalidation, tenant_ids)
+    )
+    _publishing.add(task)
+    task.add_done_callback(_publishing.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -3,12 +3,13 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     UniqueConstraint,
     func,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 
 from ..database import Base
@@ -17,24 +18,41 @@ from ..database import Base
 class WebhookEvent(Base):
     __tablename__ = "webhook_events"
 
-    # 멱등 고유제약 — Redis TTL 만료 후 재시도가 중복행을 만드는 것을 막는 backstop.
-    # event_id NULL 행(공급자 ID 미제공)은 NULL distinct 규칙으로 충돌하지 않는다.
+    # PostgreSQL 스키마는 마이그레이션이 만든다 — received_at RANGE 파티션 테이블
+    # (PK (id, received_at), app/partitions.py). ORM은 id만으로 행을 식별한다.
+    # 파티션 테이블의 고유 인덱스는 파티션 키를 포함해야 해서, 멱등 고유성은 BEFORE INSERT
+    # 트리거가 webhook_event_keys 원장에 키를 먼저 등록하는 방식으로 지킨다(alembic b7e4c1d92a6f).
+    # 아래 고유제약은 같은 규칙을 SQLite(테스트)에서 재현하는 용도 — event_id/fingerprint가
+    # NULL인 행은 NULL distinct 규칙으로 충돌하지 않는다.
     __table_args__ = (
         UniqueConstraint(
             "customer_id",
             "source",
             "event_id",
             name="uq_webhook_events_customer_source_event",
-        ),
+        ).ddl_if(dialect="sqlite"),
+        # 공급자 ID가 없는 요청의 backstop — 본문 지문(FINGERPRINT_DEDUP_ENABLED)으로 고유
+        UniqueConstraint(
+            "customer_id",
+            "source",
+            "fingerprint",
+            name="uq_webhook_events_customer_source_fingerprint",
+        ).ddl_if(dialect="sqlite"),
+        # 고객별 조회는 기간 조건과 함께 — 파티션 프루닝 뒤 파티션 안에서 인덱스 탐색
+        Index("ix_webhook_events_customer_id_received_at", "customer_id", "received_at"),
     )
 
-    id = Column(Integer, primary_key=True, index=True)
-    customer_id = Column(UUID(as_uuid=True), ForeignKey("customers.id"), nullable=False, index=True)
-    source = Column(String, index=True)
-    event_id = Column(String, index=True, nullable=True)
-    payload = Column(JSON)
-    received_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    id = Column(Integer, primary_key=True)
+    customer_id = Column(UUID(as_uuid=True), ForeignKey("customers.id"), nullable=False)
+    source = Column(String)
+    event_id = Column(String, nullable=True)
+    # 본문 blake2b-128 hex 지문 — event_id가 없을 때만 채운다
+    fingerprint = Column(String(32), nullable=True)
+    # PostgreSQL에서는 JSONB — 경로 조회가 문서를 다시 파싱하지 않는다(app/payload_paths.py)
+    payload = Column(JSON().with_variant(JSONB(), "postgresql"))
+    # 파티션 키 — 비워 두면 DB가 now()로 채운다
+    received_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    status = Column(String, default="PENDING", index=True, nullable=False)
+    status = Column(String, default="PENDING", nullable=False)
 
     customer = relationship("Customer", back_populates="events")
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from ..database import Base
+
+
+class WebhookEventArchive(Base):
+    """보관 세그먼트 목록 — 고객·이벤트 ID 범위·수신 기간으로 세그먼트를 찾는다(app/archive.py)."""
+
+    __tablename__ = "webhook_event_archives"
+    __table_args__ = (
+        Index(
+            "ix_webhook_event_archives_customer_id_event_range",
+            "customer_id",
+            "first_event_id",
+            "last_event_id",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    customer_id = Column(UUID(as_uuid=True), ForeignKey("customers.id"), nullable=False)
+    first_event_id = Column(Integer, nullable=False)
+    last_event_id = Column(Integer, nullable=False)
+    received_from = Column(DateTime(timezone=True), nullable=False)
+    received_to = Column(DateTime(timezone=True), nullable=False)
+    row_count = Column(Integer, nullable=False)
+    # ARCHIVE_DIR 기준 상대 경로 — 디렉터리를 옮겨도 목록은 그대로
+    path = Column(String, nullable=False, unique=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
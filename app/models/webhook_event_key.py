@@ -0,0 +1,20 @@
+from sqlalchemy import Column, DateTime, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from ..database import Base
+
+
+class WebhookEventKey(Base):
+    """멱등 원장 — 파티션된 webhook_events 대신 (customer_id, source, 키) 고유성을 지킨다.
+
+    webhook_events BEFORE INSERT 트리거만 쓴다(`e:<event_id>` 또는 `f:<fingerprint>`).
+    `period`(수신 월 시작, UTC) RANGE 파티션이라 고유성은 월 단위 — 트리거가 앞 달도 보고,
+    그보다 오래된 파티션은 `partitions.expire_dedup_keys`가 지운다.
+    """
+
+    __tablename__ = "webhook_event_keys"
+
+    customer_id = Column(UUID(as_uuid=True), primary_key=True)
+    source = Column(String, primary_key=True)
+    dedup_key = Column(String, primary_key=True)
+    period = Column(DateTime(timezone=True), primary_key=True)
@@ -0,0 +1,168 @@
+"""webhook_events 범위 파티션 관리 — 앞으로 쓸 파티션을 미리 만들고, 만료 파티션을 떼어 낸다.
+
+webhook_events는 `received_at` RANGE 파티션 테이블이다(alembic b7e4c1d92a6f). 파티션
+이름이 경계를 나타낸다: 월 단위 `webhook_events_p2026_10`, 일 단위 `webhook_events_p2026_10_18`.
+
+- 미리 만들기: 현재 기간부터 `PARTITIONS_AHEAD`개 뒤까지 — 맞는 파티션이 없으면 INSERT가
+  실패하므로(default 파티션은 두지 않음: 있으면 DETACH CONCURRENTLY를 쓸 수 없다) 여유 있게
+- 만료: 상한이 `PARTITION_RETENTION_DAYS`보다 오래된 파티션을 `DETACH ... CONCURRENTLY`
+  (삽입을 막지 않음). `PARTITION_EXPIRE_ACTION=drop`이면 이어서 DROP, detach면 보관 작업 몫
+- 멱등 원장(`webhook_event_keys`)은 월 단위 파티션(`webhook_event_keys_p2026_10`) — 앞 달
+  까지가 중복 판정 창이라 그보다 오래된 원장 파티션은 보존 설정과 무관하게 항상 지운다
+
+Celery beat가 `PARTITION_MAINTENANCE_INTERVAL_SECONDS`마다 `maintain_partitions`를 실행한다.
+"""
+
+import logging
+import re
+from datetime import UTC, datetime, timedelta
+from typing import Literal
+
+from sqlalchemy import Connection, text
+
+from . import database
+from .celery_worker import celery
+from .config import settings
+from .metrics import PARTITION_MAINTENANCE_TOTAL
+
+logger = logging.getLogger(__name__)
+
+PARENT = "webhook_events"
+KEYS_PARENT = "webhook_event_keys"
+Interval = Literal["month", "day"]
+
+_NAME = re.compile(r"^(\w+)_p(\d{4})_(\d{2})(?:_(\d{2}))?$")
+
+_LIST_PARTITIONS = text(
+    """
+SELECT c.relname, i.inhdetachpending
+FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = CAST(:parent AS regclass)
+"""
+)
+
+
+def period_start(at: datetime, interval: Interval) -> datetime:
+    """`at`이 속한 기간의 시작(UTC 자정·월초)."""
+    at = at.astimezone(UTC)
+    start = datetime(at.year, at.month, at.day, tzinfo=UTC)
+    return start.replace(day=1) if interval == "month" else start
+
+
+def next_period(start: datetime, interval: Interval) -> datetime:
+    if interval == "day":
+        return start + timedelta(days=1)
+    return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def partition_name(start: datetime, interval: Interval, parent: str = PARENT) -> str:
+    suffix = f"{start:%Y_%m}" if interval == "month" else f"{start:%Y_%m_%d}"
+    return f"{parent}_p{suffix}"
+
+
+def partition_bounds(name: str, parent: str = PARENT) -> tuple[datetime, datetime] | None:
+    """이름에서 [하한, 상한) — 이 모듈 규칙을 따르지 않는 파티션이면 None."""
+    match = _NAME.match(name)
+    if match is None or match[1] != parent:
+        return None
+    year, month, day = match.groups()[1:]
+    interval: Interval = "month" if day is None else "day"
+    start = datetime(int(year), int(month), int(day or 1), tzinfo=UTC)
+    return start, next_period(start, interval)
+
+
+def create_partition_sql(start: datetime, interval: Interval, parent: str = PARENT) -> str:
+    name = partition_name(start, interval, parent)
+    end = next_period(start, interval)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {parent} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def ensure_partitions(
+    conn: Connection, now: datetime, interval: Interval, ahead: int, parent: str = PARENT
+) -> list[str]:
+    """현재 기간과 그 뒤 `ahead`개 기간의 파티션을 만든다 — 새로 만든 이름을 돌려준다.
+
+    이미 있는 파티션과 범위가 겹치는 기간은 건너뛴다 — 마이그레이션이 월 단위로 만든
+    파티션 뒤에서 `PARTITION_INTERVAL=day`로 바꿔도 겹침 오류 없이 이어진다.
+    """
+    covered = [
+        bounds
+        for name in list_partitions(conn, parent)
+        if (bounds := partition_bounds(name, parent))
+    ]
+    created = []
+    start = period_start(now, interval)
+    for _ in range(ahead + 1):
+        name = partition_name(start, interval, parent)
+        end = next_period(start, interval)
+        if not any(lower < end and start < upper for lower, upper in covered):
+            conn.exec_driver_sql(create_partition_sql(start, interval, parent))
+            PARTITION_MAINTENANCE_TOTAL.labels(action="created").inc()
+            created.append(name)
+        start = end
+    return created
+
+
+def expire_partitions(
+    conn: Connection, cutoff: datetime, action: Literal["detach", "drop"], parent: str = PARENT
+) -> list[str]:
+    """상한이 `cutoff` 이하인 파티션을 떼어 낸다(drop이면 삭제까지) — 처리한 이름을 돌려준다.
+
+    `DETACH ... CONCURRENTLY`는 트랜잭션 밖에서만 실행된다 — AUTOCOMMIT 연결로 부를 것.
+    """
+    expired = []
+    for name, detach_pending in sorted(list_partitions(conn, parent).items()):
+        bounds = partition_bounds(name, parent)
+        if bounds is None or bounds[1] > cutoff:
+            continue
+        # 중단된 CONCURRENTLY 분리는 FINALIZE로 마무리한다
+        mode = "FINALIZE" if detach_pending else "CONCURRENTLY"
+        conn.exec_driver_sql(f"ALTER TABLE {parent} DETACH PARTITION {name} {mode}")
+        PARTITION_MAINTENANCE_TOTAL.labels(action="detached").inc()
+        if action == "drop":
+            conn.exec_driver_sql(f"DROP TABLE {name}")
+            PARTITION_MAINTENANCE_TOTAL.labels(action="dropped").inc()
+        expired.append(name)
+    return expired
+
+
+def expire_dedup_keys(conn: Connection, now: datetime) -> list[str]:
+    """중복 판정 창(앞 달·이번 달)보다 오래된 원장 파티션을 지운다 — 지운 이름을 돌려준다."""
+    previous = period_start(period_start(now, "month") - timedelta(days=1), "month")
+    return expire_partitions(conn, previous, "drop", parent=KEYS_PARENT)
+
+
+def list_partitions(conn: Connection, parent: str = PARENT) -> dict[str, bool]:
+    """붙어 있는 파티션 이름 → 분리 대기(중단된 DETACH CONCURRENTLY) 여부."""
+    rows = conn.execute(_LIST_PARTITIONS, {"parent": parent})
+    return {row.relname: row.inhdetachpending for row in rows}
+
+
+@celery.task(name="tasks.maintain_partitions")
+def maintain_partitions() -> None:
+    if database.engine.dialect.name != "postgresql":
+        return
+    now = datetime.now(UTC)
+    interval = settings.partition_interval
+    with database.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        created = ensure_partitions(conn, now, interval, settings.partitions_ahead)
+        # 원장은 PARTITION_INTERVAL과 무관하게 월 단위(트리거의 중복 판정 창과 같은 단위)
+        created += ensure_partitions(conn, now, "month", settings.partitions_ahead, KEYS_PARENT)
+        if created:
+            logger.info("Created partitions: %s", ", ".join(created))
+        expired_keys = expire_dedup_keys(conn, now)
+        if expired_keys:
+            logger.info("Dropped webhook_event_keys partitions: %s", ", ".join(expired_keys))
+        if not settings.partition_retention_days:
+            return
+        cutoff = now - timedelta(days=settings.partition_retention_days)
+        expired = expire_partitions(conn, cutoff, settings.partition_expire_action)
+        if expired:
+            logger.info(
+                "Expired webhook_events partitions (%s): %s",
+                settings.partition_expire_action,
+                ", ".join(expired),
+            )
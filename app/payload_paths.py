@@ -0,0 +1,126 @@
+"""payload JSON 경로 조회와 그 인덱스 — 지원·재처리 도구가 공급자 객체로 이벤트를 찾는다.
+
+PostgreSQL에서 payload는 JSONB(alembic d4b9e6a13c52)라 경로 조회가 문서를 다시 파싱하지
+않는다. 자주 찾는 경로는 `PAYLOAD_PATHS`에 이름을 붙여 두고, `PAYLOAD_PATH_INDEXES`로 고른
+경로마다 부분 식 인덱스 `(customer_id, (payload #>> '{...}')) WHERE source = '...'`를 둔다.
+`PAYLOAD_GIN_INDEX`면 임의 포함 조회(`payload @> ...`)용 GIN(jsonb_path_ops)도 — 적재마다
+문서 전체를 색인해 쓰기 비용이 커서 기본은 끔.
+
+- 마이그레이션은 기본 경로 인덱스만 고정된 DDL로 만든다. 설정을 바꾸면(GIN 포함)
+  `python -m app.payload_paths`로 맞춘다:
+  부모에 `ON ONLY`로 만들고 파티션마다 `CONCURRENTLY`로 만들어 붙인다(적재를 막지 않음)
+- 새 파티션은 부모 인덱스를 자동으로 물려받는다
+- 조회(`WebhookEventRepository.find_by_payload_path`)는 인덱스와 같은 식을 만든다
+
+사용법:
+    python -m app.payload_paths
+"""
+
+import argparse
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Literal
+
+from sqlalchemy import Connection, text
+
+from . import database
+from .config import settings
+from .partitions import PARENT, list_partitions
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PayloadPath:
+    source: str
+    keys: tuple[str, ...]
+
+
+PathName = Literal["stripe_type", "stripe_object_id", "github_repository"]
+
+PAYLOAD_PATHS: dict[PathName, PayloadPath] = {
+    "stripe_type": PayloadPath("stripe", ("type",)),
+    "stripe_object_id": PayloadPath("stripe", ("data", "object", "id")),
+    "github_repository": PayloadPath("github", ("repository", "full_name")),
+}
+GIN_INDEX = f"ix_{PARENT}_payload_gin"
+
+_LIST_INDEXES = text(
+    """
+SELECT c.relname, i.indisvalid
+FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+WHERE i.indrelid = CAST(:parent AS regclass)
+"""
+)
+
+
+def index_name(path: str) -> str:
+    return f"ix_{PARENT}_payload_{path}"
+
+
+def index_definitions(paths: Iterable[str], gin: bool) -> dict[str, str]:
+    """인덱스 이름 → `ON <테이블>` 뒤에 붙는 정의."""
+    definitions = {}
+    for path in paths:
+        if path not in PAYLOAD_PATHS:
+            raise ValueError(f"Unknown payload path {path!r} (known: {', '.join(PAYLOAD_PATHS)})")
+        target = PAYLOAD_PATHS[path]
+        definitions[index_name(path)] = (
+            f"(customer_id, (payload #>> '{{{','.join(target.keys)}}}')) "
+            f"WHERE source = '{target.source}'"
+        )
+    if gin:
+        definitions[GIN_INDEX] = "USING gin (payload jsonb_path_ops)"
+    return definitions
+
+
+def create_index_sql(name: str, definition: str) -> str:
+    return f"CREATE INDEX IF NOT EXISTS {name} ON {PARENT} {definition}"
+
+
+def sync_indexes(conn: Connection, paths: Iterable[str], gin: bool) -> tuple[list[str], list[str]]:
+    """설정에 맞게 만들고 지운다 — (만든 이름, 지운 이름).
+
+    `CREATE INDEX CONCURRENTLY`는 트랜잭션 밖에서만 실행된다 — AUTOCOMMIT 연결로 부를 것.
+    """
+    wanted = index_definitions(paths, gin)
+    managed = index_definitions(PAYLOAD_PATHS, gin=True).keys()
+    existing = {
+        row.relname: row.indisvalid for row in conn.execute(_LIST_INDEXES, {"parent": PARENT})
+    }
+    created = []
+    for name, definition in wanted.items():
+        # 유효하지 않은 부모 인덱스는 중단된 이전 실행 — 빠진 파티션만 마저 붙인다
+        if existing.get(name) is True:
+            continue
+        conn.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY {PARENT} {definition}")
+        for partition, detach_pending in sorted(list_partitions(conn).items()):
+            if detach_pending:
+                continue
+            child = f"ix_{partition}_{name.removeprefix(f'ix_{PARENT}_')}"
+            conn.exec_driver_sql(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {child} ON {partition} {definition}"
+            )
+            conn.exec_driver_sql(f"ALTER INDEX {name} ATTACH PARTITION {child}")
+        logger.info("Created payload index %s", name)
+        created.append(name)
+    dropped = sorted(name for name in managed - wanted.keys() if name in existing)
+    for name in dropped:
+        conn.exec_driver_sql(f"DROP INDEX {name}")
+        logger.info("Dropped payload index %s", name)
+    return created, dropped
+
+
+def main() -> None:
+    argparse.ArgumentParser(description=__doc__.splitlines()[0]).parse_args()
+    logging.basicConfig(level=logging.INFO)
+    with database.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        created, dropped = sync_indexes(
+            conn, settings.payload_path_indexes, settings.payload_gin_index
+        )
+    print(f"created={','.join(created) or '-'} dropped={','.join(dropped) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from celery import Task
+
+from .config import settings
+from .metrics import TASK_PUBLISH_QUEUE_WAIT_SECONDS, TASK_PUBLISH_REJECTED_TOTAL
+
+logger = logging.getLogger(__name__)
+
+
+class PublisherOverloaded(Exception):
+    """핸드오프 큐가 가득 참 — 브로커가 처리량을 따라가지 못하는 상태."""
+
+
+@dataclass
+class _PublishJob:
+    task: Task
+    args: list[Any]
+    options: dict[str, Any]
+    loop: asyncio.AbstractEventLoop
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+def _resolve(future: asyncio.Future, error: BaseException | None) -> None:
+    # 요청이 이미 취소(클라이언트 끊김)됐으면 결과를 버린다
+    if future.done():
+        return
+    if error is None:
+        future.set_result(None)
+    else:
+        future.set_exception(error)
+
+
+class TaskPublisher:
+    """async 엔드포인트용 Celery 발행기 — 전용 스레드가 `apply_async`를 대신 호출한다.
+
+    `apply_async`는 kombu/redis 동기 발행이라 이벤트 루프에서 부르면 브로커 왕복
+    동안 같은 워커의 모든 요청이 멈춘다. 요청은 크기 제한 핸드오프 큐에 작업을 넣고
+    결과 future만 기다리므로 루프는 다른 요청을 계속 처리한다. 큐가 가득 차면 즉시
+    PublisherOverloaded — 무한정 쌓아 두지 않는다(백프레셔). 발행 실패는 future로
+    전파되어 호출부가 멱등키를 해제할 수 있다.
+    """
+
+    def __init__(self, threads: int, max_pending: int):
+        self.threads = threads
+        self._queue: queue.Queue[_PublishJob | None] = queue.Queue(maxsize=max_pending)
+        self._workers: list[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        if self._workers:
+            return
+        with self._lock:
+            if self._workers:
+                return
+            for i in range(self.threads):
+                worker = threading.Thread(target=self._run, name=f"task-publisher-{i}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    async def publish(self, task: Task, args: list[Any], **options: Any) -> None:
+        """`task.apply_async(args=args, **options)`를 발행 스레드에서 실행하고 완료를 기다린다."""
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        try:
+            self._queue.put_nowait(_PublishJob(task, args, options, loop, future))
+        except queue.Full as e:
+            TASK_PUBLISH_REJECTED_TOTAL.inc()
+            raise PublisherOverloaded("Task publisher queue is full") from e
+        await future
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            TASK_PUBLISH_QUEUE_WAIT_SECONDS.observe(time.perf_counter() - job.enqueued_at)
+            error: BaseException | None = None
+            try:
+                job.task.apply_async(args=job.args, **job.options)
+            except Exception as e:
+                error = e
+            try:
+                job.loop.call_soon_threadsafe(_resolve, job.future, error)
+            except RuntimeError:
+                # 루프가 이미 닫힘(종료 중) — 기다리는 요청이 없다
+                logger.warning("Event loop closed before publish result was delivered")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """남은 작업을 발행한 뒤 스레드를 종료한다(lifespan 종료 시)."""
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for _ in workers:
+            self._queue.put(None)
+        for worker in workers:
+            worker.join(timeout)
+
+
+task_publisher = TaskPublisher(
+    threads=settings.task_publisher_threads,
+    max_pending=settings.task_publisher_max_pending,
+)
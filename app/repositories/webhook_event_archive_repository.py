@@ -0,0 +1,61 @@
+from datetime import UTC, date, datetime, time, timedelta
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models.webhook_event_archive import WebhookEventArchive
+
+
+class WebhookEventArchiveRepository:
+    """WebhookEventArchive(보관 세그먼트 목록) 데이터 접근 전용.
+
+    세션은 호출부가 소유(주입)한다. 세그먼트 등록과 원본 행 삭제를 한 트랜잭션으로
+    묶는 것은 호출부(app/archive.py) 몫이다.
+    """
+
+    @classmethod
+    def create(
+        cls,
+        db: Session,
+        *,
+        customer_id: UUID,
+        path: str,
+        event_ids: list[int],
+        received_from: datetime,
+        received_to: datetime,
+    ) -> WebhookEventArchive:
+        segment = WebhookEventArchive(
+            customer_id=customer_id,
+            path=path,
+            first_event_id=min(event_ids),
+            last_event_id=max(event_ids),
+            received_from=received_from,
+            received_to=received_to,
+            row_count=len(event_ids),
+        )
+        db.add(segment)
+        return segment
+
+    @classmethod
+    def find_segments(
+        cls,
+        db: Session,
+        *,
+        customer_id: UUID,
+        event_id: int,
+        received_on: date | None = None,
+    ) -> list[WebhookEventArchive]:
+        """`event_id`를 담을 수 있는 세그먼트 — ID 범위가 겹칠 수 있어 여러 개일 수 있다."""
+        query = select(WebhookEventArchive).where(
+            WebhookEventArchive.customer_id == customer_id,
+            WebhookEventArchive.first_event_id <= event_id,
+            WebhookEventArchive.last_event_id >= event_id,
+        )
+        if received_on is not None:
+            day = datetime.combine(received_on, time.min, tzinfo=UTC)
+            query = query.where(
+                WebhookEventArchive.received_from < day + timedelta(days=1),
+                WebhookEventArchive.received_to >= day,
+            )
+        return list(db.execute(query.order_by(WebhookEventArchive.id)).scalars())
@@ -1,9 +1,114 @@
+import csv
+import io
+from collections.abc import Iterable, Iterator
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+import orjson
+from sqlalchemy import Result, Text, cast, delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from ..database import prepared_statements, register_prepared_statement
 from ..models.webhook_event import WebhookEvent
+from ..payload_paths import PAYLOAD_PATHS, PathName
+
+# 태스크마다 실행되는 단건 적재 — `DB_PREPARED_STATEMENTS`면 연결마다 한 번 PREPARE해
+# 파싱·계획을 건너뛴다(`_insert_ignore_returning_id`와 같은 문장)
+_PREPARED_INSERT = "webhook_events_insert_ignore"
+register_prepared_statement(
+    _PREPARED_INSERT,
+    f"""
+PREPARE {_PREPARED_INSERT} (uuid, varchar, jsonb, varchar, varchar, varchar) AS
+INSERT INTO webhook_events (customer_id, source, payload, event_id, fingerprint, status)
+VALUES ($1, $2, $3, $4, $5, $6)
+ON CONFLICT DO NOTHING
+RETURNING id
+""",
+)
+_EXECUTE_INSERT = f"EXECUTE {_PREPARED_INSERT} (%s, %s, %s, %s, %s, %s)"
+
+# COPY 스테이징 — 세션(연결)마다 한 번 만들고 재사용하는 임시 테이블.
+# 제약이 없어 COPY가 행 단위 검사 없이 흘러 들어가고, 병합 INSERT가 고유제약을 적용한다.
+_STAGING_COLUMNS = (
+    "customer_id",
+    "source",
+    "event_id",
+    "fingerprint",
+    "payload",
+    "status",
+    "received_at",
+)
+_CREATE_STAGING = """
+CREATE TEMP TABLE IF NOT EXISTS webhook_events_staging (
+    customer_id uuid NOT NULL,
+    source varchar,
+    event_id varchar,
+    fingerprint varchar(32),
+    payload jsonb,
+    status varchar NOT NULL,
+    received_at timestamptz
+)
+"""
+_COPY_STAGING = (
+    f"COPY webhook_events_staging ({', '.join(_STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+)
+_MERGE_STAGING = f"""
+INSERT INTO webhook_events ({", ".join(_STAGING_COLUMNS)})
+SELECT {", ".join(_STAGING_COLUMNS[:-1])}, coalesce(received_at, now())
+FROM webhook_events_staging
+ON CONFLICT DO NOTHING
+"""
+
+
+class _CsvRows(io.RawIOBase):
+    """행 dict 이터러블을 COPY csv 스트림으로 — 필요한 만큼만 인코딩한다(전체를 메모리에 두지 않음).
+
+    None은 따옴표 없는 빈 칸(COPY csv의 NULL)으로 나간다.
+    """
+
+    def __init__(self, rows: Iterable[dict[str, Any]]):
+        self._rows: Iterator[dict[str, Any]] = iter(rows)
+        self._text = io.StringIO()
+        self._writer = csv.writer(self._text, lineterminator="\n")
+        self._pending = b""
+        self.count = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while len(self._pending) < len(buffer):
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._writer.writerow(
+                (
+                    row["customer_id"],
+                    row["source"],
+                    row.get("event_id"),
+                    row.get("fingerprint"),
+                    orjson.dumps(row["payload"]).decode(),
+                    row.get("status", "PENDING"),
+                    row.get("received_at"),
+                )
+            )
+            self.count += 1
+            if self._text.tell() >= len(buffer):
+                self._flush_text()
+        self._flush_text()
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def _flush_text(self) -> None:
+        self._pending += self._text.getvalue().encode()
+        self._text.seek(0)
+        self._text.truncate()
 
 
 class WebhookEventRepository:
@@ -20,25 +125,213 @@ class WebhookEventRepository:
         *,
         customer_id: UUID | str,
         source: str,
-        payload: dict,
+        payload: dict | orjson.Fragment,
         event_id: str | None = None,
+        fingerprint: str | None = None,
     ) -> WebhookEvent:
         event = WebhookEvent(
             customer_id=customer_id,
             source=source,
             payload=payload,
             event_id=event_id,
+            fingerprint=fingerprint,
         )
         db.add(event)
         return event
 
+    @classmethod
+    def insert_ignore_duplicate(
+        cls,
+        db: Session,
+        *,
+        customer_id: UUID | str,
+        source: str,
+        payload: dict | orjson.Fragment,
+        event_id: str | None = None,
+        fingerprint: str | None = None,
+        status: str = "PENDING",
+    ) -> int | None:
+        """`INSERT ... ON CONFLICT DO NOTHING RETURNING id` — 새 id, 중복이면 None.
+
+        한 번의 왕복으로 적재와 중복 판정을 끝낸다(`create` + commit + refresh, 중복 시
+        IntegrityError → rollback 대신). 커밋은 호출부가 한다.
+        """
+        conn = db.connection()
+        if _PREPARED_INSERT in prepared_statements(conn):
+            return conn.exec_driver_sql(
+                _EXECUTE_INSERT,
+                (
+                    str(customer_id),
+                    source,
+                    orjson.dumps(payload).decode(),
+                    event_id,
+                    fingerprint,
+                    status,
+                ),
+            ).scalar_one_or_none()
+        stmt = cls._insert_ignore_returning_id(
+            db, customer_id, source, payload, event_id, fingerprint, status
+        )
+        return db.execute(stmt).scalar_one_or_none()
+
+    @classmethod
+    async def insert_ignore_duplicate_async(
+        cls,
+        db: AsyncSession,
+        *,
+        customer_id: UUID | str,
+        source: str,
+        payload: dict | orjson.Fragment,
+        event_id: str | None = None,
+        fingerprint: str | None = None,
+        status: str = "PENDING",
+    ) -> int | None:
+        """`insert_ignore_duplicate`의 AsyncSession 버전(asyncio 워커용)."""
+        stmt = cls._insert_ignore_returning_id(
+            db, customer_id, source, payload, event_id, fingerprint, status
+        )
+        return (await db.execute(stmt)).scalar_one_or_none()
+
+    @classmethod
+    def _insert_ignore_returning_id(
+        cls,
+        db: Session | AsyncSession,
+        customer_id: UUID | str,
+        source: str,
+        payload: dict | orjson.Fragment,
+        event_id: str | None,
+        fingerprint: str | None,
+        status: str,
+    ) -> Any:
+        return (
+            cls._insert(db)
+            .values(
+                customer_id=customer_id,
+                source=source,
+                payload=payload,
+                event_id=event_id,
+                fingerprint=fingerprint,
+                status=status,
+            )
+            .on_conflict_do_nothing()
+            .returning(WebhookEvent.id)
+        )
+
+    @classmethod
+    def bulk_insert_ignore_duplicates(cls, db: Session, rows: list[dict[str, Any]]) -> int:
+        """여러 행을 multi-row `INSERT ... ON CONFLICT DO NOTHING` 한 문장으로 적재한다.
+
+        고유제약(event_id·fingerprint)에 걸리는 행은 조용히 건너뛰고, 실제 삽입된 행 수를
+        돌려준다. 트랜잭션 경계는 `create`와 마찬가지로 호출부가 제어한다.
+        """
+        if not rows:
+            return 0
+        result = db.execute(cls._insert(db).values(rows).on_conflict_do_nothing())
+        return result.rowcount
+
+    @classmethod
+    def copy_insert_ignore_duplicates(cls, db: Session, rows: Iterable[dict[str, Any]]) -> int:
+        """PostgreSQL `COPY`로 임시 스테이징 테이블에 흘려 넣고 `ON CONFLICT DO NOTHING`으로 병합.
+
+        대량 적재(백필·장애 후 따라잡기)용 — 행마다 INSERT를 파싱·실행하는 대신 COPY 스트림
+        하나로 보낸다. 중복은 `bulk_insert_ignore_duplicates`와 같이 건너뛰고 삽입된 행 수를
+        돌려준다. psycopg2 전용, 커밋은 호출부가 한다.
+        """
+        conn = db.connection()
+        conn.exec_driver_sql(_CREATE_STAGING)
+        conn.exec_driver_sql("TRUNCATE webhook_events_staging")
+        dbapi_error = conn.dialect.dbapi.Error  # type: ignore[union-attr]
+        cursor = conn.connection.dbapi_connection.cursor()  # type: ignore[union-attr]
+        try:
+            cursor.copy_expert(_COPY_STAGING, _CsvRows(rows))
+        except dbapi_error as e:
+            # 드라이버 오류를 SQLAlchemy 예외(IntegrityError·DataError·OperationalError…)로
+            raise DBAPIError.instance(_COPY_STAGING, None, e, dbapi_error) from e
+        finally:
+            cursor.close()
+        return conn.exec_driver_sql(_MERGE_STAGING).rowcount
+
+    @staticmethod
+    def _insert(db: Session | AsyncSession) -> Any:
+        # ON CONFLICT는 방언별 insert 구문에만 있다 — 운영 PostgreSQL, 테스트 SQLite
+        if db.get_bind().dialect.name == "sqlite":
+            return sqlite.insert(WebhookEvent)
+        return postgresql.insert(WebhookEvent)
+
     @classmethod
     def get_for_customer(
-        cls, db: Session, *, event_id: int, customer_id: UUID
+        cls,
+        db: Session,
+        *,
+        event_id: int,
+        customer_id: UUID,
+        received_on: date | None = None,
     ) -> WebhookEvent | None:
-        return db.execute(
-            select(WebhookEvent).where(
-                WebhookEvent.id == event_id,
-                WebhookEvent.customer_id == customer_id,
+        """`received_on`(UTC 날짜)을 주면 그 날 범위만 조회 — 해당 파티션 하나만 읽는다."""
+        query = select(WebhookEvent).where(
+            WebhookEvent.id == event_id,
+            WebhookEvent.customer_id == customer_id,
+        )
+        if received_on is not None:
+            day = datetime.combine(received_on, time.min, tzinfo=UTC)
+            query = query.where(
+                WebhookEvent.received_at >= day,
+                WebhookEvent.received_at < day + timedelta(days=1),
             )
-        ).scalar_one_or_none()
+        return db.execute(query).scalar_one_or_none()
+
+    @classmethod
+    def find_by_payload_path(
+        cls,
+        db: Session,
+        *,
+        customer_id: UUID,
+        path: PathName,
+        value: str,
+        received_after: datetime | None = None,
+        limit: int = 100,
+    ) -> list[WebhookEvent]:
+        """`PAYLOAD_PATHS[path]` 값이 `value`인 이벤트(최근 순) — 경로 식 인덱스를 탄다.
+
+        `received_after`를 주면 그 뒤 파티션만 읽는다.
+        """
+        target = PAYLOAD_PATHS[path]
+        query = select(WebhookEvent).where(
+            WebhookEvent.customer_id == customer_id,
+            WebhookEvent.source == target.source,
+            WebhookEvent.payload[target.keys].as_string() == value,
+        )
+        if received_after is not None:
+            query = query.where(WebhookEvent.received_at >= received_after)
+        query = query.order_by(WebhookEvent.received_at.desc()).limit(limit)
+        return list(db.execute(query).scalars())
+
+    @classmethod
+    def stream_received_before(cls, db: Session, before: datetime, *, yield_per: int) -> Result:
+        """`before` 이전 행을 고객·수신 시각 순으로 — 서버 측 커서로 `yield_per`행씩 가져온다.
+
+        payload는 텍스트 그대로(디코드하지 않음) 돌려준다.
+        """
+        query = (
+            select(
+                WebhookEvent.id,
+                WebhookEvent.customer_id,
+                WebhookEvent.source,
+                WebhookEvent.event_id,
+                WebhookEvent.fingerprint,
+                WebhookEvent.status,
+                WebhookEvent.received_at,
+                cast(WebhookEvent.payload, Text).label("payload"),
+            )
+            .where(WebhookEvent.received_at < before)
+            .order_by(WebhookEvent.customer_id, WebhookEvent.received_at, WebhookEvent.id)
+            .execution_options(yield_per=yield_per)
+        )
+        return db.execute(query)
+
+    @classmethod
+    def delete_received_before(cls, db: Session, ids: list[int], before: datetime) -> int:
+        # received_at 조건은 파티션 프루닝용 — 보관 대상이 아닌 파티션은 건드리지 않는다
+        return db.execute(
+            delete(WebhookEvent).where(WebhookEvent.id.in_(ids), WebhookEvent.received_at < before)
+        ).rowcount
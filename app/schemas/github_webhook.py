@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, NotRequired
 
-from pydantic import BaseModel
+from pydantic import BaseModel, InstanceOf, TypeAdapter
+from typing_extensions import TypedDict
 
 
 class GitHubWebhookPayload(BaseModel):
@@ -15,3 +16,17 @@ class GitHubWebhookPayload(BaseModel):
     sender: dict[str, Any]
     repository: dict[str, Any]
     # Add other common fields as needed
+
+
+class GitHubWebhookFields(TypedDict):
+    """워커가 읽는 필드만 — `GitHubWebhookPayload`와 같은 규칙이지만 원본 dict를 복사하지 않는다.
+
+    `InstanceOf[dict]`는 형식만 확인하고 같은 객체를 돌려준다(하위 dict 재구성 없음).
+    """
+
+    action: NotRequired[str | None]
+    sender: InstanceOf[dict]
+    repository: InstanceOf[dict]
+
+
+GITHUB_FIELDS = TypeAdapter(GitHubWebhookFields)
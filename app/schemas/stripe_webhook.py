@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, NotRequired
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, InstanceOf, TypeAdapter
+from typing_extensions import TypedDict
 
 
 class StripeWebhookPayload(BaseModel):
@@ -11,3 +12,14 @@ class StripeWebhookPayload(BaseModel):
     id: str
     type: str
     data: dict[str, Any] = {}
+
+
+class StripeWebhookFields(TypedDict):
+    """워커가 읽는 필드만 — `StripeWebhookPayload`와 같은 규칙, 원본 dict는 그대로."""
+
+    id: str
+    type: str
+    data: NotRequired[InstanceOf[dict]]
+
+
+STRIPE_FIELDS = TypeAdapter(StripeWebhookFields)
@@ -1,49 +1,125 @@
+import asyncio
 import logging
+from typing import Any
 
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy.exc import DataError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from .. import claim_check, json_fields
 from ..celery_worker import celery
-from ..database import SessionLocal
+from ..config import settings
+from ..database import AsyncSessionLocal, SessionLocal
 from ..metrics import CUSTOMER_WEBHOOK_ERRORS_TOTAL
-from ..models.webhook_event import WebhookEvent
 from ..repositories.webhook_event_repository import WebhookEventRepository
-from ..schemas.github_webhook import GitHubWebhookPayload
-from ..schemas.stripe_webhook import StripeWebhookPayload
+from ..schemas.github_webhook import GITHUB_FIELDS
+from ..schemas.stripe_webhook import STRIPE_FIELDS
 
 logger = logging.getLogger(__name__)
 
+# 소스별 필드 검증기 — 태스크와 대체 워커(배치·asyncio·스트림)가 같은 검증을 쓴다
+PAYLOAD_FIELDS: dict[str, TypeAdapter[Any]] = {
+    "github": GITHUB_FIELDS,
+    "stripe": STRIPE_FIELDS,
+}
+# 지연 추출 경로가 본문에서 읽는 최상위 키 — Stripe `data`(이벤트 본체)는 읽지 않는다
+LAZY_FIELDS: dict[str, tuple[str, ...]] = {
+    "github": ("action", "sender", "repository"),
+    "stripe": ("id", "type"),
+}
 
-def _mark_event_failed(db: Session, db_event: WebhookEvent | None) -> None:
+
+class MalformedPayloadError(ValueError):
+    """지연 추출 경로로 넘긴 본문을 DB가 JSON으로 받지 않았다 — 재시도해도 같다(DLQ)."""
+
+
+def _malformed_event(exc: SQLAlchemyError, event: dict[str, Any] | None) -> dict[str, Any] | None:
+    """지연 경로(원본 바이트 그대로 적재)의 깨진 JSON이면 FAILED로 남길 행, 아니면 None.
+
+    수신을 거치지 않은 큰 본문은 건너뛴 부분의 문법을 DB가 적재 때야 확인하므로
+    `DataError`로 드러난다.
+    일시적 DB 오류와 달리 재시도 대상이 아니다 — 행은 payload 없이 FAILED로 남긴다.
+    """
+    if not isinstance(exc, DataError) or event is None:
+        return None
+    if not isinstance(event["payload"], orjson.Fragment):
+        return None
+    return {**event, "payload": None}
+
+
+def _mark_event_failed(db: Session, event: dict[str, Any] | None) -> None:
     """비일시적 오류로 실패한 이벤트를 FAILED로 기록(best-effort).
 
-    아직 커밋되지 않은 PENDING 행을 새 트랜잭션에서 FAILED로 영속화한다.
+    커밋되지 못한 행을 새 트랜잭션에서 FAILED로 다시 적재한다 — 호출부는 PROCESSED 행이
+    이미 커밋됐으면(그 뒤 claim-check 해제 등에서 실패) 부르지 않는다.
     DB 자체가 불가용이면 조용히 포기하고 관측 로그만 남긴다(상태 기록은 부가 정보).
     """
-    if db_event is None:
+    if event is None:
         return
     try:
         db.rollback()
-        # 레거시 Column 타입을 str로 좁힘 — 런타임 값은 str
-        db_event.status = "FAILED"  # type: ignore[assignment]
-        db.add(db_event)
+        WebhookEventRepository.insert_ignore_duplicate(db, **event, status="FAILED")
         db.commit()
     except SQLAlchemyError:
         db.rollback()
         logger.warning("Could not persist FAILED status for webhook event", exc_info=True)
 
 
+def load_payload(payload: bytes | str | dict[str, Any]) -> dict[str, Any]:
+    """수신 경로가 넘긴 원본 JSON 바이트를 디코드한다(재처리 경로는 이미 dict).
+
+    claim-check 참조면 블롭 저장소에서 본문을 읽어 온다.
+    """
+    if isinstance(payload, dict):
+        return payload
+    if claim_check.is_reference(payload):
+        payload = claim_check.check_out(payload)
+    return orjson.loads(payload)
+
+
+def validate_payload(source: str, payload: dict[str, Any]) -> dict[str, Any]:
+    """처리에 필요한 필드만 검증해 돌려준다 — 적재는 원본 `payload`를 그대로 쓴다.
+
+    모델을 만들고 `model_dump()`로 사본을 한 번 더 만드는 대신 캐시된 TypeAdapter로
+    최상위 필드만 확인한다. 큰 페이로드에서 워커 CPU를 차지하던 두 번의 전체 복사가 없다.
+    """
+    return PAYLOAD_FIELDS[source].validate_python(payload)
+
+
+def read_payload(
+    source: str, raw_payload: bytes | str | dict[str, Any]
+) -> tuple[dict[str, Any] | orjson.Fragment, dict[str, Any]]:
+    """(적재할 페이로드, 검증한 필드)를 돌려준다.
+
+    `LAZY_JSON_THRESHOLD_BYTES` 이상 본문은 dict로 만들지 않는다 — 필요한 최상위 키만
+    지연 추출(app/json_fields.py)해 검증하고, 적재는 원본 바이트를 `orjson.Fragment`로
+    그대로 넘긴다. 문법은 수신이 전체 파싱으로 이미 확인했다 — 수신을 거치지 않은 본문
+    (재처리 등)의 건너뛴 부분이 깨졌으면 DB가 `DataError`로 거부하고 재시도 없이 DLQ.
+    """
+    if claim_check.is_reference(raw_payload):
+        raw_payload = claim_check.check_out(raw_payload)
+    threshold = settings.lazy_json_threshold_bytes
+    if threshold and not isinstance(raw_payload, dict) and len(raw_payload) >= threshold:
+        body = raw_payload.encode() if isinstance(raw_payload, str) else raw_payload
+        fields = validate_payload(source, json_fields.extract(body, LAZY_FIELDS[source]))
+        return orjson.Fragment(body), fields
+    payload = load_payload(raw_payload)
+    return payload, validate_payload(source, payload)
+
+
 @celery.task(name="tasks.send_to_dlq")
 def send_to_dlq(failed_task_data: dict):
     logger.error("Task sent to DLQ: %s", failed_task_data)
 
 
-def _handle_task_failure(task, exc, task_id, args, kwargs, einfo):
-    customer_id = args[0] if args else "Unknown"
+def dead_letter(task_name: str, task_id: str, customer_id: Any, exc: BaseException) -> None:
+    """처리를 포기한 태스크를 dead_letters 큐로 보낸다(태스크 on_failure·배치 워커 공용)."""
     send_to_dlq.apply_async(
         args=[
             {
-                "task_name": task.name,
+                "task_name": task_name,
                 "task_id": task_id,
                 "customer_id": str(customer_id),
                 "error": str(exc),
@@ -53,6 +129,10 @@ def _handle_task_failure(task, exc, task_id, args, kwargs, einfo):
     )
 
 
+def _handle_task_failure(task, exc, task_id, args, kwargs, einfo):
+    dead_letter(task.name, task_id, args[0] if args else "Unknown", exc)
+
+
 @celery.task(
     bind=True,
     max_retries=3,
@@ -62,14 +142,19 @@ def _handle_task_failure(task, exc, task_id, args, kwargs, einfo):
     acks_late=True,
 )
 def process_github_webhook_task(
-    self, customer_id: str, payload_dict: dict, event_id: str | None = None
+    self,
+    customer_id: str,
+    raw_payload: bytes | str | dict[str, Any],
+    event_id: str | None = None,
+    fingerprint: str | None = None,
 ) -> None:
     db: Session = SessionLocal()
-    db_event: WebhookEvent | None = None
+    event: dict[str, Any] | None = None
+    committed = False  # PROCESSED 행(또는 중복 판정)이 커밋됐는지
     try:
-        payload = GitHubWebhookPayload.model_validate(payload_dict)
-        sender = payload.sender.get("login")
-        repo = payload.repository.get("full_name")
+        payload, fields = read_payload("github", raw_payload)
+        sender = fields["sender"].get("login")
+        repo = fields["repository"].get("full_name")
         logger.info(
             "Processing GitHub event from %s for repo %s for customer %s",
             sender,
@@ -77,32 +162,31 @@ def process_github_webhook_task(
             customer_id,
         )
 
-        db_event = WebhookEventRepository.create(
-            db,
-            customer_id=customer_id,
-            source="github",
-            payload=payload.model_dump(),
-            event_id=event_id,
-        )
-        # 레거시 Column 타입을 str로 좁힘 — 런타임 값은 str
-        db_event.status = "PROCESSED"  # type: ignore[assignment]
+        event = {
+            "customer_id": customer_id,
+            "source": "github",
+            "payload": payload,
+            "event_id": event_id,
+            "fingerprint": fingerprint,
+        }
+        # INSERT ... ON CONFLICT DO NOTHING RETURNING id — 적재와 중복 판정을 왕복 한 번에
+        event_pk = WebhookEventRepository.insert_ignore_duplicate(db, **event, status="PROCESSED")
         db.commit()
-        db.refresh(db_event)
-        logger.info(
-            "Saved webhook event %s for customer %s to database.",
-            db_event.id,
-            customer_id,
-        )
+        committed = True
+        claim_check.release(raw_payload)
+        if event_pk is None:
+            # 멱등 고유제약 충돌 — 동일 (customer, source, event_id|fingerprint) 이미 적재됨.
+            # 재시도/DLQ 대상이 아니라 정상 중복.
+            logger.info(
+                "Duplicate github event ignored (unique constraint): customer=%s event_id=%s",
+                customer_id,
+                event_id,
+            )
+        else:
+            logger.info(
+                "Saved webhook event %s for customer %s to database.", event_pk, customer_id
+            )
 
-    except IntegrityError:
-        # 멱등 고유제약 위반 — 동일 (customer, source, event_id) 이미 적재됨.
-        # 재시도/DLQ 대상이 아니라 정상 중복으로 간주하고 조용히 종료.
-        db.rollback()
-        logger.info(
-            "Duplicate github event ignored (unique constraint): customer=%s event_id=%s",
-            customer_id,
-            event_id,
-        )
     except SQLAlchemyError as e:
         # 일시적 DB 오류 — autoretry가 재처리한다. 상태 전이는 재시도 결과에 맡긴다
         # (여기서 FAILED로 적으면 재시도 성공 시 잘못된 상태로 남는다).
@@ -112,10 +196,17 @@ def process_github_webhook_task(
             source="github",
             error_type=type(e).__name__,
         ).inc()
-        raise
+        failed = _malformed_event(e, event)
+        if failed is None:
+            raise
+        # 깨진 JSON — autoretry하지 않고 바로 DLQ(on_failure)
+        _mark_event_failed(db, failed)
+        raise MalformedPayloadError("Webhook payload is not valid JSON") from e
     except Exception as e:
         # 비일시적 오류 — 재시도 대상이 아니므로 이벤트를 FAILED로 기록 후 전파(DLQ).
-        _mark_event_failed(db, db_event)
+        # 적재가 이미 커밋됐으면 그 행이 결과다 — FAILED 행을 덧붙이지 않는다.
+        if not committed:
+            _mark_event_failed(db, event)
         CUSTOMER_WEBHOOK_ERRORS_TOTAL.labels(
             customer_id=str(customer_id),
             source="github",
@@ -135,43 +226,48 @@ def process_github_webhook_task(
     acks_late=True,
 )
 def process_stripe_webhook_task(
-    self, customer_id: str, payload_dict: dict, event_id: str | None = None
+    self,
+    customer_id: str,
+    raw_payload: bytes | str | dict[str, Any],
+    event_id: str | None = None,
+    fingerprint: str | None = None,
 ) -> None:
     db: Session = SessionLocal()
-    db_event: WebhookEvent | None = None
+    event: dict[str, Any] | None = None
+    committed = False  # PROCESSED 행(또는 중복 판정)이 커밋됐는지
     try:
-        payload = StripeWebhookPayload.model_validate(payload_dict)
+        payload, fields = read_payload("stripe", raw_payload)
         logger.info(
             "Processing Stripe event type: %s for customer %s",
-            payload.type,
+            fields["type"],
             customer_id,
         )
 
-        db_event = WebhookEventRepository.create(
-            db,
-            customer_id=customer_id,
-            source="stripe",
-            payload=payload.model_dump(),
-            event_id=event_id,
-        )
-        # 레거시 Column 타입을 str로 좁힘 — 런타임 값은 str
-        db_event.status = "PROCESSED"  # type: ignore[assignment]
+        event = {
+            "customer_id": customer_id,
+            "source": "stripe",
+            "payload": payload,
+            "event_id": event_id,
+            "fingerprint": fingerprint,
+        }
+        # INSERT ... ON CONFLICT DO NOTHING RETURNING id — 적재와 중복 판정을 왕복 한 번에
+        event_pk = WebhookEventRepository.insert_ignore_duplicate(db, **event, status="PROCESSED")
         db.commit()
-        db.refresh(db_event)
-        logger.info(
-            "Saved webhook event %s for customer %s to database.",
-            db_event.id,
-            customer_id,
-        )
+        committed = True
+        claim_check.release(raw_payload)
+        if event_pk is None:
+            # 멱등 고유제약 충돌 — 동일 (customer, source, event_id|fingerprint) 이미 적재됨.
+            # 재시도/DLQ 대상이 아니라 정상 중복.
+            logger.info(
+                "Duplicate stripe event ignored (unique constraint): customer=%s event_id=%s",
+                customer_id,
+                event_id,
+            )
+        else:
+            logger.info(
+                "Saved webhook event %s for customer %s to database.", event_pk, customer_id
+            )
 
-    except IntegrityError:
-        # 멱등 고유제약 위반 — 동일 (customer, source, event_id) 이미 적재됨.
-        db.rollback()
-        logger.info(
-            "Duplicate stripe event ignored (unique constraint): customer=%s event_id=%s",
-            customer_id,
-            event_id,
-        )
     except SQLAlchemyError as e:
         # 일시적 DB 오류 — autoretry가 재처리한다. 상태 전이는 재시도 결과에 맡긴다.
         db.rollback()
@@ -180,10 +276,17 @@ def process_stripe_webhook_task(
             source="stripe",
             error_type=type(e).__name__,
         ).inc()
-        raise
+        failed = _malformed_event(e, event)
+        if failed is None:
+            raise
+        # 깨진 JSON — autoretry하지 않고 바로 DLQ(on_failure)
+        _mark_event_failed(db, failed)
+        raise MalformedPayloadError("Webhook payload is not valid JSON") from e
     except Exception as e:
         # 비일시적 오류 — 재시도 대상이 아니므로 이벤트를 FAILED로 기록 후 전파(DLQ).
-        _mark_event_failed(db, db_event)
+        # 적재가 이미 커밋됐으면 그 행이 결과다 — FAILED 행을 덧붙이지 않는다.
+        if not committed:
+            _mark_event_failed(db, event)
         CUSTOMER_WEBHOOK_ERRORS_TOTAL.labels(
             customer_id=str(customer_id),
             source="stripe",
@@ -192,3 +295,82 @@ def process_stripe_webhook_task(
         raise
     finally:
         db.close()
+
+
+async def _mark_event_failed_async(db: AsyncSession, event: dict[str, Any] | None) -> None:
+    """`_mark_event_failed`의 AsyncSession 버전."""
+    if event is None:
+        return
+    try:
+        await db.rollback()
+        await WebhookEventRepository.insert_ignore_duplicate_async(db, **event, status="FAILED")
+        await db.commit()
+    except SQLAlchemyError:
+        await db.rollback()
+        logger.warning("Could not persist FAILED status for webhook event", exc_info=True)
+
+
+async def process_webhook_async(
+    source: str,
+    customer_id: str,
+    raw_payload: bytes | str | dict[str, Any],
+    event_id: str | None = None,
+    fingerprint: str | None = None,
+) -> None:
+    """`process_*_webhook_task` 본문의 async 버전 — asyncio 워커(app/async_worker.py)용.
+
+    예외 분류는 태스크와 같다: SQLAlchemyError는 재시도 대상으로 그대로 전파하고(지연 경로의
+    깨진 JSON은 `MalformedPayloadError`로 바꿔 바로 DLQ), 그 밖의 오류는 이벤트를 FAILED로
+    기록한 뒤 전파한다(DLQ). 재시도·DLQ 자체는 워커가 한다.
+    """
+    event: dict[str, Any] | None = None
+    committed = False
+    async with AsyncSessionLocal() as db:
+        try:
+            body = raw_payload
+            if claim_check.is_reference(raw_payload):
+                # 블롭 저장소 읽기는 동기 I/O — 이벤트 루프 밖에서
+                body = await asyncio.to_thread(claim_check.check_out, raw_payload)
+            payload, _ = read_payload(source, body)
+            event = {
+                "customer_id": customer_id,
+                "source": source,
+                "payload": payload,
+                "event_id": event_id,
+                "fingerprint": fingerprint,
+            }
+            event_pk = await WebhookEventRepository.insert_ignore_duplicate_async(
+                db, **event, status="PROCESSED"
+            )
+            await db.commit()
+            committed = True
+            if claim_check.is_reference(raw_payload):
+                await asyncio.to_thread(claim_check.release, raw_payload)
+            if event_pk is None:
+                logger.info(
+                    "Duplicate %s event ignored (unique constraint): customer=%s event_id=%s",
+                    source,
+                    customer_id,
+                    event_id,
+                )
+            else:
+                logger.info(
+                    "Saved webhook event %s for customer %s to database.", event_pk, customer_id
+                )
+        except SQLAlchemyError as e:
+            await db.rollback()
+            CUSTOMER_WEBHOOK_ERRORS_TOTAL.labels(
+                customer_id=str(customer_id), source=source, error_type=type(e).__name__
+            ).inc()
+            failed = _malformed_event(e, event)
+            if failed is None:
+                raise
+            await _mark_event_failed_async(db, failed)
+            raise MalformedPayloadError("Webhook payload is not valid JSON") from e
+        except Exception as e:
+            if not committed:
+                await _mark_event_failed_async(db, event)
+            CUSTOMER_WEBHOOK_ERRORS_TOTAL.labels(
+                customer_id=str(customer_id), source=source, error_type=type(e).__name__
+            ).inc()
+            raise
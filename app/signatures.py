@@ -0,0 +1,143 @@
+"""프로바이더 서명 검증 — 순수 함수(프레임워크·설정 비의존).
+
+HTTP 매핑(헤더 없음→400, 불일치→401)은 호출부(WebhookVerifier)가 한다.
+"""
+
+import hashlib
+import hmac
+import time
+
+# stripe SDK(stripe.Webhook.DEFAULT_TOLERANCE)와 동일한 기본 허용오차
+STRIPE_DEFAULT_TOLERANCE = 300
+
+
+class SignatureVerificationError(Exception):
+    """서명 헤더가 형식 오류이거나 본문과 일치하지 않음."""
+
+
+def _new_fingerprint() -> "hashlib.blake2b":
+    # 본문 지문 — 보안 용도가 아닌 중복 판별용(blake2b 128비트, hex 32자)
+    return hashlib.blake2b(digest_size=16)
+
+
+class _IncrementalSignature:
+    """청크를 HMAC(과 선택적으로 본문 지문)에 같은 패스로 넣는 공통부."""
+
+    _mac: "hmac.HMAC"
+    _fingerprint: "hashlib.blake2b | None" = None
+
+    def update(self, chunk: bytes) -> None:
+        self._mac.update(chunk)
+        if self._fingerprint is not None:
+            self._fingerprint.update(chunk)
+
+    def fingerprint(self) -> str | None:
+        """생성 시 `fingerprint=True`였으면 본문 지문(hex), 아니면 None."""
+        return self._fingerprint.hexdigest() if self._fingerprint is not None else None
+
+
+class GitHubSignature(_IncrementalSignature):
+    """X-Hub-Signature-256(`sha256=<hex>`) 증분 검증 — 청크를 받는 대로 `update`."""
+
+    def __init__(self, header: str, secret: str, *, fingerprint: bool = False):
+        # 바이트로 비교 — compare_digest는 비ASCII str을 TypeError로 거부한다(Starlette 헤더는
+        # latin-1 디코드라 무엇이든 올 수 있다). 비ASCII 헤더는 hex 서명과 일치할 수 없다
+        self._header = header.encode("utf-8")
+        self._mac = hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+        if fingerprint:
+            self._fingerprint = _new_fingerprint()
+
+    def verify(self) -> None:
+        if not hmac.compare_digest(f"sha256={self._mac.hexdigest()}".encode(), self._header):
+            raise SignatureVerificationError("Signature does not match the payload")
+
+
+class StripeSignature(_IncrementalSignature):
+    """Stripe-Signature 증분 검증 — `HMAC-SHA256(secret, f"{t}." + body)`만 계산한다.
+
+    헤더 파싱·타임스탬프 허용오차 검사는 생성 시점(본문을 읽기 전)에 끝난다.
+    허용오차(초)를 벗어난 타임스탬프는 리플레이로 간주해 거부한다(0이면 미검사).
+    """
+
+    def __init__(
+        self,
+        header: str,
+        secret: str,
+        *,
+        tolerance: int = STRIPE_DEFAULT_TOLERANCE,
+        now: float | None = None,
+        fingerprint: bool = False,
+    ):
+        timestamp, signatures = parse_stripe_signature_header(header)
+        # GitHubSignature와 같이 바이트로 비교(비ASCII 헤더에서 TypeError 없이 불일치)
+        self._signatures = [signature.encode("utf-8") for signature in signatures]
+        if tolerance:
+            current = time.time() if now is None else now
+            if abs(current - timestamp) > tolerance:
+                raise SignatureVerificationError("Timestamp outside the tolerance zone")
+        self._mac = hmac.new(secret.encode("utf-8"), f"{timestamp}.".encode(), hashlib.sha256)
+        if fingerprint:
+            self._fingerprint = _new_fingerprint()
+
+    def verify(self) -> None:
+        expected = self._mac.hexdigest().encode()
+        # 모든 후보와 비교(단락 평가 없이) — 어느 v1이 맞았는지 타이밍으로 새지 않게
+        matched = False
+        for signature in self._signatures:
+            matched |= hmac.compare_digest(expected, signature)
+        if not matched:
+            raise SignatureVerificationError("No signatures found matching the expected signature")
+
+
+def parse_stripe_signature_header(header: str) -> tuple[int, list[str]]:
+    """`t=<unix>,v1=<hex>[,v1=<hex>...][,v0=...]` → (timestamp, v1 서명 목록).
+
+    시크릿 롤링 중에는 v1이 여러 개 온다. v1 이외 스킴(v0 등)은 무시한다.
+    """
+    timestamp: int | None = None
+    signatures: list[str] = []
+    for item in header.split(","):
+        key, sep, value = item.strip().partition("=")
+        if not sep:
+            continue
+        if key == "t":
+            try:
+                timestamp = int(value)
+            except ValueError as e:
+                raise SignatureVerificationError("Invalid timestamp in signature header") from e
+        elif key == "v1":
+            signatures.append(value)
+    if timestamp is None or not signatures:
+        raise SignatureVerificationError("Unable to extract timestamp and signatures from header")
+    return timestamp, signatures
+
+
+def verify_github_signature(
+    body: bytes, header: str, secret: str, *, fingerprint: bool = False
+) -> str | None:
+    """버퍼링된 본문 전체에 대한 GitHub 서명 검증 — `fingerprint=True`면 본문 지문을 돌려준다."""
+    signature = GitHubSignature(header, secret, fingerprint=fingerprint)
+    signature.update(body)
+    signature.verify()
+    return signature.fingerprint()
+
+
+def verify_stripe_signature(
+    body: bytes,
+    header: str,
+    secret: str,
+    *,
+    tolerance: int = STRIPE_DEFAULT_TOLERANCE,
+    now: float | None = None,
+    fingerprint: bool = False,
+) -> str | None:
+    """버퍼링된 본문 전체에 대한 Stripe 서명 검증 — `fingerprint=True`면 본문 지문을 돌려준다.
+
+    `stripe.Webhook.construct_event`와 달리 본문을 StripeObject로 파싱하지 않는다.
+    """
+    signature = StripeSignature(
+        header, secret, tolerance=tolerance, now=now, fingerprint=fingerprint
+    )
+    signature.update(body)
+    signature.verify()
+    return signature.fingerprint()
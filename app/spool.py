@@ -0,0 +1,389 @@
+"""로컬 내구성 스풀(fast-ack) — 브로커보다 먼저 디스크에 기록하고 202를 돌려준다.
+
+브로커(Redis) 지연이 튀면 수신 p99도 같이 튀고, 공급자 타임아웃 → 재시도로 부하가
+더 늘어난다. fast-ack 모드에서는 검증된 이벤트를 로컬 append-only 세그먼트 파일에
+쓰고 fsync가 끝나는 즉시 응답한다. 큐잉은 백그라운드 드레이너가 맡는다.
+
+- 프레임: `>III`(meta 길이, body 길이, crc32) + meta(JSON) + body(원본 바이트)
+- 그룹 커밋: fsync 하나가 진행되는 동안 도착한 append는 다음 fsync 한 번에 묶인다
+- 세그먼트: `segment_max_bytes`를 넘으면 회전, 재시작 시 항상 새 세그먼트에서 쓴다
+- 드레이너: 체크포인트(세그먼트, 오프셋)부터 읽어 멱등 예약 → 발행(Celery 또는 스트림), 배치가
+  모두 발행된 뒤에만 체크포인트를 옮기고 다 읽은 세그먼트를 지운다(at-least-once)
+- 슬롯: 워커 프로세스마다 `<spool_dir>/<n>`을 flock으로 독점 — 재시작한 프로세스가
+  주인 없는 슬롯의 잔여 세그먼트를 이어받는다
+"""
+
+import asyncio
+import contextlib
+import fcntl
+import logging
+import os
+import struct
+import time
+import zlib
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+import orjson
+
+from . import claim_check
+from .idempotency import IdempotencyKey, IdempotencyStore, RecentEnqueues
+from .metrics import (
+    SPOOL_DRAIN_ERRORS_TOTAL,
+    SPOOL_DRAINED_TOTAL,
+    SPOOL_FSYNC_BATCH_SIZE,
+    SPOOL_FSYNC_SECONDS,
+    SPOOL_PENDING_BYTES,
+)
+from .publisher import TaskPublisher, task_publisher
+from .streams import StreamPublisher
+from .webhook_registry import get_queue, get_task
+
+logger = logging.getLogger(__name__)
+
+_FRAME_HEADER = struct.Struct(">III")
+_SEGMENT_PREFIX = "segment-"
+_SEGMENT_SUFFIX = ".log"
+_CHECKPOINT_FILE = "checkpoint.json"
+_LOCK_FILE = "lock"
+_MAX_SLOTS = 64
+
+
+@dataclass(frozen=True)
+class SpoolRecord:
+    tenant_id: str
+    source: str
+    event_id: str | None
+    customer_id: str
+    body: bytes
+    fingerprint: str | None = None
+
+
+def encode_record(record: SpoolRecord) -> bytes:
+    meta = orjson.dumps(
+        {
+            "tenant_id": record.tenant_id,
+            "source": record.source,
+            "event_id": record.event_id,
+            "customer_id": record.customer_id,
+            "fingerprint": record.fingerprint,
+        }
+    )
+    crc = zlib.crc32(record.body, zlib.crc32(meta))
+    return _FRAME_HEADER.pack(len(meta), len(record.body), crc) + meta + record.body
+
+
+def read_records(
+    path: Path, offset: int, limit: int | None = None, max_count: int | None = None
+) -> Iterator[tuple[SpoolRecord, int]]:
+    """`offset`부터 (레코드, 다음 오프셋)을 순서대로 낸다.
+
+    잘린 꼬리(쓰는 도중 크래시)나 crc 불일치를 만나면 거기서 멈춘다 — 그 뒤는 읽지 않는다.
+    `limit`은 읽어도 되는 끝(활성 세그먼트의 fsync 완료 지점).
+    """
+    count = 0
+    with path.open("rb") as f:
+        f.seek(offset)
+        while max_count is None or count < max_count:
+            if limit is not None and offset + _FRAME_HEADER.size > limit:
+                return
+            header = f.read(_FRAME_HEADER.size)
+            if len(header) < _FRAME_HEADER.size:
+                return
+            meta_len, body_len, crc = _FRAME_HEADER.unpack(header)
+            end = offset + _FRAME_HEADER.size + meta_len + body_len
+            if limit is not None and end > limit:
+                return
+            meta = f.read(meta_len)
+            body = f.read(body_len)
+            if len(meta) < meta_len or len(body) < body_len:
+                return
+            if zlib.crc32(body, zlib.crc32(meta)) != crc:
+                logger.error("Corrupt spool frame in %s at offset %d", path, offset)
+                return
+            fields = orjson.loads(meta)
+            yield SpoolRecord(body=body, **fields), end
+            offset = end
+            count += 1
+
+
+def _segment_seq(path: Path) -> int:
+    return int(path.name[len(_SEGMENT_PREFIX) : -len(_SEGMENT_SUFFIX)])
+
+
+class Spool:
+    """세그먼트 회전·fsync 그룹 커밋 append 로그(프로세스당 슬롯 하나)."""
+
+    def __init__(self, directory: Path, lock_file: IO[bytes], segment_max_bytes: int):
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self._lock_file = lock_file
+        existing = self.segments()
+        # 재시작 시 이전 세그먼트(꼬리가 잘렸을 수 있음)에 이어 쓰지 않는다
+        self.active_seq = existing[-1] + 1 if existing else 0
+        # (활성 세그먼트, fsync 완료 오프셋) — 드레이너 스레드가 한 번에 읽도록 튜플로 교체
+        self.committed_position = (self.active_seq, 0)
+        self._file = self.segment_path(self.active_seq).open("ab")
+        self._buffer: list[bytes] = []
+        self._waiters: list[asyncio.Future] = []
+        self._committer: asyncio.Task | None = None
+        self.committed = asyncio.Event()
+
+    @classmethod
+    def open(cls, root: Path, segment_max_bytes: int) -> "Spool":
+        """비어 있는(다른 프로세스가 잡지 않은) 첫 슬롯 디렉터리를 잠그고 연다."""
+        root.mkdir(parents=True, exist_ok=True)
+        for slot in range(_MAX_SLOTS):
+            directory = root / str(slot)
+            directory.mkdir(exist_ok=True)
+            lock_file = (directory / _LOCK_FILE).open("ab")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                continue
+            return cls(directory, lock_file, segment_max_bytes)
+        raise RuntimeError(f"No free spool slot under {root}")
+
+    def segment_path(self, seq: int) -> Path:
+        return self.directory / f"{_SEGMENT_PREFIX}{seq:012d}{_SEGMENT_SUFFIX}"
+
+    def segments(self) -> list[int]:
+        return sorted(
+            _segment_seq(p) for p in self.directory.glob(f"{_SEGMENT_PREFIX}*{_SEGMENT_SUFFIX}")
+        )
+
+    async def append(self, record: SpoolRecord) -> None:
+        """레코드가 fsync될 때까지 기다린다 — 반환되면 크래시에도 남는다."""
+        future = asyncio.get_running_loop().create_future()
+        self._buffer.append(encode_record(record))
+        self._waiters.append(future)
+        if self._committer is None or self._committer.done():
+            self._committer = asyncio.create_task(self._commit_loop())
+        await future
+
+    async def _commit_loop(self) -> None:
+        # 한 번의 fsync가 도는 동안 쌓인 프레임은 다음 fsync 한 번으로 함께 커밋된다
+        while self._buffer:
+            frames, self._buffer = self._buffer, []
+            waiters, self._waiters = self._waiters, []
+            SPOOL_FSYNC_BATCH_SIZE.observe(len(frames))
+            started = time.perf_counter()
+            try:
+                seq, offset = await asyncio.to_thread(self._write, frames)
+            except Exception as e:
+                logger.exception("Spool write failed")
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(e)
+                continue
+            SPOOL_FSYNC_SECONDS.observe(time.perf_counter() - started)
+            self.committed_position = (seq, offset)
+            self.committed.set()
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    def _write(self, frames: list[bytes]) -> tuple[int, int]:
+        try:
+            self._file.write(b"".join(frames))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError:
+            # 일부만 쓰였을 수 있다 — 새 세그먼트로 넘겨 잘린 프레임이 뒤 레코드를 막지 않게 함
+            self._rotate()
+            raise
+        offset = self._file.tell()
+        if offset < self.segment_max_bytes:
+            return self.active_seq, offset
+        return self._rotate(), 0
+
+    def _rotate(self) -> int:
+        self._file.close()
+        seq = self.active_seq + 1
+        self._file = self.segment_path(seq).open("ab")
+        # 새 세그먼트의 디렉터리 엔트리도 내구화
+        dir_fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+        self.active_seq = seq
+        return seq
+
+    def load_checkpoint(self) -> tuple[int, int]:
+        try:
+            data = orjson.loads((self.directory / _CHECKPOINT_FILE).read_bytes())
+        except FileNotFoundError:
+            existing = self.segments()
+            return (existing[0] if existing else self.active_seq), 0
+        return data["segment"], data["offset"]
+
+    def save_checkpoint(self, seq: int, offset: int) -> None:
+        """tmp 파일 + fsync + rename — 체크포인트는 항상 완전한 값이다."""
+        path = self.directory / _CHECKPOINT_FILE
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            f.write(orjson.dumps({"segment": seq, "offset": offset}))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def discard_before(self, seq: int) -> None:
+        for old in self.segments():
+            if old < seq:
+                self.segment_path(old).unlink(missing_ok=True)
+
+    def pending_bytes(self, seq: int, offset: int) -> int:
+        active_seq, committed_offset = self.committed_position
+        total = 0
+        for existing in self.segments():
+            if existing == active_seq:
+                total += committed_offset
+            elif existing >= seq:
+                total += self.segment_path(existing).stat().st_size
+        return max(total - offset, 0)
+
+    def close(self) -> None:
+        self._file.close()
+        self._lock_file.close()
+
+
+class SpoolDrainer:
+    """스풀 → Celery 전달자(lifespan 백그라운드 태스크).
+
+    멱등 예약은 여기서 한다. 예약 값에 레코드 위치(토큰)를 넣어, 발행 전 크래시로
+    남은 자기 예약은 재시작 후 중복으로 오판하지 않고 다시 발행한다(DB 고유제약이
+    혹시 모를 중복 행을 막는다). 발행 실패 레코드는 예약을 해제하고 백오프 후 재시도
+    — 배치 전체가 발행될 때까지 체크포인트는 움직이지 않는다.
+
+    읽기·체크포인트 저장·세그먼트 삭제의 오류(디스크 가득 참·권한)도 루프를 끝내지 않는다
+    — 로그·`spool_drain_errors_total`을 남기고 같은 위치부터 백오프 후 다시 시도한다.
+    append는 계속 202를 돌려주므로 드레이너가 멈추면 아무것도 발행되지 않는다.
+    """
+
+    def __init__(
+        self,
+        spool: Spool,
+        idempotency: IdempotencyStore,
+        batch_size: int = 100,
+        poll_interval: float = 1.0,
+        max_backoff: float = 30.0,
+        recent: RecentEnqueues | None = None,
+        publisher: StreamPublisher | None = None,
+    ):
+        self.spool = spool
+        self.idempotency = idempotency
+        self.recent = recent
+        # 스트림 전송이면 XADD, 아니면 Celery 발행 스레드
+        self.publisher: StreamPublisher | TaskPublisher = publisher or task_publisher
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+
+    async def run(self) -> None:
+        position = self.spool.load_checkpoint()
+        backoff = min(0.5, self.max_backoff)
+        while True:
+            self.spool.committed.clear()
+            try:
+                position, delivered = await self.drain_once(position)
+            except Exception:
+                # 체크포인트 전 실패면 같은 배치를 다시 보낸다(자기 토큰 예약은 재발행)
+                logger.exception("Spool drain failed at %s; retrying in %ss", position, backoff)
+                SPOOL_DRAIN_ERRORS_TOTAL.inc()
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+            backoff = min(0.5, self.max_backoff)
+            if not delivered:
+                # 따라잡음 — 다음 커밋(또는 주기)까지 대기
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self.spool.committed.wait(), self.poll_interval)
+
+    async def drain_once(self, position: tuple[int, int]) -> tuple[tuple[int, int], int]:
+        """`position`부터 한 배치를 전달하고 (새 체크포인트, 전달 건수)를 돌려준다."""
+        seq, offset = position
+        batch, next_seq, next_offset = await asyncio.to_thread(self._read_batch, seq, offset)
+        if batch:
+            await self._deliver(batch)
+        if (next_seq, next_offset) != position:
+            await asyncio.to_thread(self._advance, next_seq, next_offset)
+        SPOOL_PENDING_BYTES.set(self.spool.pending_bytes(next_seq, next_offset))
+        return (next_seq, next_offset), len(batch)
+
+    def _advance(self, seq: int, offset: int) -> None:
+        self.spool.save_checkpoint(seq, offset)
+        self.spool.discard_before(seq)
+
+    def _read_batch(self, seq: int, offset: int) -> tuple[list[tuple[SpoolRecord, str]], int, int]:
+        batch: list[tuple[SpoolRecord, str]] = []
+        while len(batch) < self.batch_size:
+            active_seq, committed_offset = self.spool.committed_position
+            active = seq >= active_seq
+            path = self.spool.segment_path(seq)
+            if path.exists():
+                limit = committed_offset if active else None
+                for record, end in read_records(
+                    path, offset, limit, max_count=self.batch_size - len(batch)
+                ):
+                    # 토큰 = 슬롯 내 레코드 위치 — 재시작 후에도 같은 레코드면 같은 값
+                    batch.append((record, f"spool:{self.spool.directory.name}:{seq}:{offset}"))
+                    offset = end
+            if active or len(batch) >= self.batch_size:
+                break
+            if path.exists() and offset < path.stat().st_size:
+                logger.error("Skipping torn spool tail in %s at offset %d", path, offset)
+            # 다 읽은(또는 없는) 비활성 세그먼트 — 다음 세그먼트로
+            later = [s for s in self.spool.segments() if s > seq]
+            seq, offset = (later[0] if later else active_seq), 0
+        return batch, seq, offset
+
+    async def _deliver(self, batch: list[tuple[SpoolRecord, str]]) -> None:
+        pending = batch
+        backoff = min(0.5, self.max_backoff)
+        while True:
+            results = await asyncio.gather(
+                *(self._publish(record, token) for record, token in pending),
+                return_exceptions=True,
+            )
+            pending = [
+                item for item, result in zip(pending, results, strict=True) if result is not None
+            ]
+            if not pending:
+                return
+            logger.warning("Spool drain failed for %d events; retrying", len(pending))
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    async def _publish(self, record: SpoolRecord, token: str) -> None:
+        key = IdempotencyKey.for_event(
+            record.tenant_id, record.source, record.event_id, record.fingerprint
+        )
+        if (
+            key is not None
+            and not await self.idempotency.reserve(key, token)
+            and token != await self.idempotency.holder(key)
+        ):
+            SPOOL_DRAINED_TOTAL.labels(result="duplicate").inc()
+            return
+        args: list[Any] = [record.customer_id, record.body, record.event_id]
+        if record.fingerprint:
+            args.append(record.fingerprint)
+        try:
+            args[1] = await claim_check.check_in(record.body)
+            await self.publisher.publish(
+                get_task(record.source), args, queue=get_queue(record.source)
+            )
+        except Exception:
+            SPOOL_DRAINED_TOTAL.labels(result="failed").inc()
+            if key is not None:
+                await self.idempotency.release(key)
+            if claim_check.is_reference(args[1]):
+                await asyncio.to_thread(claim_check.release, args[1])
+            raise
+        SPOOL_DRAINED_TOTAL.labels(result="published").inc()
+        if self.recent is not None and key is not None:
+            self.recent.add(key)
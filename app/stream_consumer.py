@@ -0,0 +1,314 @@
+"""스트림 워커 — Redis Streams 소비자 그룹에서 웹훅을 배치로 읽어 적재한다.
+
+`INGEST_TRANSPORT=streams`일 때 수신 경로가 XADD한 항목(app/streams.py)을 처리한다.
+
+1. `XREADGROUP`으로 스트림마다 최대 `STREAM_READ_COUNT`건을 읽고(없으면 `STREAM_BLOCK_MS` 대기)
+2. 페이로드 검증(태스크와 같은 스키마) — 실패한 항목만 DLQ
+3. 배치 워커와 같은 multi-row `INSERT ... ON CONFLICT DO NOTHING`(또는 COPY) + COMMIT 한 번
+   (app/event_batch.py)
+4. 적재·중복·DLQ 항목을 `XACK`
+
+acks-late는 소비자 그룹의 미확인 목록(PEL)이 맡는다. 일시적 DB 오류면 ack하지 않고 두고,
+`STREAM_CLAIM_IDLE_MS` 넘게 미확인인 항목은 어느 소비자든 `XAUTOCLAIM`으로 회수해 다시
+처리한다(죽은 소비자의 항목도 같은 경로). 재전달이 곧 재시도이므로 전달 횟수가 태스크의
+`max_retries + 1`을 넘으면 DLQ. 중복(고유제약 충돌)은 정상 처리(ack)다.
+
+스트림마다 적체(`XINFO GROUPS`의 lag·pending)를 주기적으로 메트릭에 싣고,
+`STREAM_MAX_AGE_SECONDS`가 있으면 그보다 오래된 항목을 `XTRIM MINID`로 잘라 낸다.
+
+    python -m app.stream_consumer -Q high_priority,default
+"""
+
+import argparse
+import logging
+import os
+import signal
+import socket
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, cast
+
+import redis
+from prometheus_client import start_http_server
+from sqlalchemy.orm import Session
+
+from . import claim_check, webhooks  # noqa: F401 — 태스크 레지스트리 등록
+from .celery_worker import celery
+from .config import settings
+from .database import SessionLocal
+from .event_batch import count_error, dead_letter_event, event_row, persist_events
+from .metrics import (
+    STREAM_LAG,
+    STREAM_MESSAGES_TOTAL,
+    STREAM_PENDING_ENTRIES,
+)
+from .repositories.webhook_event_repository import WebhookEventRepository
+from .streams import decode_entry, stream_key
+from .webhook_registry import TASK_REGISTRY
+
+logger = logging.getLogger(__name__)
+
+_MAINTENANCE_SECONDS = 5.0  # XAUTOCLAIM 회수·적체 메트릭·나이 트림 주기
+
+
+@dataclass
+class _Entry:
+    stream: str
+    entry_id: str
+    task_name: str
+    row: dict[str, Any]
+    raw_payload: Any
+
+
+def _text(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class StreamConsumer:
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        queues: list[str],
+        *,
+        group: str = "webhook-workers",
+        name: str | None = None,
+        batch_size: int = 100,
+        block_ms: int = 1000,
+        claim_idle_ms: int = 60_000,
+        max_age_seconds: int = 0,
+        session_factory: Callable[[], Session] = SessionLocal,
+        copy: bool = False,
+    ):
+        self.redis = redis_client
+        # 나열 순서가 XREADGROUP 순서 — 우선순위 큐를 앞에
+        self.streams = [stream_key(q) for q in queues]
+        self.group = group
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.max_age_seconds = max_age_seconds
+        self.session_factory = session_factory
+        self._insert_batch = (
+            WebhookEventRepository.copy_insert_ignore_duplicates
+            if copy
+            else WebhookEventRepository.bulk_insert_ignore_duplicates
+        )
+        self._sources = {task.name: source for source, task in TASK_REGISTRY.items()}
+        self._claim_cursors = dict.fromkeys(self.streams, "0-0")
+        self._next_maintenance = 0.0
+        self._stopped = False
+
+    def run(self) -> None:
+        self.create_groups()
+        while not self._stopped:
+            self.poll()
+
+    def stop(self, *_: Any) -> None:
+        self._stopped = True
+
+    def create_groups(self) -> None:
+        """스트림·소비자 그룹이 없으면 만든다(처음부터 읽음)."""
+        for stream in self.streams:
+            try:
+                self.redis.xgroup_create(stream, self.group, id="0", mkstream=True)
+            except redis.ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+
+    def poll(self) -> None:
+        now = time.monotonic()
+        if now >= self._next_maintenance:
+            self._next_maintenance = now + _MAINTENANCE_SECONDS
+            self.report_backlog()
+            recovered = self.recover()
+            if recovered:
+                self.handle_batch(recovered)
+        entries = self.read()
+        if entries:
+            self.handle_batch(entries)
+
+    def read(self) -> list[tuple[str, str, dict[bytes, bytes]]]:
+        response = cast(
+            list[Any] | None,
+            self.redis.xreadgroup(
+                self.group,
+                self.name,
+                dict.fromkeys(self.streams, ">"),
+                count=self.batch_size,
+                block=self.block_ms,
+            ),
+        )
+        return [
+            (_text(stream), _text(entry_id), fields)
+            for stream, items in response or []
+            for entry_id, fields in items
+        ]
+
+    def recover(self) -> list[tuple[str, str, dict[bytes, bytes]]]:
+        """오래 미확인인 항목을 XAUTOCLAIM으로 가져온다 — 전달 횟수 초과분은 DLQ."""
+        recovered: list[tuple[str, str, dict[bytes, bytes]]] = []
+        for stream in self.streams:
+            response = cast(
+                list[Any],
+                self.redis.xautoclaim(
+                    stream,
+                    self.group,
+                    self.name,
+                    min_idle_time=self.claim_idle_ms,
+                    start_id=self._claim_cursors[stream],
+                    count=self.batch_size,
+                ),
+            )
+            self._claim_cursors[stream] = _text(response[0])
+            # Redis 7은 트림된 항목 ID를 따로, 6.2는 필드 없는 항목으로 돌려준다
+            trimmed = [_text(i) for i in (response[2] if len(response) > 2 else [])]
+            trimmed += [_text(i) for i, fields in response[1] if fields is None]
+            if trimmed:
+                logger.error(
+                    "%d pending entries of %s were trimmed before ack", len(trimmed), stream
+                )
+                self.redis.xack(stream, self.group, *trimmed)
+                STREAM_MESSAGES_TOTAL.labels(result="trimmed").inc(len(trimmed))
+            claimed = [(_text(i), fields) for i, fields in response[1] if fields is not None]
+            if not claimed:
+                continue
+            STREAM_MESSAGES_TOTAL.labels(result="claimed").inc(len(claimed))
+            deliveries = self._delivery_counts(stream, [i for i, _ in claimed])
+            for entry_id, fields in claimed:
+                task_name = fields.get(b"task", b"").decode()
+                task = celery.tasks.get(task_name)
+                max_deliveries = (task.max_retries or 0) + 1 if task is not None else 1
+                if deliveries.get(entry_id, 0) > max_deliveries:
+                    customer_id = fields.get(b"customer_id", b"Unknown").decode()
+                    self._dead_letter(
+                        stream,
+                        entry_id,
+                        task_name,
+                        customer_id,
+                        None,
+                        RuntimeError(f"Gave up after {max_deliveries} deliveries"),
+                    )
+                    continue
+                recovered.append((stream, entry_id, fields))
+        return recovered
+
+    def _delivery_counts(self, stream: str, entry_ids: list[str]) -> dict[str, int]:
+        pipe = self.redis.pipeline(transaction=False)
+        for entry_id in entry_ids:
+            pipe.xpending_range(stream, self.group, min=entry_id, max=entry_id, count=1)
+        return {
+            _text(info["message_id"]): info["times_delivered"]
+            for pending in pipe.execute()
+            for info in pending
+        }
+
+    def report_backlog(self) -> None:
+        """적체 메트릭 갱신 + 나이 상한 트림."""
+        for stream in self.streams:
+            if self.max_age_seconds:
+                cutoff_ms = int((time.time() - self.max_age_seconds) * 1000)
+                self.redis.xtrim(stream, minid=f"{cutoff_ms}-0", approximate=True)
+            for info in cast(list[dict[str, Any]], self.redis.xinfo_groups(stream)):
+                if _text(info["name"]) != self.group:
+                    continue
+                STREAM_PENDING_ENTRIES.labels(stream=stream).set(info["pending"])
+                # lag은 Redis 7+ — 트림 등으로 계산할 수 없으면 None
+                if info.get("lag") is not None:
+                    STREAM_LAG.labels(stream=stream).set(info["lag"])
+
+    def handle_batch(self, entries: list[tuple[str, str, dict[bytes, bytes]]]) -> None:
+        """항목 묶음을 적재하고 적재·중복·DLQ 항목을 ack한다(일시적 오류면 미확인으로 둔다)."""
+        decoded = [e for e in (self._decode(*entry) for entry in entries) if e is not None]
+        if decoded:
+            self._persist(decoded)
+
+    def _decode(self, stream: str, entry_id: str, fields: dict[bytes, bytes]) -> _Entry | None:
+        task_name = "Unknown"
+        kwargs: dict[str, Any] = {}
+        source = None
+        try:
+            task_name, kwargs = decode_entry(fields)
+            source = self._sources.get(task_name)
+            if source is None:
+                raise ValueError(f"Task '{task_name}' is not a webhook task")
+            row = event_row(source, [], kwargs)
+        except Exception as e:
+            # 비일시적 오류 — 태스크의 on_failure와 같이 DLQ
+            customer_id = kwargs.get("customer_id", "Unknown")
+            self._dead_letter(stream, entry_id, task_name, customer_id, source, e)
+            return None
+        return _Entry(stream, entry_id, task_name, row, kwargs.get("raw_payload"))
+
+    def _persist(self, entries: list[_Entry]) -> None:
+        outcome = persist_events(self.session_factory, self._insert_batch, entries)
+        STREAM_MESSAGES_TOTAL.labels(result="inserted").inc(outcome.inserted)
+        STREAM_MESSAGES_TOTAL.labels(result="duplicate").inc(outcome.duplicates)
+        if outcome.stored:
+            self._ack(outcome.stored)
+        for entry in outcome.stored:
+            claim_check.release(entry.raw_payload)
+        for entry, exc in outcome.rejected:
+            self._dead_letter(
+                entry.stream,
+                entry.entry_id,
+                entry.task_name,
+                entry.row["customer_id"],
+                entry.row["source"],
+                exc,
+            )
+        # 연결·일시적 오류 — ack하지 않는다. 유휴 시간이 지나면 XAUTOCLAIM이 재전달
+        for entry, exc in outcome.failed:
+            count_error(entry.row["customer_id"], entry.row["source"], exc)
+        STREAM_MESSAGES_TOTAL.labels(result="retried").inc(len(outcome.failed))
+
+    def _ack(self, entries: list[_Entry]) -> None:
+        by_stream: dict[str, list[str]] = {}
+        for entry in entries:
+            by_stream.setdefault(entry.stream, []).append(entry.entry_id)
+        pipe = self.redis.pipeline(transaction=False)
+        for stream, entry_ids in by_stream.items():
+            pipe.xack(stream, self.group, *entry_ids)
+        pipe.execute()
+
+    def _dead_letter(
+        self,
+        stream: str,
+        entry_id: str,
+        task_name: str,
+        customer_id: Any,
+        source: str | None,
+        exc: BaseException,
+    ) -> None:
+        dead_letter_event(task_name, entry_id, customer_id, source, exc)
+        self.redis.xack(stream, self.group, entry_id)
+        STREAM_MESSAGES_TOTAL.labels(result="dead_lettered").inc()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-Q", "--queues", default="high_priority,default")
+    parser.add_argument("--metrics-port", type=int, default=None)
+    options = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if options.metrics_port:
+        start_http_server(options.metrics_port)
+    consumer = StreamConsumer(
+        redis.Redis.from_url(settings.celery_broker_url),
+        options.queues.split(","),
+        group=settings.stream_consumer_group,
+        batch_size=settings.stream_read_count,
+        block_ms=settings.stream_block_ms,
+        claim_idle_ms=settings.stream_claim_idle_ms,
+        max_age_seconds=settings.stream_max_age_seconds,
+        copy=settings.worker_batch_loader == "copy",
+    )
+    signal.signal(signal.SIGTERM, consumer.stop)
+    signal.signal(signal.SIGINT, consumer.stop)
+    consumer.run()
+
+
+if __name__ == "__main__":
+    main()
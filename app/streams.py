@@ -0,0 +1,65 @@
+"""Redis Streams 전송 — Celery 메시지 대신 우선순위별 스트림에 웹훅을 XADD한다.
+
+Celery 메시지는 작은 웹훅 하나에도 프로토콜 v2 봉투(헤더·직렬화·base64)를 씌워
+kombu가 큐 리스트에 넣고, 결과 백엔드 기록까지 따른다. 스트림 전송
+(`INGEST_TRANSPORT=streams`)은 태스크 인자를 필드로 그대로 XADD한다 — 본문은 원본 바이트.
+
+- 스트림 키: `webhooks:<큐>` — `get_queue` 라우팅 그대로(`high_priority`·`default`)
+- 길이 상한: XADD `MAXLEN ~ STREAM_MAX_LEN`(근사 트림), 나이 상한은 소비자가 `XTRIM MINID`
+- 소비: app/stream_consumer.py(소비자 그룹 + XREADGROUP 배치 + XAUTOCLAIM 회수)
+
+트림은 아직 ack되지 않은 항목도 지운다 — 상한은 최악의 적체보다 넉넉히 잡고
+`stream_lag`·`stream_pending_entries`로 적체를 본다.
+"""
+
+from typing import Any
+
+import orjson
+import redis.asyncio as aioredis
+from celery import Task
+from redis.typing import EncodableT, FieldT
+
+from .webhook_registry import WEBHOOK_TASK_PARAMS
+
+STREAM_PREFIX = "webhooks:"
+
+
+def stream_key(queue: str) -> str:
+    return f"{STREAM_PREFIX}{queue}"
+
+
+def encode_entry(task: Task, args: list[Any]) -> dict[FieldT, EncodableT]:
+    """웹훅 태스크 인자를 스트림 필드로 — None 인자는 필드를 생략한다."""
+    fields: dict[FieldT, EncodableT] = {"task": task.name}
+    for name, value in zip(WEBHOOK_TASK_PARAMS, args, strict=False):
+        if value is None:
+            continue
+        if isinstance(value, dict):
+            value = orjson.dumps(value)
+        fields[name] = value if isinstance(value, bytes) else str(value)
+    return fields
+
+
+def decode_entry(fields: dict[bytes, bytes]) -> tuple[str, dict[str, Any]]:
+    """스트림 필드를 (태스크 이름, 태스크 kwargs)로 — 본문은 바이트 그대로 둔다."""
+    kwargs: dict[str, Any] = {}
+    for key, value in fields.items():
+        name = key.decode()
+        kwargs[name] = value if name == "raw_payload" else value.decode()
+    return kwargs.pop("task"), kwargs
+
+
+class StreamPublisher:
+    """`task_publisher.publish`와 같은 호출 형태로 XADD한다(수신 경로·스풀 드레이너 공용)."""
+
+    def __init__(self, redis_client: aioredis.Redis, *, max_len: int):
+        self.redis = redis_client
+        self.max_len = max_len
+
+    async def publish(self, task: Task, args: list[Any], *, queue: str) -> None:
+        await self.redis.xadd(
+            stream_key(queue), encode_entry(task, args), maxlen=self.max_len, approximate=True
+        )
+
+    async def close(self) -> None:
+        await self.redis.close()
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+import redis.asyncio as aioredis
+
+from .config import settings
+from .metrics import TENANT_CACHE_LOOKUPS_TOTAL
+from .models.customer import INVALIDATION_CHANNEL, Customer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedCustomer:
+    """검증 경로가 쓰는 Customer 필드만 담은 불변 스냅샷(세션 비의존)."""
+
+    id: UUID
+    tenant_id: str
+    webhook_secret: str
+    is_active: bool
+    allowed_event_types: tuple[str, ...] = field(default_factory=tuple)
+
+    @classmethod
+    def from_model(cls, customer: Customer) -> "CachedCustomer":
+        # 레거시 Column 타입 — 런타임 값은 이미 각 파이썬 타입
+        return cls(
+            id=customer.id,  # type: ignore[arg-type]
+            tenant_id=customer.tenant_id,  # type: ignore[arg-type]
+            webhook_secret=customer.webhook_secret,  # type: ignore[arg-type]
+            is_active=bool(customer.is_active),
+            allowed_event_types=tuple(customer.allowed_event_types or ()),
+        )
+
+
+# 음성 캐시 표식 — "이 tenant_id는 존재하지 않음"
+_MISSING = object()
+
+
+class TenantCache:
+    """tenant_id → CachedCustomer 의 크기 제한 TTL/LRU 캐시.
+
+    존재하지 않는 tenant_id도 짧은 TTL로 음성 캐시해 스캐너의 무작위 tenant_id가
+    DB 부하로 이어지지 않게 한다. 정합성은 TTL(안전망) + Redis pub/sub 무효화로 맞춘다.
+    """
+
+    def __init__(self, max_size: int, ttl: float, negative_ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        # 무효화마다 증가 — 조회 중 무효화가 끼면 뒤늦은 put이 stale 값을 다시 넣지 않게 한다
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, tenant_id: str) -> tuple[bool, CachedCustomer | None]:
+        """(적중 여부, 값). 음성 적중은 (True, None)."""
+        entry = self._entries.get(tenant_id)
+        if entry is None:
+            TENANT_CACHE_LOOKUPS_TOTAL.labels(result="miss").inc()
+            return False, None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[tenant_id]
+            TENANT_CACHE_LOOKUPS_TOTAL.labels(result="miss").inc()
+            return False, None
+        self._entries.move_to_end(tenant_id)
+        if value is _MISSING:
+            TENANT_CACHE_LOOKUPS_TOTAL.labels(result="negative_hit").inc()
+            return True, None
+        TENANT_CACHE_LOOKUPS_TOTAL.labels(result="hit").inc()
+        return True, value
+
+    def put(
+        self, tenant_id: str, customer: CachedCustomer | None, version: int | None = None
+    ) -> None:
+        if version is not None and version != self.version:
+            return
+        ttl = self.ttl if customer is not None else self.negative_ttl
+        value = customer if customer is not None else _MISSING
+        self._entries[tenant_id] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(tenant_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, tenant_id: str | None = None) -> None:
+        """tenant_id 하나(또는 None이면 전체)를 비운다."""
+        self.version += 1
+        if tenant_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(tenant_id, None)
+
+    async def listen(self, redis_client: aioredis.Redis) -> None:
+        """무효화 채널을 구독해 다른 인스턴스의 변경을 반영한다(lifespan 백그라운드 태스크).
+
+        구독이 끊겼다 다시 붙는 사이의 변경은 놓칠 수 있으므로 재구독 시 전체를 비운다.
+        """
+        while True:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                self.invalidate()
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    data = message["data"]
+                    self.invalidate(data.decode() if isinstance(data, bytes) else data)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Tenant cache invalidation listener failed; retrying", exc_info=True)
+                await asyncio.sleep(1.0)
+            finally:
+                await pubsub.aclose()
+
+
+def create_tenant_cache() -> TenantCache | None:
+    if not settings.tenant_cache_enabled:
+        return None
+    return TenantCache(
+        max_size=settings.tenant_cache_max_size,
+        ttl=settings.tenant_cache_ttl_seconds,
+        negative_ttl=settings.tenant_cache_negative_ttl_seconds,
+    )
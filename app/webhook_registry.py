@@ -3,6 +3,9 @@ from celery import Task
 # Registry to map a source name to its processing task
 TASK_REGISTRY: dict[str, Task] = {}
 
+# 웹훅 태스크(process_*_webhook_task)의 위치 인자 순서 — 대체 워커·전송이 인자를 이름으로 다룬다
+WEBHOOK_TASK_PARAMS = ("customer_id", "raw_payload", "event_id", "fingerprint")
+
 
 def register_webhook(source: str, task: Task):
     """Registers a webhook source and its processing task."""
@@ -17,3 +20,8 @@ def get_task(source: str) -> Task:
     if not task:
         raise NotImplementedError(f"No task registered for source '{source}'.")
     return task
+
+
+def get_queue(source: str) -> str:
+    """Routes tasks to different queues based on source (GitHub deliveries are prioritized)."""
+    return "high_priority" if source == "github" else "default"
@@ -0,0 +1,92 @@
+"""webhook_events 적재 벤치 — 행 단위 ORM(`WebhookEventRepository.create`) vs COPY 대량 적재.
+
+사용법:
+    DATABASE_URL=postgresql+psycopg2://... python benchmarks/bench_bulk_load.py [--rows N]
+
+마이그레이션이 끝난 전용 DB에서 실행할 것. 벤치용 고객을 하나 만들고 끝나면 그 고객의
+이벤트와 함께 지운다. ORM 경로는 태스크와 같이 행마다 create + commit,
+COPY 경로는 `app.bulk_loader.load_events`(청크마다 COPY → 스테이징 → 병합 + 커밋).
+"""
+
+import argparse
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import delete  # noqa: E402
+
+from app.bulk_loader import load_events  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.models.customer import Customer  # noqa: E402
+from app.models.webhook_event import WebhookEvent  # noqa: E402
+from app.repositories.webhook_event_repository import WebhookEventRepository  # noqa: E402
+
+
+def _rows(customer_id: uuid.UUID, count: int, prefix: str):
+    for i in range(count):
+        yield {
+            "customer_id": customer_id,
+            "source": "github",
+            "event_id": f"{prefix}-{i}",
+            "payload": {
+                "action": "opened",
+                "sender": {"login": "octocat"},
+                "repository": {"full_name": "octocat/hello"},
+            },
+            "status": "PROCESSED",
+        }
+
+
+def _orm(customer_id: uuid.UUID, count: int) -> float:
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        for row in _rows(customer_id, count, "orm"):
+            WebhookEventRepository.create(
+                db,
+                customer_id=row["customer_id"],
+                source=row["source"],
+                payload=row["payload"],
+                event_id=row["event_id"],
+            )
+            db.commit()
+    return time.perf_counter() - started
+
+
+def _copy(customer_id: uuid.UUID, count: int) -> float:
+    return load_events(_rows(customer_id, count, "copy")).seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20_000)
+    options = parser.parse_args()
+
+    customer_id = uuid.uuid4()
+    with SessionLocal() as db:
+        db.add(
+            Customer(
+                id=customer_id,
+                tenant_id=f"bench-{customer_id.hex[:8]}",
+                name="bench",
+                webhook_secret="bench",
+                allowed_event_types=[],
+            )
+        )
+        db.commit()
+    try:
+        print(f"{'path':>6} {'rows':>8} {'seconds':>9} {'rows/s':>10}")
+        for name, run in (("orm", _orm), ("copy", _copy)):
+            seconds = run(customer_id, options.rows)
+            print(f"{name:>6} {options.rows:>8} {seconds:>9.2f} {options.rows / seconds:>10.0f}")
+    finally:
+        with SessionLocal() as db:
+            db.execute(delete(WebhookEvent).where(WebhookEvent.customer_id == customer_id))
+            db.execute(delete(Customer).where(Customer.id == customer_id))
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""멱등 저장소 Redis 메모리 벤치 — 이벤트당 키(keys) vs 시간 버킷 해시(compact).
+
+사용법:
+    python benchmarks/bench_idempotency_memory.py [--redis-url URL] [--events N] [--tenants T]
+
+지정한 Redis DB(기본 15)를 FLUSHDB 하므로 전용 인스턴스/DB에서 실행할 것.
+24시간 보존 창에 이벤트가 고르게 퍼졌다고 보고(compact는 24개 시간 버킷에 분산)
+각 레이아웃을 적재한 뒤 `INFO memory`의 used_memory 증가분을 이벤트 수로 나눈다.
+"""
+
+import argparse
+import sys
+import uuid
+from pathlib import Path
+
+import redis
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.idempotency import (  # noqa: E402
+    IDEMPOTENCY_TTL_SECONDS,
+    CompactIdempotencyStore,
+    IdempotencyKey,
+)
+
+_BATCH = 10_000
+_HOURS = 24
+
+
+def _used_memory(client: redis.Redis) -> int:
+    return int(client.info("memory")["used_memory"])
+
+
+def _events(events: int, tenants: int):
+    for i in range(events):
+        # Stripe 형태의 event id(evt_ + 24자)
+        yield i, f"tenant-{i % tenants}", f"evt_{uuid.uuid4().hex[:24]}"
+
+
+def _load_keys(client: redis.Redis, events: int, tenants: int) -> None:
+    pipe = client.pipeline(transaction=False)
+    for i, tenant, event_id in _events(events, tenants):
+        pipe.set(str(IdempotencyKey(tenant, "stripe", event_id)), "1", ex=IDEMPOTENCY_TTL_SECONDS)
+        if i % _BATCH == _BATCH - 1:
+            pipe.execute()
+    pipe.execute()
+
+
+def _load_compact(client: redis.Redis, events: int, tenants: int) -> None:
+    pipe = client.pipeline(transaction=False)
+    for i, tenant, event_id in _events(events, tenants):
+        bucket = f"webhook:idem:{{{tenant}}}:stripe:{i % _HOURS}"
+        pipe.hset(bucket, CompactIdempotencyStore.digest(event_id), "1")  # type: ignore[arg-type]
+        if i % _BATCH == _BATCH - 1:
+            pipe.execute()
+    pipe.execute()
+    for tenant in range(tenants):
+        for hour in range(_HOURS):
+            client.expire(
+                f"webhook:idem:{{tenant-{tenant}}}:stripe:{hour}", IDEMPOTENCY_TTL_SECONDS
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--tenants", type=int, default=100)
+    options = parser.parse_args()
+
+    client = redis.Redis.from_url(options.redis_url)
+    print(f"{'layout':>8} {'events':>10} {'used MiB':>10} {'bytes/event':>12}")
+    for name, load in (("keys", _load_keys), ("compact", _load_compact)):
+        client.flushdb()
+        before = _used_memory(client)
+        load(client, options.events, options.tenants)
+        used = _used_memory(client) - before
+        print(
+            f"{name:>8} {options.events:>10} {used / 2**20:>10.1f} {used / options.events:>12.1f}"
+        )
+    client.flushdb()
+
+
+if __name__ == "__main__":
+    main()
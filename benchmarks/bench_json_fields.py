@@ -0,0 +1,120 @@
+"""지연 필드 추출 벤치 — orjson 전체 파싱 vs `json_fields.extract` 시간·최대 할당.
+
+사용법:
+    python benchmarks/bench_json_fields.py [--repeat N]
+
+GitHub push(`action` 없음, `commits`가 대부분)와 pull_request(큰 `pull_request` 객체
+뒤에 `repository`·`sender`), Stripe(`id`·`type`이 큰 `data` 앞) 키 순서를 그대로 흉내 낸
+본문에서 워커가 읽는 키를 꺼낸다. Stripe처럼 필요한 키가 앞에 있으면 나머지는 보지 않고,
+GitHub 둘처럼 큰 값을 건너뛰어야 하면 건너뛰기 예산을 넘는 즉시 전체 파싱으로 대체한다
+(orjson과 같은 시간).
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+import orjson
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.json_fields import extract  # noqa: E402
+
+_GITHUB_KEYS = ("action", "sender", "repository")
+_STRIPE_KEYS = ("id", "type")
+# 크기 구간 → 반복 항목 수(push 커밋·pull_request 파일)
+_SIZE_CLASSES = {"16KB": 40, "256KB": 650, "2MB": 5200}
+
+_SENDER = {"login": "octocat", "id": 1, "type": "User", "site_admin": False}
+_REPOSITORY = {"full_name": "octocat/hello", "id": 1296269, "private": False}
+
+
+def _push(items: int) -> bytes:
+    commit = {
+        "message": "Update README.md with {deployment} notes",
+        "author": {"name": "Octo Cat", "email": "octocat@github.com"},
+        "modified": ["README.md"],
+    }
+    return orjson.dumps(
+        {
+            "ref": "refs/heads/main",
+            "repository": _REPOSITORY,
+            "sender": _SENDER,
+            "commits": [{"id": uuid.uuid4().hex, **commit} for _ in range(items)],
+        }
+    )
+
+
+def _pull_request(items: int) -> bytes:
+    changed = {"status": "modified", "additions": 3, "patch": "@@ -1,3 +1,4 @@\n-old\n+new"}
+    return orjson.dumps(
+        {
+            "action": "opened",
+            "number": 42,
+            "pull_request": {
+                "title": "Refactor [ingest] path",
+                "files": [{"filename": f"src/{uuid.uuid4().hex}.py", **changed}] * items,
+            },
+            "repository": _REPOSITORY,
+            "sender": _SENDER,
+        }
+    )
+
+
+def _stripe(items: int) -> bytes:
+    line = {"id": "il_1", "amount": 2000, "description": "Pro plan {monthly}", "metadata": {}}
+    return orjson.dumps(
+        {
+            "id": "evt_1",
+            "type": "invoice.finalized",
+            "data": {"object": {"id": "in_1", "lines": {"data": [line] * items * 2}}},
+        }
+    )
+
+
+def _per_call_us(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def _peak_kib(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=50)
+    options = parser.parse_args()
+
+    print(f"{'event':>12} {'size':>6} {'path':>7} {'µs':>10} {'peak KiB':>10}")
+    events = (
+        ("push", _push, _GITHUB_KEYS),
+        ("pull_request", _pull_request, _GITHUB_KEYS),
+        ("stripe", _stripe, _STRIPE_KEYS),
+    )
+    for event, build, keys in events:
+        for label, items in _SIZE_CLASSES.items():
+            body = build(items)
+            paths = (
+                ("orjson", lambda b=body: orjson.loads(b)),
+                ("extract", lambda b=body, k=keys: extract(b, k)),
+            )
+            for name, fn in paths:
+                print(
+                    f"{event:>12} {label:>6} {name:>7} "
+                    f"{_per_call_us(fn, options.repeat):>10.1f} {_peak_kib(fn):>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
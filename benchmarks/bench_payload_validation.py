@@ -0,0 +1,114 @@
+"""워커 페이로드 검증 벤치 — model_validate → model_dump vs 캐시된 TypeAdapter 필드 검증.
+
+사용법:
+    python benchmarks/bench_payload_validation.py [--repeat N]
+
+GitHub push(커밋 수로 크기 조절)·Stripe invoice(라인 항목 수로 조절) 형태 본문을 orjson으로
+한 번 파싱한 dict에 대해 두 경로를 비교한다. GitHub 모델은 선언하지 않은 최상위 필드를
+버리고(저장 내용이 줄어듦), Stripe 모델은 `extra="allow"`라 전체를 복사한다.
+시간은 `process_time`(CPU) 기준 페이로드당 µs, 메모리는 `tracemalloc`으로 잰 한 번
+처리의 최대 추가 할당(파싱된 원본 dict는 제외).
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+import orjson
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.schemas.github_webhook import GITHUB_FIELDS, GitHubWebhookPayload  # noqa: E402
+from app.schemas.stripe_webhook import STRIPE_FIELDS, StripeWebhookPayload  # noqa: E402
+
+# 크기 구간 → 반복 항목 수(push 커밋·invoice 라인)
+_SIZE_CLASSES = {"1KB": 1, "16KB": 40, "256KB": 650, "2MB": 5200}
+
+
+def _push_payload(commits: int) -> bytes:
+    commit = {
+        "message": "Update README.md with deployment notes",
+        "timestamp": "2026-10-01T12:00:00+09:00",
+        "author": {"name": "Octo Cat", "email": "octocat@github.com", "username": "octocat"},
+        "modified": ["README.md"],
+    }
+    return orjson.dumps(
+        {
+            "ref": "refs/heads/main",
+            "sender": {"login": "octocat", "id": 1, "type": "User"},
+            "repository": {"full_name": "octocat/hello", "id": 1296269, "private": False},
+            "commits": [{"id": uuid.uuid4().hex, **commit} for _ in range(commits)],
+        }
+    )
+
+
+def _invoice_payload(lines: int) -> bytes:
+    line = {
+        "object": "line_item",
+        "amount": 1999,
+        "currency": "usd",
+        "description": "1 × Pro plan (at $19.99 / month)",
+        "period": {"start": 1759276800, "end": 1761955200},
+    }
+    return orjson.dumps(
+        {
+            "id": "evt_1Q2w3E4r5T6y7U8i9O0p",
+            "type": "invoice.paid",
+            "data": {
+                "object": {
+                    "object": "invoice",
+                    "lines": {
+                        "data": [{"id": f"il_{uuid.uuid4().hex}", **line} for _ in range(lines)]
+                    },
+                }
+            },
+        }
+    )
+
+
+_SOURCES = {
+    "github": (_push_payload, GitHubWebhookPayload, GITHUB_FIELDS),
+    "stripe": (_invoice_payload, StripeWebhookPayload, STRIPE_FIELDS),
+}
+
+
+def _cpu_us(fn, payload: dict, repeat: int) -> float:
+    started = time.process_time()
+    for _ in range(repeat):
+        fn(payload)
+    return (time.process_time() - started) / repeat * 1e6
+
+
+def _peak_bytes(fn, payload: dict) -> int:
+    tracemalloc.start()
+    try:
+        fn(payload)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    options = parser.parse_args()
+
+    print(f"{'source':>6} {'size':>6} {'path':>6} {'cpu µs':>10} {'peak KiB':>10}")
+    for source, (build, model, adapter) in _SOURCES.items():
+        for label, items in _SIZE_CLASSES.items():
+            payload = orjson.loads(build(items))
+            paths = (
+                ("model", lambda p, m=model: m.model_validate(p).model_dump()),
+                ("lean", lambda p, a=adapter: a.validate_python(p) and p),
+            )
+            for name, fn in paths:
+                cpu = _cpu_us(fn, payload, options.repeat)
+                peak = _peak_bytes(fn, payload)
+                print(f"{source:>6} {label:>6} {name:>6} {cpu:>10.1f} {peak / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Stripe 서명 검증 마이크로벤치 — SDK construct_event vs 내장 verify_stripe_signature.
+
+사용법:
+    python benchmarks/bench_stripe_signature.py [반복횟수]
+
+SDK 경로는 HMAC 외에 본문 전체를 json.loads → StripeObject 트리로 만든다.
+내장 경로는 헤더 파싱 + HMAC-SHA256 + compare_digest만 수행한다.
+"""
+
+import hashlib
+import hmac
+import json
+import sys
+import time
+import timeit
+from pathlib import Path
+
+import stripe
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.signatures import verify_stripe_signature  # noqa: E402
+
+SECRET = "whsec_benchmark"  # noqa: S105 (벤치 전용 더미)
+
+
+def _invoice_event(line_items: int) -> bytes:
+    """라인아이템 수로 크기를 조절하는 invoice.* 형태의 이벤트."""
+    lines = [
+        {
+            "id": f"il_{i:08d}",
+            "object": "line_item",
+            "amount": 1000 + i,
+            "currency": "usd",
+            "description": f"Seat license #{i}",
+            "metadata": {"seat": str(i), "team": "platform"},
+            "period": {"start": 1700000000, "end": 1702592000},
+            "price": {"id": "price_123", "object": "price", "unit_amount": 1000},
+        }
+        for i in range(line_items)
+    ]
+    event = {
+        "id": "evt_bench",
+        "object": "event",
+        "type": "invoice.finalized",
+        "data": {"object": {"id": "in_bench", "object": "invoice", "lines": {"data": lines}}},
+    }
+    return json.dumps(event).encode("utf-8")
+
+
+def _header(body: bytes) -> str:
+    ts = int(time.time())
+    digest = hmac.new(SECRET.encode(), f"{ts}.".encode() + body, hashlib.sha256).hexdigest()
+    return f"t={ts},v1={digest}"
+
+
+def main(number: int) -> None:
+    print(f"{'size':>10} {'sdk µs/op':>12} {'native µs/op':>13} {'saved µs/op':>12} {'speedup':>8}")
+    for line_items in (1, 50, 1_000):
+        body = _invoice_event(line_items)
+        header = _header(body)
+        sdk = min(
+            timeit.repeat(
+                lambda b=body, h=header: stripe.Webhook.construct_event(b, h, SECRET),
+                number=number,
+                repeat=3,
+            )
+        )
+        native = min(
+            timeit.repeat(
+                lambda b=body, h=header: verify_stripe_signature(b, h, SECRET),
+                number=number,
+                repeat=3,
+            )
+        )
+        sdk_us, native_us = sdk / number * 1e6, native / number * 1e6
+        print(
+            f"{len(body):>10} {sdk_us:>12.1f} {native_us:>13.1f} "
+            f"{sdk_us - native_us:>12.1f} {sdk_us / native_us:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
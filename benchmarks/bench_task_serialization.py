@@ -0,0 +1,92 @@
+"""태스크 메시지 직렬화 벤치 — json vs orjson(+ zlib) 크기 구간별 바이트·인코드·디코드 시간.
+
+사용법:
+    python benchmarks/bench_task_serialization.py [--repeat N] [--threshold BYTES]
+
+GitHub push 형태 본문(커밋 수로 크기 조절)을 웹훅 태스크 인자로 넣어 Redis 큐 리스트에
+LPUSH되는 메시지 전체(`build_redis_message` — 봉투·base64 포함)의 바이트 수와,
+태스크 본문 `(args, kwargs, embed)`의 직렬화·역직렬화 시간(메시지당 µs)을 잰다.
+"""
+
+import argparse
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import orjson
+from kombu.serialization import dumps, loads
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.celery_worker import celery  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.ingest_batcher import build_redis_message  # noqa: E402
+from app.services.webhook_handler import process_github_webhook_task  # noqa: E402
+
+# 크기 구간 → push 이벤트 커밋 수
+_SIZE_CLASSES = {"1KB": 1, "16KB": 40, "256KB": 650, "2MB": 5200}
+
+
+def _push_body(commits: int) -> bytes:
+    commit = {
+        "message": "Update README.md with deployment notes",
+        "timestamp": "2026-10-01T12:00:00+09:00",
+        "author": {"name": "Octo Cat", "email": "octocat@github.com", "username": "octocat"},
+        "added": [],
+        "removed": [],
+        "modified": ["README.md"],
+    }
+    return orjson.dumps(
+        {
+            "ref": "refs/heads/main",
+            "sender": {"login": "octocat"},
+            "repository": {"full_name": "octocat/hello"},
+            # 커밋마다 다른 sha — 같은 항목 반복은 압축률을 부풀린다
+            "commits": [
+                {"id": uuid.uuid4().hex + uuid.uuid4().hex[:8], **commit} for _ in range(commits)
+            ],
+        }
+    )
+
+
+def _per_call_us(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--threshold", type=int, default=settings.task_compression_threshold_bytes)
+    options = parser.parse_args()
+    settings.task_compression_threshold_bytes = options.threshold
+
+    print(
+        f"{'size':>6} {'serializer':>10} {'body B':>9} {'wire B':>9} "
+        f"{'encode µs':>10} {'decode µs':>10}"
+    )
+    for label, commits in _SIZE_CLASSES.items():
+        raw = _push_body(commits)
+        args = [str(uuid.uuid4()), raw, "delivery-1", None]
+        task_body = (args, {}, {"callbacks": None, "errbacks": None, "chain": None, "chord": None})
+        for serializer in ("json", "orjson"):
+            celery.conf.task_serializer = serializer
+            wire = len(build_redis_message(process_github_webhook_task, args, "default"))
+            content_type, encoding, data = dumps(task_body, serializer=serializer)
+            encode = _per_call_us(
+                lambda s=serializer, b=task_body: dumps(b, serializer=s), options.repeat
+            )
+            decode = _per_call_us(
+                lambda d=data, t=content_type, e=encoding: loads(d, t, e), options.repeat
+            )
+            print(
+                f"{label:>6} {serializer:>10} {len(raw):>9} {wire:>9} "
+                f"{encode:>10.1f} {decode:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,3 +3,72 @@ import os
 os.environ.setdefault("SESSION_SECRET", "test-secret-key")
 os.environ.setdefault("GITHUB_WEBHOOK_SECRET", "test-github-webhook-secret")
 os.environ.setdefault("STRIPE_WEBHOOK_SECRET", "test-stripe-webhook-secret")
+
+import json  # noqa: E402
+import uuid  # noqa: E402
+
+import pytest  # noqa: E402
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+# app 설정은 위 환경변수를 읽으므로 그 뒤에 import한다
+from app import event_batch  # noqa: E402
+from app.database import Base  # noqa: E402
+from app.models.customer import Customer  # noqa: E402
+
+# ─── 배치·스트림 워커 공용(SQLite + FK, 테넌트 한 명, DLQ 발행 mock) ──────────
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+
+    @event.listens_for(engine, "connect")
+    def enable_fk(dbapi_conn, _):
+        dbapi_conn.execute("PRAGMA foreign_keys=ON")
+
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def customer_id(session_factory):
+    customer_id = uuid.uuid4()
+    with session_factory() as db:
+        db.add(
+            Customer(
+                id=customer_id,
+                tenant_id="tenant-1",
+                name="Test",
+                webhook_secret="secret",
+                allowed_event_types=[],
+            )
+        )
+        db.commit()
+    return str(customer_id)
+
+
+@pytest.fixture
+def dead_letter(mocker):
+    return mocker.patch.object(event_batch, "dead_letter")
+
+
+@pytest.fixture
+def github_body():
+    return json.dumps(
+        {
+            "action": "opened",
+            "sender": {"login": "octocat"},
+            "repository": {"full_name": "octocat/hello"},
+        }
+    ).encode()
@@ -0,0 +1,138 @@
+"""콜드 보관 — 오래된 행을 고객·날짜별 압축 NDJSON 세그먼트로 옮기고 지운 뒤 재처리로 읽는다.
+
+- 세그먼트는 고객·수신 날짜·최대 행 수로 나뉘고, 목록 등록과 원본 삭제가 함께 커밋된다
+- 기준 시각 이후 행은 남는다. payload는 DB 텍스트 그대로 옮겨진다
+- 세그먼트 줄은 bulk_loader 입력 형식이라 그대로 되돌릴 수 있다
+- 재처리 조회는 목록으로 후보 세그먼트를 찾고, 파일이 없으면 건너뛴다
+"""
+
+import gzip
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app import archive
+from app.bulk_loader import read_ndjson
+from app.database import Base, _json_serializer
+from app.models.customer import Customer
+from app.models.webhook_event import WebhookEvent
+from app.models.webhook_event_archive import WebhookEventArchive
+
+NOW = datetime(2026, 10, 18, tzinfo=UTC)
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", json_serializer=_json_serializer)
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _seed(session_factory, customers: int = 2) -> list[uuid.UUID]:
+    ids = [uuid.uuid4() for _ in range(customers)]
+    with session_factory() as db:
+        for customer_id in ids:
+            db.add(
+                Customer(
+                    id=customer_id,
+                    tenant_id=str(customer_id),
+                    name="T",
+                    webhook_secret="s",
+                    allowed_event_types=[],
+                )
+            )
+            for days_ago in (40, 40, 39, 1):  # 두 날짜에 걸친 오래된 행 3건 + 최근 1건
+                db.add(
+                    WebhookEvent(
+                        customer_id=customer_id,
+                        source="github",
+                        event_id=uuid.uuid4().hex,
+                        payload={"action": "opened", "n": days_ago},
+                        status="PROCESSED",
+                        received_at=NOW - timedelta(days=days_ago),
+                    )
+                )
+        db.commit()
+    return ids
+
+
+def test_archive_moves_aged_rows_into_segments(session_factory, tmp_path):
+    customers = _seed(session_factory)
+
+    result = archive.archive_events(
+        NOW - timedelta(days=30), archive_dir=tmp_path, session_factory=session_factory
+    )
+
+    assert (result.segments, result.rows) == (4, 6)  # 고객 2 × 날짜 2
+    with session_factory() as db:
+        assert db.scalar(select(func.count()).select_from(WebhookEvent)) == 2
+        segments = db.scalars(select(WebhookEventArchive)).all()
+    assert {s.customer_id for s in segments} == set(customers)
+    assert sorted(s.row_count for s in segments) == [1, 1, 2, 2]
+    assert not list(tmp_path.rglob("*.tmp"))
+
+    first = next(s for s in segments if s.row_count == 2)
+    with gzip.open(tmp_path / first.path, "rb") as stream:
+        rows = list(read_ndjson(stream))
+    assert [row["id"] for row in rows] == list(range(first.first_event_id, first.last_event_id + 1))
+    assert rows[0]["payload"] == {"action": "opened", "n": 40}
+    assert rows[0]["customer_id"] == str(first.customer_id)
+
+
+def test_archive_splits_segments_at_row_limit(session_factory, tmp_path):
+    _seed(session_factory, customers=1)
+
+    result = archive.archive_events(
+        NOW - timedelta(days=30),
+        archive_dir=tmp_path,
+        segment_rows=1,
+        delete_batch_rows=1,
+        session_factory=session_factory,
+    )
+
+    assert (result.segments, result.rows) == (3, 3)
+    assert len(list(tmp_path.rglob(f"*{archive.SUFFIX}"))) == 3
+
+
+def test_find_event_reads_archived_row(session_factory, tmp_path):
+    customer_id = _seed(session_factory, customers=1)[0]
+    archive.archive_events(
+        NOW - timedelta(days=30), archive_dir=tmp_path, session_factory=session_factory
+    )
+
+    with session_factory() as db:
+        found = archive.find_event(db, customer_id=customer_id, event_id=3, archive_dir=tmp_path)
+        on_wrong_day = archive.find_event(
+            db,
+            customer_id=customer_id,
+            event_id=3,
+            received_on=(NOW - timedelta(days=40)).date(),
+            archive_dir=tmp_path,
+        )
+        other_customer = archive.find_event(
+            db, customer_id=uuid.uuid4(), event_id=3, archive_dir=tmp_path
+        )
+
+    assert found is not None
+    assert (found["id"], found["payload"]["n"]) == (3, 39)
+    assert on_wrong_day is None
+    assert other_customer is None
+
+
+def test_find_event_skips_missing_segment(session_factory, tmp_path):
+    customer_id = _seed(session_factory, customers=1)[0]
+    archive.archive_events(
+        NOW - timedelta(days=30), archive_dir=tmp_path, session_factory=session_factory
+    )
+    for path in tmp_path.rglob(f"*{archive.SUFFIX}"):
+        path.unlink()
+
+    with session_factory() as db:
+        assert (
+            archive.find_event(db, customer_id=customer_id, event_id=1, archive_dir=tmp_path)
+            is None
+        )
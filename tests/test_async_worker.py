@@ -0,0 +1,230 @@
+"""asyncio 워커 — 동시 처리 + 태스크와 같은 재시도/DLQ/acks-late 의미.
+
+- 여러 메시지를 한 루프에서 동시에 처리, 끝난 뒤에만 ack(소비 스레드가 정산)
+- autoretry 예외는 retries + 1과 backoff countdown으로 재발행, max_retries 초과·그 밖의 오류는 DLQ
+- 웹훅이 아닌 태스크(send_to_dlq)는 동기 본문을 스레드에서 실행
+- process_webhook_async는 ON CONFLICT 적재 후 커밋, 커밋 전 비일시적 오류만 FAILED 기록
+"""
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app import async_worker
+from app.async_worker import AsyncWorker
+from app.repositories.webhook_event_repository import WebhookEventRepository
+from app.services import webhook_handler
+from app.services.webhook_handler import (
+    process_github_webhook_task,
+    process_webhook_async,
+    send_to_dlq,
+)
+
+PAYLOAD = {
+    "action": "opened",
+    "sender": {"login": "octocat"},
+    "repository": {"full_name": "octocat/hello"},
+}
+
+
+def _message(args, task=process_github_webhook_task, retries=0):
+    message = MagicMock()
+    message.headers = {"task": task.name, "id": str(uuid.uuid4()), "retries": retries}
+    message.delivery_info = {"routing_key": "high_priority"}
+    message.decode.return_value = (args, {}, {})
+    return message
+
+
+@pytest.fixture
+def worker():
+    return AsyncWorker(MagicMock(), [], max_in_flight=8)
+
+
+@pytest.fixture
+def publish(mocker):
+    return mocker.patch.object(async_worker.task_publisher, "publish", AsyncMock())
+
+
+@pytest.fixture
+def dead_letter(mocker):
+    return mocker.patch.object(webhook_handler, "dead_letter")
+
+
+async def test_messages_run_concurrently_and_ack_after_completion(worker):
+    release = asyncio.Event()
+    running = []
+
+    async def handler(customer_id, raw_payload, event_id=None):
+        running.append(event_id)
+        await release.wait()
+
+    worker._handlers[process_github_webhook_task.name] = handler
+    messages = [_message(["cust-1", PAYLOAD, f"d-{i}"]) for i in range(3)]
+    for message in messages:
+        worker._start(message)
+    await asyncio.sleep(0)
+
+    assert running == ["d-0", "d-1", "d-2"]  # 셋 다 동시에 진행 중
+    assert len(worker._in_flight) == 3
+    worker._settle()
+    assert not any(m.ack.called for m in messages)  # acks-late
+
+    release.set()
+    await asyncio.wait(set(worker._in_flight))
+    worker._settle()
+    assert all(m.ack.called for m in messages)
+
+
+async def test_db_error_republishes_with_backoff(worker, publish):
+    worker._handlers[process_github_webhook_task.name] = AsyncMock(
+        side_effect=OperationalError("INSERT", {}, Exception("connection reset"))
+    )
+    message = _message(["cust-1", PAYLOAD, "d-1"], retries=1)
+
+    settle = await worker.handle(message)
+
+    assert settle is message.ack
+    options = publish.await_args.kwargs
+    assert publish.await_args.args == (process_github_webhook_task, ["cust-1", PAYLOAD, "d-1"])
+    assert options["retries"] == 2
+    assert options["task_id"] == message.headers["id"]
+    assert options["queue"] == "high_priority"
+    assert 0 <= options["countdown"] <= 2  # retry_backoff(full jitter) 2**1 이하
+
+
+async def test_exhausted_retries_go_to_dlq(worker, publish, dead_letter):
+    worker._handlers[process_github_webhook_task.name] = AsyncMock(
+        side_effect=OperationalError("INSERT", {}, Exception("connection reset"))
+    )
+    message = _message(["cust-1", PAYLOAD, "d-1"], retries=3)
+
+    settle = await worker.handle(message)
+
+    assert settle is message.ack
+    publish.assert_not_awaited()
+    dead_letter.assert_called_once()
+    assert dead_letter.call_args.args[:3] == (
+        process_github_webhook_task.name,
+        message.headers["id"],
+        "cust-1",
+    )
+
+
+async def test_non_retryable_error_goes_to_dlq_immediately(worker, publish, dead_letter):
+    worker._handlers[process_github_webhook_task.name] = AsyncMock(side_effect=ValueError("bad"))
+
+    message = _message(["cust-1", {}, "d-1"])
+
+    assert await worker.handle(message) is message.ack
+    publish.assert_not_awaited()
+    dead_letter.assert_called_once()
+
+
+async def test_failed_republish_requeues_original(worker, publish):
+    publish.side_effect = RuntimeError("broker down")
+    worker._handlers[process_github_webhook_task.name] = AsyncMock(
+        side_effect=OperationalError("INSERT", {}, Exception("connection reset"))
+    )
+    message = _message(["cust-1", PAYLOAD, "d-1"])
+
+    assert await worker.handle(message) is message.requeue
+
+
+async def test_other_tasks_run_sync_body_in_thread(worker, mocker):
+    run = mocker.patch.object(send_to_dlq, "run")
+    message = _message([{"task_id": "t-1"}], task=send_to_dlq)
+
+    assert await worker.handle(message) is message.ack
+    run.assert_called_once_with({"task_id": "t-1"})
+
+
+async def test_unknown_task_is_rejected(worker):
+    message = _message([])
+    message.headers["task"] = "tasks.unknown"
+
+    assert await worker.handle(message) is message.reject
+
+
+async def test_headerless_message_is_rejected_and_settled(worker):
+    message = _message([])
+    message.headers = {}
+
+    worker._start(message)
+    await asyncio.wait(set(worker._in_flight))
+    worker._settle()
+
+    assert not worker._in_flight
+    message.reject.assert_called_once_with()
+
+
+async def test_unexpected_handler_error_still_settles(worker, mocker):
+    mocker.patch.object(worker, "handle", AsyncMock(side_effect=RuntimeError("boom")))
+    message = _message([])
+
+    worker._start(message)
+    await asyncio.wait(set(worker._in_flight))
+    worker._settle()
+
+    assert not worker._in_flight
+    message.reject.assert_called_once_with()
+
+
+# ─── process_webhook_async ───────────────────────────────────────────────────
+
+
+@pytest.fixture
+def async_db(mocker):
+    db = MagicMock()
+    db.commit = AsyncMock()
+    db.rollback = AsyncMock()
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=db)
+    session.__aexit__ = AsyncMock(return_value=False)
+    mocker.patch.object(webhook_handler, "AsyncSessionLocal", return_value=session)
+    return db
+
+
+async def test_process_webhook_async_inserts_and_commits(async_db, mocker):
+    insert = mocker.patch.object(
+        WebhookEventRepository, "insert_ignore_duplicate_async", AsyncMock(return_value=None)
+    )
+
+    await process_webhook_async(
+        "github", "cust-1", b'{"action": "opened", "sender": {}, "repository": {}}', "d-1"
+    )
+
+    assert insert.await_args.kwargs["status"] == "PROCESSED"
+    assert insert.await_args.kwargs["event_id"] == "d-1"
+    async_db.commit.assert_awaited_once()
+    async_db.rollback.assert_not_awaited()  # 중복도 rollback 없이 정상 종료
+
+
+async def test_process_webhook_async_marks_failed_on_non_db_error(async_db, mocker):
+    insert = mocker.patch.object(
+        WebhookEventRepository, "insert_ignore_duplicate_async", AsyncMock(return_value=1)
+    )
+    async_db.commit.side_effect = [RuntimeError("boom"), None]
+
+    with pytest.raises(RuntimeError):
+        await process_webhook_async("github", "cust-1", PAYLOAD)
+
+    assert [c.kwargs["status"] for c in insert.await_args_list] == ["PROCESSED", "FAILED"]
+
+
+async def test_process_webhook_async_does_not_mark_failed_after_commit(async_db, mocker):
+    insert = mocker.patch.object(
+        WebhookEventRepository, "insert_ignore_duplicate_async", AsyncMock(return_value=1)
+    )
+    mocker.patch.object(webhook_handler.claim_check, "is_reference", return_value=True)
+    mocker.patch.object(webhook_handler.claim_check, "check_out", return_value=PAYLOAD)
+    mocker.patch.object(
+        webhook_handler.claim_check, "release", side_effect=OSError("blob store down")
+    )
+
+    with pytest.raises(OSError):
+        await process_webhook_async("github", "cust-1", "claim-check-ref")
+
+    assert [c.kwargs["status"] for c in insert.await_args_list] == ["PROCESSED"]
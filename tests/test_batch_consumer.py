@@ -0,0 +1,155 @@
+"""배치 워커 — multi-row INSERT ... ON CONFLICT 한 트랜잭션 + 메시지별 ack/재시도.
+
+- N건이 INSERT 문장 하나로 적재, 중복(배치 내·기존 행)은 건너뛰고 전부 ack
+- 검증 실패·헤더 누락 메시지만 DLQ(그래도 ack), 나머지는 적재
+- 데이터 오류(FK)는 행 단위로 다시 적재해 문제 행만 DLQ
+- 일시적 DB 오류는 retries + 1로 재발행, max_retries 초과 시 DLQ
+- 크기·시간 기준 flush
+"""
+
+import uuid
+from unittest.mock import MagicMock
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+from app import batch_consumer
+from app.batch_consumer import BatchConsumer
+from app.models.webhook_event import WebhookEvent
+from app.services.webhook_handler import process_github_webhook_task
+
+
+class _FakeMessage:
+    def __init__(self, args, retries=0, task=process_github_webhook_task):
+        self.headers = {"task": task.name, "id": str(uuid.uuid4()), "retries": retries}
+        self.delivery_info = {"routing_key": "high_priority"}
+        self._args = args
+        self.acked = False
+
+    def decode(self):
+        return self._args, {}, {"callbacks": None}
+
+    def ack(self):
+        self.acked = True
+
+
+def _consumer(session_factory, **kwargs):
+    return BatchConsumer(MagicMock(), [], session_factory=session_factory, **kwargs)
+
+
+def _rows(session_factory):
+    with session_factory() as db:
+        return db.query(WebhookEvent).order_by(WebhookEvent.id).all()
+
+
+def test_batch_is_one_insert_and_skips_duplicates(
+    engine, session_factory, customer_id, github_body
+):
+    inserts = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_inserts(conn, cursor, statement, *args):
+        if statement.startswith("INSERT INTO webhook_events"):
+            inserts.append(statement)
+
+    consumer = _consumer(session_factory)
+    consumer.handle_batch([_FakeMessage([customer_id, github_body, "d-0"])])
+    messages = [
+        _FakeMessage([customer_id, github_body, "d-0"]),  # 기존 행과 중복
+        _FakeMessage([customer_id, github_body, "d-1"]),
+        _FakeMessage([customer_id, github_body, "d-1"]),  # 배치 내 중복
+        _FakeMessage([customer_id, github_body, None, "f" * 32]),
+    ]
+
+    consumer.handle_batch(messages)
+
+    assert len(inserts) == 2  # 배치마다 문장 하나
+    rows = _rows(session_factory)
+    assert [(r.event_id, r.fingerprint) for r in rows] == [
+        ("d-0", None),
+        ("d-1", None),
+        (None, "f" * 32),
+    ]
+    assert {r.status for r in rows} == {"PROCESSED"}
+    assert rows[0].payload["sender"] == {"login": "octocat"}
+    assert all(m.acked for m in messages)
+
+
+def test_invalid_payload_is_dead_lettered_alone(
+    session_factory, customer_id, dead_letter, github_body
+):
+    bad = _FakeMessage([customer_id, b'{"action": "opened"}', "d-bad"])  # sender 누락
+    good = _FakeMessage([customer_id, github_body, "d-good"])
+
+    _consumer(session_factory).handle_batch([bad, good])
+
+    assert [r.event_id for r in _rows(session_factory)] == ["d-good"]
+    dead_letter.assert_called_once()
+    assert bad.acked and good.acked
+
+
+def test_message_without_task_headers_is_dead_lettered(
+    session_factory, customer_id, dead_letter, github_body
+):
+    headless = _FakeMessage([customer_id, github_body, "d-headless"])
+    headless.headers = {}
+    good = _FakeMessage([customer_id, github_body, "d-good"])
+
+    _consumer(session_factory).handle_batch([headless, good])
+
+    assert [r.event_id for r in _rows(session_factory)] == ["d-good"]
+    assert dead_letter.call_args.args[:2] == ("Unknown", "Unknown")
+    assert headless.acked and good.acked
+
+
+def test_data_error_falls_back_to_per_row_insert(
+    session_factory, customer_id, dead_letter, github_body
+):
+    orphan = _FakeMessage([str(uuid.uuid4()), github_body, "d-orphan"])  # FK 위반
+    good = _FakeMessage([customer_id, github_body, "d-good"])
+
+    _consumer(session_factory).handle_batch([orphan, good])
+
+    assert [r.event_id for r in _rows(session_factory)] == ["d-good"]
+    assert dead_letter.call_args.args[1] == orphan.headers["id"]
+    assert orphan.acked and good.acked
+
+
+def test_transient_error_republishes_with_incremented_retries(
+    session_factory, customer_id, dead_letter, github_body, mocker
+):
+    mocker.patch.object(
+        batch_consumer.WebhookEventRepository,
+        "bulk_insert_ignore_duplicates",
+        side_effect=OperationalError("INSERT", {}, Exception("connection reset")),
+    )
+    apply_async = mocker.patch.object(process_github_webhook_task, "apply_async")
+    fresh = _FakeMessage([customer_id, github_body, "d-1"])
+    exhausted = _FakeMessage([customer_id, github_body, "d-2"], retries=3)
+
+    _consumer(session_factory).handle_batch([fresh, exhausted])
+
+    apply_async.assert_called_once()
+    kwargs = apply_async.call_args.kwargs
+    assert kwargs["args"] == [customer_id, github_body, "d-1"]
+    assert kwargs["retries"] == 1
+    assert kwargs["task_id"] == fresh.headers["id"]
+    assert kwargs["queue"] == "high_priority"
+    assert dead_letter.call_args.args[1] == exhausted.headers["id"]
+    assert fresh.acked and exhausted.acked
+
+
+def test_flushes_on_size_or_delay(session_factory, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(batch_consumer.time, "monotonic", lambda: now[0])
+    consumer = _consumer(session_factory, batch_size=2, max_delay=0.05)
+
+    consumer._on_message(None, _FakeMessage([]))
+    assert not consumer._due()
+    now[0] += 0.06
+    assert consumer._due()  # 첫 메시지 후 max_delay 경과
+
+    consumer._buffer.clear()
+    consumer._on_message(None, _FakeMessage([]))
+    consumer._on_message(None, _FakeMessage([]))
+    assert consumer._due()  # 크기 도달
@@ -0,0 +1,114 @@
+"""COPY 대량 적재 — 스트림 인코딩, 스테이징 병합 순서, 청크 커밋.
+
+COPY는 PostgreSQL 전용이라 DB 왕복은 가짜 연결로 확인한다.
+"""
+
+import csv
+import io
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app import bulk_loader
+from app.bulk_loader import load_events, read_ndjson
+from app.repositories.webhook_event_repository import WebhookEventRepository, _CsvRows
+
+CUSTOMER = uuid.UUID(int=1)
+
+
+def _row(i, **extra):
+    return {
+        "customer_id": CUSTOMER,
+        "source": "github",
+        "event_id": f"d-{i}",
+        "payload": {"action": "opened", "note": 'comma, "quote"'},
+        **extra,
+    }
+
+
+def test_csv_stream_encodes_rows_lazily_with_nulls():
+    rows = [_row(1, status="PROCESSED"), _row(2, event_id=None, fingerprint="f" * 32)]
+    stream = _CsvRows(rows)
+
+    chunks = []
+    while chunk := stream.read(16):  # COPY가 작은 버퍼로 나눠 읽어도 같은 결과
+        chunks.append(chunk)
+
+    parsed = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+    assert parsed[0][:4] == [str(CUSTOMER), "github", "d-1", ""]
+    assert parsed[0][4] == '{"action":"opened","note":"comma, \\"quote\\""}'
+    assert parsed[0][5:] == ["PROCESSED", ""]
+    assert parsed[1][2:4] == ["", "f" * 32]  # 따옴표 없는 빈 칸 = NULL
+    assert parsed[1][5] == "PENDING"
+    assert stream.count == 2
+
+
+class _DriverError(Exception):
+    pass
+
+
+# 드라이버(psycopg2) 예외처럼 클래스 이름으로 SQLAlchemy 예외에 매핑된다
+_DriverIntegrityError = type("IntegrityError", (_DriverError,), {})
+
+
+def _fake_session(copy_error=None):
+    db = MagicMock()
+    conn = db.connection.return_value
+    conn.dialect.dbapi.Error = _DriverError
+    conn.exec_driver_sql.return_value.rowcount = 2
+    cursor = conn.connection.dbapi_connection.cursor.return_value
+    copied = []
+
+    def copy_expert(sql, stream):
+        copied.append(stream.read())
+        if copy_error is not None:
+            raise copy_error
+
+    cursor.copy_expert.side_effect = copy_expert
+    return db, conn, copied
+
+
+def test_copy_stages_then_merges_ignoring_conflicts():
+    db, conn, copied = _fake_session()
+
+    inserted = WebhookEventRepository.copy_insert_ignore_duplicates(db, [_row(1), _row(2)])
+
+    assert inserted == 2
+    statements = [c.args[0] for c in conn.exec_driver_sql.call_args_list]
+    assert "CREATE TEMP TABLE IF NOT EXISTS webhook_events_staging" in statements[0]
+    assert statements[1] == "TRUNCATE webhook_events_staging"
+    assert "ON CONFLICT DO NOTHING" in statements[2]
+    assert copied[0].count(b"\n") == 2
+
+
+def test_copy_driver_error_becomes_sqlalchemy_error():
+    """COPY는 드라이버 커서로 직접 실행 — 오류를 SQLAlchemy 예외로 바꿔 재시도 분류에 태운다."""
+    db, _, _ = _fake_session(copy_error=_DriverIntegrityError("fk violation"))
+
+    with pytest.raises(IntegrityError):
+        WebhookEventRepository.copy_insert_ignore_duplicates(db, [_row(1)])
+
+
+def test_load_events_commits_per_chunk_and_reports_rate(mocker):
+    copy = mocker.patch.object(
+        bulk_loader.WebhookEventRepository,
+        "copy_insert_ignore_duplicates",
+        side_effect=lambda db, chunk: len(chunk) - 1,
+    )
+    db = MagicMock()
+    db.__enter__.return_value = db
+
+    result = load_events((_row(i) for i in range(5)), chunk_rows=2, session_factory=lambda: db)
+
+    assert [len(c.args[1]) for c in copy.call_args_list] == [2, 2, 1]
+    assert db.commit.call_count == 3
+    assert (result.rows, result.inserted, result.duplicates) == (5, 2, 3)
+    assert result.rows_per_second > 0
+
+
+def test_read_ndjson_skips_blank_lines():
+    stream = io.BytesIO(b'{"source": "github"}\n\n{"source": "stripe"}\n')
+
+    assert [r["source"] for r in read_ndjson(stream)] == ["github", "stripe"]
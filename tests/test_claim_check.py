@@ -0,0 +1,77 @@
+"""claim-check — 큰 본문은 블롭 저장소에, 브로커에는 참조만.
+
+- 임계값 미만(또는 0)은 본문 그대로, 이상은 `claim-check:<키>:<sha256>` 참조
+- 워커는 참조를 다이제스트 검증 후 읽고, 커밋 뒤 블롭을 지운다
+- 블롭이 사라졌으면 ClaimCheckMissing, 내용이 다르면 ValueError
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app import claim_check
+from app.claim_check import ClaimCheckMissing, FileBlobStore
+from app.config import settings
+from app.services.webhook_handler import load_payload, process_github_webhook_task
+
+_INSERT = "app.services.webhook_handler.WebhookEventRepository.insert_ignore_duplicate"
+
+BODY = json.dumps(
+    {
+        "action": "opened",
+        "sender": {"login": "octocat"},
+        "repository": {"full_name": "octocat/hello"},
+    }
+).encode()
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = FileBlobStore(tmp_path)
+    monkeypatch.setattr(claim_check, "_blob_store", store)
+    monkeypatch.setattr(settings, "claim_check_threshold_bytes", 16)
+    return store
+
+
+async def test_small_body_is_passed_through(store, monkeypatch):
+    assert await claim_check.check_in(b"{}") == b"{}"
+
+    monkeypatch.setattr(settings, "claim_check_threshold_bytes", 0)  # 비활성
+    assert await claim_check.check_in(BODY) == BODY
+
+
+async def test_large_body_round_trips_through_store(store):
+    reference = await claim_check.check_in(BODY)
+
+    assert claim_check.is_reference(reference)
+    assert claim_check.check_out(reference) == BODY
+    assert load_payload(reference.encode())["action"] == "opened"  # 스트림은 바이트로 넘긴다
+
+    claim_check.release(reference)
+    with pytest.raises(ClaimCheckMissing):
+        claim_check.check_out(reference)
+
+
+async def test_tampered_blob_fails_digest_check(store):
+    reference = await claim_check.check_in(BODY)
+    key, _ = claim_check._parse(reference)
+    store.put(key, BODY.replace(b"opened", b"closed"))
+
+    with pytest.raises(ValueError, match="digest"):
+        claim_check.check_out(reference)
+
+
+async def test_task_reads_reference_and_releases_after_commit(store):
+    reference = await claim_check.check_in(BODY)
+    db = MagicMock()
+
+    with (
+        patch("app.services.webhook_handler.SessionLocal", return_value=db),
+        patch(_INSERT, return_value=1) as insert,
+    ):
+        process_github_webhook_task.run("cust-1", reference)
+
+    assert insert.call_args.kwargs["payload"]["action"] == "opened"
+    db.commit.assert_called_once()
+    assert store.get(claim_check._parse(reference)[0]) is None
@@ -0,0 +1,71 @@
+"""compact 멱등 저장소 — 시간 버킷 해시 + 8바이트 다이제스트.
+
+- 버킷 키(해시 태그로 테넌트 슬롯 고정)와 소스별 보존 기간
+- 예약·해제는 보존 창의 버킷 전부를 한 번의 EVALSHA로
+- 설정으로 저장 방식 선택
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+from app import idempotency
+from app.idempotency import (
+    CompactIdempotencyStore,
+    IdempotencyKey,
+    IdempotencyStore,
+    create_idempotency_store,
+)
+
+NOW = 1_700_000_000  # 버킷 472222
+KEY = IdempotencyKey("tenant-1", "stripe", "evt_123")
+
+
+def _redis(result=1):
+    redis = MagicMock()
+    redis.evalsha = AsyncMock(return_value=result)
+    return redis
+
+
+def test_buckets_cover_retention_per_source():
+    store = CompactIdempotencyStore(_redis(), retention_hours={"stripe": 72}, now=lambda: NOW)
+
+    stripe_buckets, expire_at = store._buckets(KEY)
+    github_buckets, _ = store._buckets(IdempotencyKey("tenant-1", "github", "d-1"))
+
+    assert stripe_buckets[0] == "webhook:idem:{tenant-1}:stripe:472222"
+    assert len(stripe_buckets) == 73 and stripe_buckets[-1].endswith(":472150")
+    assert len(github_buckets) == 25  # 기본 24h
+    assert expire_at == (472222 + 1 + 72) * 3600
+
+
+async def test_reserve_checks_all_buckets_in_one_script_call():
+    redis = _redis(result=0)
+    store = CompactIdempotencyStore(redis, now=lambda: NOW)
+
+    assert await store.reserve(KEY) is False
+
+    redis.evalsha.assert_awaited_once()
+    args = redis.evalsha.await_args.args
+    assert args[1] == 25
+    assert args[2:27] == tuple(f"webhook:idem:{{tenant-1}}:stripe:{472222 - i}" for i in range(25))
+    assert args[27] == CompactIdempotencyStore.digest("evt_123")
+    assert len(args[27]) == 8
+
+
+async def test_release_deletes_digest_from_window():
+    redis = _redis(result=0)
+    store = CompactIdempotencyStore(redis, now=lambda: NOW)
+
+    await store.release(KEY)
+
+    args = redis.evalsha.await_args.args
+    assert args[-1] == CompactIdempotencyStore.digest("evt_123")
+
+
+def test_store_is_selected_by_setting(monkeypatch):
+    redis = MagicMock()
+    assert type(create_idempotency_store(redis)) is IdempotencyStore
+
+    monkeypatch.setattr(idempotency.settings, "idempotency_store", "compact")
+    store = create_idempotency_store(redis)
+    assert isinstance(store, CompactIdempotencyStore)
+    assert store.single_key is False
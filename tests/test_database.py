@@ -0,0 +1,96 @@
+"""DB 엔진 수명주기 — prefork 자식 풀 교체, 유휴 기준 ping, 서버측 PREPARE 단건 적재.
+
+- worker_process_init: 물려받은 풀은 close=False로 버리고 자식 크기 풀로 SessionLocal 재바인딩
+- 최근 반납된 연결은 체크아웃 ping 생략, 오래된 연결만 ping(실패 시 DisconnectionError)
+- DB_PREPARED_STATEMENTS면 연결마다 PREPARE, 단건 적재는 EXECUTE로
+"""
+
+import time
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import DisconnectionError
+
+from app import database
+from app.config import settings
+from app.repositories.webhook_event_repository import WebhookEventRepository
+
+
+def test_worker_process_gets_its_own_pool(monkeypatch):
+    inherited = MagicMock()
+    fresh = create_engine("sqlite://")
+    factory = MagicMock(return_value=fresh)
+    monkeypatch.setattr(database, "engine", inherited)
+    monkeypatch.setattr(database, "create_sync_engine", factory)
+    original_bind = database.SessionLocal.kw["bind"]
+
+    try:
+        database.init_worker_process()
+
+        inherited.dispose.assert_called_once_with(close=False)  # 부모 소켓은 닫지 않음
+        factory.assert_called_once_with(
+            settings.worker_db_pool_size, settings.worker_db_max_overflow
+        )
+        assert database.SessionLocal.kw["bind"] is fresh
+    finally:
+        database.SessionLocal.configure(bind=original_bind)
+        fresh.dispose()
+
+
+def _record(idle):
+    return SimpleNamespace(info={"last_used": time.monotonic() - idle})
+
+
+def test_recently_used_connection_skips_ping(monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_pre_ping_idle_seconds", 30.0)
+    dbapi_connection = MagicMock()
+
+    database._ping_if_idle(dbapi_connection, _record(idle=1), None)
+
+    dbapi_connection.cursor.assert_not_called()
+
+
+def test_idle_connection_is_pinged_and_dead_one_discarded(monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_pre_ping_idle_seconds", 30.0)
+    alive = MagicMock()
+    database._ping_if_idle(alive, _record(idle=60), None)
+    alive.cursor.return_value.execute.assert_called_once_with("SELECT 1")
+
+    dead = MagicMock()
+    dead.cursor.return_value.execute.side_effect = OSError("server closed the connection")
+    with pytest.raises(DisconnectionError):
+        database._ping_if_idle(dead, _record(idle=60), None)
+
+
+def test_new_connection_prepares_registered_statements(monkeypatch):
+    monkeypatch.setattr(settings, "db_prepared_statements", True)
+    dbapi_connection = MagicMock()
+    record = SimpleNamespace(info={})
+
+    database._prepare_statements(dbapi_connection, record)
+
+    executed = [c.args[0] for c in dbapi_connection.cursor.return_value.execute.call_args_list]
+    assert any("PREPARE webhook_events_insert_ignore" in sql for sql in executed)
+    dbapi_connection.commit.assert_called_once()
+    assert "webhook_events_insert_ignore" in record.info["prepared_statements"]
+
+
+def test_insert_uses_prepared_statement_when_available():
+    db = MagicMock()
+    conn = db.connection.return_value
+    conn.connection.info = {"prepared_statements": {"webhook_events_insert_ignore"}}
+    conn.exec_driver_sql.return_value.scalar_one_or_none.return_value = 7
+    customer_id = uuid.uuid4()
+
+    event_pk = WebhookEventRepository.insert_ignore_duplicate(
+        db, customer_id=customer_id, source="github", payload={"a": 1}, event_id="d-1"
+    )
+
+    assert event_pk == 7
+    sql, params = conn.exec_driver_sql.call_args.args
+    assert sql.startswith("EXECUTE webhook_events_insert_ignore")
+    assert params == (str(customer_id), "github", '{"a":1}', "d-1", None, "PENDING")
+    db.execute.assert_not_called()
@@ -4,7 +4,7 @@
 확인한다. 아래 테스트는 async 세션이 await로 호출됨을 단언한다.
 """
 
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 from fastapi.testclient import TestClient
 
@@ -38,3 +38,20 @@ def test_health_unavailable_on_db_error():
         assert res.status_code == 503
     finally:
         app.main.app.dependency_overrides.clear()
+
+
+def test_health_unavailable_when_spool_drainer_stopped():
+    """fast-ack 스풀 드레이너 태스크가 끝났으면 DB가 정상이어도 503."""
+    db = AsyncMock()
+    stopped = MagicMock()
+    stopped.done.return_value = True
+    app.main.app.dependency_overrides[app.database.get_async_db] = lambda: db
+    app.main.app.state.spool_drainer = stopped
+    try:
+        client = TestClient(app.main.app, raise_server_exceptions=False)
+        res = client.get("/health")
+        assert res.status_code == 503
+        db.execute.assert_not_awaited()
+    finally:
+        app.main.app.state.spool_drainer = None
+        app.main.app.dependency_overrides.clear()
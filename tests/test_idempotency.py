@@ -3,7 +3,10 @@
 - 큐잉 실패 시 예약한 Redis 멱등키를 해제해 공급자 재시도가 드롭되지 않음
 - 멱등키에 tenant_id 포함(L4)
 - webhook_events (customer_id, source, event_id) 고유제약이 중복행을 차단
-- 태스크는 고유제약 위반(IntegrityError)을 DLQ가 아니라 정상 중복으로 흡수
+- 태스크는 ON CONFLICT DO NOTHING RETURNING으로 중복을 판정(rollback·DLQ 없음)
+- 큐잉이 확정된 키는 로컬 중복 필터가 Redis 왕복 없이 중복 판정
+- 공급자 ID가 없으면 본문 지문으로 같은 예약·고유제약을 탄다(FINGERPRINT_DEDUP_ENABLED)
+- 스트림 전송(INGEST_TRANSPORT=streams)이면 같은 예약 뒤 Celery 발행 대신 XADD
 """
 
 import hashlib
@@ -20,12 +23,17 @@ from sqlalchemy.orm import sessionmaker
 
 import app.database
 import app.main
+from app import idempotency
+from app.config import settings
 from app.database import Base
 from app.dependencies import get_redis
+from app.idempotency import IdempotencyKey, RecentEnqueues
 from app.models.customer import Customer  # noqa: F401 — Base 등록 필수
 from app.models.webhook_event import WebhookEvent
+from app.publisher import PublisherOverloaded
 from app.repositories.webhook_event_repository import WebhookEventRepository
 from app.services.webhook_handler import process_github_webhook_task
+from app.streams import StreamPublisher
 
 TEST_SECRET = "test-webhook-secret-0123456789abcdef"  # noqa: S105 (테스트 전용 더미)
 
@@ -97,6 +105,42 @@ def test_idempotency_key_released_on_queue_failure(queue_failure_client):
     redis_mock.delete.assert_awaited_once_with(expected_key)
 
 
+def test_idempotency_key_released_when_publisher_overloaded(mocker):
+    """발행 핸드오프 큐 포화 → 503 + 예약한 멱등키 해제."""
+    customer = MagicMock(spec=Customer)
+    customer.id = "mock_customer_id"
+    customer.is_active = True
+    customer.webhook_secret = TEST_SECRET
+    redis_mock = MagicMock()
+    redis_mock.set = AsyncMock(return_value=True)
+    redis_mock.delete = AsyncMock(return_value=1)
+    app.main.app.dependency_overrides[get_redis] = lambda: redis_mock
+    app.main.app.dependency_overrides[app.database.get_async_db] = lambda: _FakeAsyncDB(customer)
+    mocker.patch("app.main.get_task", return_value=MagicMock())
+    mocker.patch.object(
+        app.main.task_publisher, "publish", AsyncMock(side_effect=PublisherOverloaded())
+    )
+    body = json.dumps({"action": "opened"}).encode("utf-8")
+
+    try:
+        response = TestClient(app.main.app).post(
+            "/webhooks/some-tenant/github",
+            content=body,
+            headers={
+                "content-type": "application/json",
+                "X-Hub-Signature-256": _github_signature(body),
+                "X-GitHub-Delivery": "delivery-busy",
+            },
+        )
+    finally:
+        app.main.app.dependency_overrides.clear()
+
+    assert response.status_code == 503
+    redis_mock.delete.assert_awaited_once_with(
+        "webhook:idempotency:some-tenant:github:delivery-busy"
+    )
+
+
 # ─── DB 고유제약 (AC-M1 backstop) ────────────────────────────────────────────
 
 
@@ -160,6 +204,17 @@ def test_null_event_id_does_not_conflict(db):
     assert count == 2
 
 
+def test_duplicate_fingerprint_violates_unique_constraint(db):
+    """event_id 없는 동일 본문 — (customer_id, source, fingerprint)가 중복행을 차단."""
+    customer = _make_customer(db)
+    for _ in range(2):
+        WebhookEventRepository.create(
+            db, customer_id=customer.id, source="github", payload={}, fingerprint="f" * 32
+        )
+    with pytest.raises(IntegrityError):
+        db.commit()
+
+
 def test_event_id_persisted(db):
     """엔드포인트에서 추출한 event_id가 적재된다."""
     customer = _make_customer(db)
@@ -172,22 +227,161 @@ def test_event_id_persisted(db):
     assert evt.event_id == "evt-42"
 
 
-# ─── 태스크: 고유제약 위반은 DLQ가 아니라 정상 중복으로 흡수 ─────────────────
+# ─── 태스크: 고유제약 충돌은 DLQ가 아니라 정상 중복 ─────────────────────────
 
 
-def test_task_swallows_integrity_error_as_duplicate():
-    """commit이 IntegrityError를 내면 태스크는 재시도/DLQ 없이 rollback 후 종료."""
+def test_task_treats_conflict_as_duplicate_without_rollback():
+    """ON CONFLICT DO NOTHING이 행을 돌려주지 않으면 중복 — 예외·rollback 없이 종료."""
     mock_db = MagicMock()
-    mock_db.commit.side_effect = IntegrityError("dup", None, Exception())
     payload = {
         "action": "opened",
         "sender": {"login": "octocat"},
         "repository": {"full_name": "octocat/hello"},
     }
 
-    with patch("app.services.webhook_handler.SessionLocal", return_value=mock_db):
+    with (
+        patch("app.services.webhook_handler.SessionLocal", return_value=mock_db),
+        patch.object(WebhookEventRepository, "insert_ignore_duplicate", return_value=None),
+    ):
         # 예외가 전파되지 않아야 함 (autoretry/DLQ 미발동)
         process_github_webhook_task.run("cust-1", payload, "evt-dup")
 
-    mock_db.rollback.assert_called_once()
+    mock_db.rollback.assert_not_called()
+    mock_db.commit.assert_called_once()
     mock_db.close.assert_called_once()
+
+
+def test_insert_ignore_duplicate_returns_id_then_none(db):
+    """한 번의 INSERT ... ON CONFLICT DO NOTHING RETURNING id로 적재와 중복 판정."""
+    customer = _make_customer(db)
+    kwargs = {"customer_id": customer.id, "source": "github", "payload": {}, "event_id": "evt-1"}
+
+    first = WebhookEventRepository.insert_ignore_duplicate(db, **kwargs)
+    second = WebhookEventRepository.insert_ignore_duplicate(db, **kwargs)
+    db.commit()
+
+    assert isinstance(first, int)
+    assert second is None
+    assert db.get(WebhookEvent, first).status == "PENDING"
+
+
+# ─── 로컬 중복 필터 (RecentEnqueues) ─────────────────────────────────────────
+
+
+def test_recent_enqueues_expire_and_evict(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(idempotency.time, "monotonic", lambda: now[0])
+    recent = RecentEnqueues(max_size=2, ttl=60)
+    a, b, c = (IdempotencyKey("t", "github", e) for e in ("a", "b", "c"))
+    recent.add(a)
+    recent.add(b)
+    recent.add(c)  # 가장 오래된 a 축출
+
+    assert not recent.seen(a)
+    assert recent.seen(b)
+    now[0] += 61
+    assert not recent.seen(c)
+
+
+@pytest.fixture
+def filtered_client(mocker):
+    customer = MagicMock(spec=Customer)
+    customer.id = "mock_customer_id"
+    customer.is_active = True
+    customer.webhook_secret = TEST_SECRET
+    redis_mock = MagicMock()
+    redis_mock.set = AsyncMock(return_value=True)
+    redis_mock.delete = AsyncMock(return_value=1)
+    app.main.app.dependency_overrides[get_redis] = lambda: redis_mock
+    app.main.app.dependency_overrides[app.database.get_async_db] = lambda: _FakeAsyncDB(customer)
+    app.main.app.state.recent_enqueues = RecentEnqueues(max_size=100, ttl=60)
+    task = MagicMock()
+    mocker.patch("app.main.get_task", return_value=task)
+
+    yield TestClient(app.main.app, raise_server_exceptions=False), redis_mock, task
+
+    del app.main.app.state.recent_enqueues
+    app.main.app.dependency_overrides.clear()
+
+
+def _post_delivery(test_client, delivery_id):
+    body = json.dumps({"action": "opened"}).encode("utf-8")
+    return test_client.post(
+        "/webhooks/some-tenant/github",
+        content=body,
+        headers={
+            "content-type": "application/json",
+            "X-Hub-Signature-256": _github_signature(body),
+            "X-GitHub-Delivery": delivery_id,
+        },
+    )
+
+
+def test_repeat_of_enqueued_event_skips_redis(filtered_client):
+    """큐잉이 확정된 이벤트의 재전송은 로컬에서 중복 판정 — SET NX 왕복 없음."""
+    test_client, redis_mock, task = filtered_client
+
+    assert _post_delivery(test_client, "d-hot").status_code == 202
+    response = _post_delivery(test_client, "d-hot")
+
+    assert response.json() == {"message": "Webhook already processed."}
+    redis_mock.set.assert_awaited_once()
+    task.apply_async.assert_called_once()
+
+
+def test_failed_enqueue_is_not_remembered(filtered_client):
+    """발행 실패로 해제된 키는 로컬 필터에 남지 않아 공급자 재시도가 Redis로 간다."""
+    test_client, redis_mock, task = filtered_client
+    task.apply_async.side_effect = [RuntimeError("broker down"), None]
+
+    assert _post_delivery(test_client, "d-retry").status_code == 500
+    assert _post_delivery(test_client, "d-retry").status_code == 202
+    assert redis_mock.set.await_count == 2
+
+
+# ─── 본문 지문 중복 제거 (event_id 없음) ────────────────────────────────────
+
+
+def test_body_without_delivery_id_is_reserved_by_fingerprint(filtered_client, monkeypatch):
+    """X-GitHub-Delivery가 없어도 같은 본문은 같은 `fp:` 키로 예약, 지문은 태스크로 전달."""
+    test_client, redis_mock, task = filtered_client
+    monkeypatch.setattr(settings, "fingerprint_dedup_enabled", True)
+    body = json.dumps({"action": "opened"}).encode("utf-8")
+    fingerprint = hashlib.blake2b(body, digest_size=16).hexdigest()
+
+    for _ in range(2):
+        response = test_client.post(
+            "/webhooks/some-tenant/github",
+            content=body,
+            headers={
+                "content-type": "application/json",
+                "X-Hub-Signature-256": _github_signature(body),
+            },
+        )
+
+    assert response.json() == {"message": "Webhook already processed."}
+    key = str(IdempotencyKey("some-tenant", "github", f"fp:{fingerprint}"))
+    assert redis_mock.set.await_args.args[0] == key
+    args = task.apply_async.call_args.kwargs["args"]
+    assert args == ["mock_customer_id", body, None, fingerprint]
+    task.apply_async.assert_called_once()
+
+
+def test_stream_transport_xadds_instead_of_celery_publish(filtered_client):
+    test_client, redis_mock, task = filtered_client
+    stream_redis = MagicMock()
+    stream_redis.xadd = AsyncMock()
+    app.main.app.state.stream_publisher = StreamPublisher(stream_redis, max_len=100)
+    try:
+        assert _post_delivery(test_client, "d-stream").status_code == 202
+        duplicate = _post_delivery(test_client, "d-stream")
+    finally:
+        del app.main.app.state.stream_publisher
+
+    assert duplicate.json() == {"message": "Webhook already processed."}
+    task.apply_async.assert_not_called()
+    stream_redis.xadd.assert_awaited_once()
+    stream, fields = stream_redis.xadd.await_args.args
+    assert stream == "webhooks:high_priority"
+    assert fields["event_id"] == "d-stream"
+    assert fields["raw_payload"] == json.dumps({"action": "opened"}).encode("utf-8")
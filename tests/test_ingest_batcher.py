@@ -0,0 +1,227 @@
+"""마이크로 배치 큐잉 — 멱등 예약·발행 파이프라인과 요청별 결과.
+
+- 창 안의 요청은 예약 1회·발행 1회 파이프라인으로 처리
+- 중복(이미 예약된 키)은 발행하지 않고 False
+- 발행 실패 항목만 멱등키 해제 후 그 요청에만 예외 전파
+- 수신 게이트가 이미 예약한 키는 다시 예약하지 않고 실패 시 해제만
+- 큰 본문은 예약된 항목만 블롭 저장소에(중복은 쓰지 않음), 발행 실패 시 블롭도 삭제
+- 직접 만든 메시지가 Celery 워커가 읽는 프로토콜 v2 형식
+- Redis 브로커가 아니거나 키 접두사·우선순위 리스트를 쓰는 설정이면 켜지 않는다
+"""
+
+import asyncio
+import base64
+import json
+
+import pytest
+from celery import Celery
+from kombu.serialization import loads
+
+from app import claim_check
+from app.claim_check import FileBlobStore
+from app.config import settings
+from app.idempotency import IdempotencyKey, IdempotencyStore
+from app.ingest_batcher import IngestBatcher, build_redis_message, unsupported_broker
+from app.services.webhook_handler import process_github_webhook_task
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, key, value, ex=None, nx=False):
+        self.commands.append(("set", key))
+
+    def delete(self, key):
+        self.commands.append(("delete", key))
+
+    def lpush(self, queue, message):
+        self.commands.append(("lpush", queue, message))
+
+    async def execute(self, raise_on_error=True):
+        self.redis.executions.append(self.commands)
+        return [self.redis.apply(command) for command in self.commands]
+
+
+class _FakeRedis:
+    """파이프라인 실행 단위를 기록하는 최소 Redis."""
+
+    def __init__(self, fail_lpush_for=()):
+        self.keys = set()
+        self.lists = {}
+        self.executions = []
+        self.fail_lpush_for = fail_lpush_for
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def apply(self, command):
+        if command[0] == "set":
+            if command[1] in self.keys:
+                return None
+            self.keys.add(command[1])
+            return True
+        if command[0] == "delete":
+            self.keys.discard(command[1])
+            return 1
+        _, queue, message = command
+        if any(marker in message for marker in self.fail_lpush_for):
+            return ConnectionError("broker down")
+        self.lists.setdefault(queue, []).append(message)
+        return len(self.lists[queue])
+
+
+def _batcher(redis, broker, **kwargs):
+    return IngestBatcher(IdempotencyStore(redis), broker, max_delay=0.001, **kwargs)
+
+
+def _submit(batcher, event_id):
+    key = IdempotencyKey("tenant-1", "github", event_id) if event_id else None
+    return batcher.submit(
+        key, process_github_webhook_task, ["cust-1", event_id.encode(), event_id], "high_priority"
+    )
+
+
+async def test_concurrent_requests_share_one_round_trip_per_phase():
+    redis, broker = _FakeRedis(), _FakeRedis()
+    batcher = _batcher(redis, broker)
+
+    results = await asyncio.gather(*(_submit(batcher, f"evt-{i}") for i in range(5)))
+
+    assert results == [True] * 5
+    assert len(redis.executions) == 1 and len(redis.executions[0]) == 5
+    assert len(broker.executions) == 1
+    assert len(broker.lists["high_priority"]) == 5
+
+
+async def test_duplicate_is_not_published():
+    redis, broker = _FakeRedis(), _FakeRedis()
+    redis.keys.add("webhook:idempotency:tenant-1:github:evt-dup")
+    batcher = _batcher(redis, broker)
+
+    results = await asyncio.gather(_submit(batcher, "evt-dup"), _submit(batcher, "evt-new"))
+
+    assert results == [False, True]
+    assert len(broker.lists["high_priority"]) == 1
+
+
+async def test_failed_publish_releases_only_its_key():
+    redis, broker = _FakeRedis(), _FakeRedis(fail_lpush_for=[b"evt-bad"])
+    batcher = _batcher(redis, broker)
+
+    results = await asyncio.gather(
+        _submit(batcher, "evt-bad"), _submit(batcher, "evt-ok"), return_exceptions=True
+    )
+
+    assert isinstance(results[0], ConnectionError)
+    assert results[1] is True
+    assert redis.keys == {"webhook:idempotency:tenant-1:github:evt-ok"}
+
+
+async def test_key_reserved_by_the_gate_is_only_released_on_failure():
+    redis, broker = _FakeRedis(), _FakeRedis(fail_lpush_for=[b"evt-bad"])
+    redis.keys.add("webhook:idempotency:tenant-1:github:evt-bad")
+    batcher = _batcher(redis, broker)
+    key = IdempotencyKey("tenant-1", "github", "evt-bad")
+
+    with pytest.raises(ConnectionError):
+        await batcher.submit(
+            key, process_github_webhook_task, ["cust-1", b"evt-bad"], "high_priority", reserve=False
+        )
+
+    assert [c[0] for c in redis.executions[0]] == ["delete"]  # SET NX 없이 해제만
+    assert redis.keys == set()
+
+
+async def test_large_bodies_are_checked_in_only_after_reservation(tmp_path, monkeypatch):
+    monkeypatch.setattr(claim_check, "_blob_store", FileBlobStore(tmp_path))
+    monkeypatch.setattr(settings, "claim_check_threshold_bytes", 1)
+    redis, broker = _FakeRedis(), _FakeRedis(fail_lpush_for=[b"evt-bad"])
+    redis.keys.add("webhook:idempotency:tenant-1:github:evt-dup")
+    batcher = _batcher(redis, broker)
+
+    results = await asyncio.gather(
+        _submit(batcher, "evt-dup"),
+        _submit(batcher, "evt-bad"),
+        _submit(batcher, "evt-ok"),
+        return_exceptions=True,
+    )
+
+    assert results[0] is False and isinstance(results[1], ConnectionError) and results[2] is True
+    # 중복은 쓰지 않고, 발행 실패한 블롭은 지워 큐잉된 항목의 블롭만 남는다
+    [queued] = broker.lists["high_priority"]
+    [blob] = [p for p in tmp_path.rglob("*") if p.is_file()]
+    assert blob.name.encode() in queued
+
+
+async def test_full_batch_flushes_without_waiting_for_the_window():
+    redis, broker = _FakeRedis(), _FakeRedis()
+    batcher = IngestBatcher(IdempotencyStore(redis), broker, max_size=2, max_delay=60)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(_submit(batcher, "evt-1"), _submit(batcher, "evt-2")), timeout=1
+    )
+
+    assert results == [True, True]
+
+
+def test_message_is_celery_protocol_v2():
+    args = ["cust-1", b'{"action":"opened"}', "evt-1"]
+
+    envelope = json.loads(build_redis_message(process_github_webhook_task, args, "high_priority"))
+
+    assert envelope["headers"]["task"] == process_github_webhook_task.name
+    assert envelope["headers"]["id"] == envelope["properties"]["correlation_id"]
+    assert envelope["properties"]["delivery_info"]["routing_key"] == "high_priority"
+    body = base64.b64decode(envelope["body"])
+    decoded_args, kwargs, _embed = loads(
+        body, envelope["content-type"], envelope["content-encoding"]
+    )
+    assert decoded_args == args
+    assert kwargs == {}
+
+
+@pytest.mark.parametrize(
+    ("broker", "options", "requirement"),
+    [
+        ("redis://localhost:6379/0", {}, None),
+        ("rediss://localhost:6380/0", {"visibility_timeout": 3600}, None),
+        ("amqp://guest@localhost//", {}, "a Redis broker"),
+        (
+            "redis://localhost:6379/0",
+            {"global_keyprefix": "webhooks:"},
+            "broker_transport_options without global_keyprefix",
+        ),
+        (
+            "redis://localhost:6379/0",
+            {"priority_steps": list(range(10))},
+            "broker_transport_options without priority_steps",
+        ),
+    ],
+)
+def test_unsupported_broker(broker, options, requirement, monkeypatch):
+    # Celery는 CELERY_BROKER_URL 환경 변수를 설정값보다 먼저 본다
+    monkeypatch.setenv("CELERY_BROKER_URL", broker)
+    app = Celery(set_as_current=False)
+    app.conf.broker_transport_options = options
+
+    assert unsupported_broker(app) == requirement
+
+
+def test_batching_falls_back_when_broker_is_unsupported(monkeypatch):
+    import app.main
+
+    monkeypatch.setattr(app.main.settings, "ingest_batching_enabled", True)
+    monkeypatch.setattr(app.main.settings, "ingest_transport", "celery")
+    monkeypatch.setitem(
+        app.main.celery.conf, "broker_transport_options", {"global_keyprefix": "webhooks:"}
+    )
+
+    assert app.main._create_ingest_batcher(_FakeRedis()) is None
@@ -0,0 +1,185 @@
+"""Lua 수신 게이트 — 검증 뒤 공유 리밋 + 멱등 예약을 EVALSHA 한 번으로.
+
+- 키·인자 구성과 판정 코드 매핑, NOSCRIPT 시 재로드 후 재시도, 클러스터에서는 끔
+- 엔드포인트: 리밋 초과 429(Retry-After), 중복은 큐잉 없이 응답, 통과 시 별도 SET NX 없음
+- 검증 전에는 slowapi(프로세스 메모리)가 막는다 — 위조 요청은 게이트·예약에 닿지 않는다
+"""
+
+import hashlib
+import hmac
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+from redis.exceptions import NoScriptError
+
+import app.database
+import app.main
+from app.config import settings
+from app.dependencies import get_redis
+from app.idempotency import IdempotencyKey
+from app.ingest_gate import GateResult, IngestGate, Verdict, unsupported_redis
+from app.models.customer import Customer
+
+TEST_SECRET = "test-webhook-secret-0123456789abcdef"  # noqa: S105 (테스트 전용 더미)
+
+
+def _redis(*evalsha_results):
+    redis = MagicMock()
+    redis.script_load = AsyncMock(return_value="sha-1")
+    redis.evalsha = AsyncMock(side_effect=list(evalsha_results))
+    return redis
+
+
+async def test_gate_sends_rate_limit_and_idempotency_keys_in_one_call():
+    redis = _redis([0, 0])
+    gate = IngestGate(redis, limit=120)
+    await gate.load()
+
+    result = await gate.check("tenant-1", IdempotencyKey("tenant-1", "github", "d-1"))
+
+    assert result == GateResult(Verdict.ACCEPTED)
+    redis.evalsha.assert_awaited_once_with(
+        "sha-1",
+        2,
+        "webhook:ratelimit:tenant-1",
+        "webhook:idempotency:tenant-1:github:d-1",
+        "120",
+        "60",
+        "86400",
+        "1",
+    )
+
+
+async def test_gate_reports_retry_after_when_rate_limited():
+    gate = IngestGate(_redis([2, 17]), limit=1)
+
+    result = await gate.check("tenant-1", None)
+
+    assert result == GateResult(Verdict.RATE_LIMITED, retry_after=17)
+
+
+async def test_gate_reloads_script_after_noscript():
+    redis = _redis(NoScriptError("NOSCRIPT"), [1, 0])
+    gate = IngestGate(redis, limit=120)
+    await gate.load()
+
+    result = await gate.check("tenant-1", IdempotencyKey("tenant-1", "stripe", "evt-1"))
+
+    assert result.verdict is Verdict.DUPLICATE
+    assert redis.script_load.await_count == 2
+
+
+@pytest.mark.parametrize(("cluster_enabled", "expected"), [(0, None), (1, "a non-cluster Redis")])
+async def test_gate_refuses_redis_cluster(cluster_enabled, expected, monkeypatch):
+    redis = MagicMock()
+    redis.info = AsyncMock(return_value={"cluster_enabled": cluster_enabled})
+    redis.script_load = AsyncMock(return_value="sha-1")
+    monkeypatch.setattr(settings, "ingest_lua_gate_enabled", True)
+
+    assert await unsupported_redis(redis) == expected
+    gate = await app.main._create_ingest_gate(redis)
+    assert (gate is None) is (expected is not None)
+
+
+# ─── 엔드포인트 연동 ─────────────────────────────────────────────────────────
+
+
+class _FakeAsyncDB:
+    def __init__(self, customer):
+        self.customer = customer
+
+    async def execute(self, *args, **kwargs):
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = self.customer
+        return result
+
+
+@pytest.fixture
+def gated_client(mocker):
+    customer = MagicMock(spec=Customer)
+    customer.id = "mock_customer_id"
+    customer.is_active = True
+    customer.webhook_secret = TEST_SECRET
+    redis_mock = MagicMock()
+    redis_mock.set = AsyncMock(return_value=True)
+    gate = SimpleNamespace(limit=120, check=AsyncMock())
+    app.main.app.dependency_overrides[get_redis] = lambda: redis_mock
+    app.main.app.dependency_overrides[app.database.get_async_db] = lambda: _FakeAsyncDB(customer)
+    app.main.app.state.ingest_gate = gate
+    mock_task = MagicMock()
+    mocker.patch("app.main.get_task", return_value=mock_task)
+
+    yield TestClient(app.main.app), gate, redis_mock, mock_task
+
+    del app.main.app.state.ingest_gate
+    app.main.app.dependency_overrides.clear()
+
+
+def _post(test_client):
+    body = json.dumps({"action": "opened"}).encode("utf-8")
+    digest = hmac.new(TEST_SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return test_client.post(
+        "/webhooks/some-tenant/github",
+        content=body,
+        headers={
+            "content-type": "application/json",
+            "X-Hub-Signature-256": f"sha256={digest}",
+            "X-GitHub-Delivery": "d-1",
+        },
+    )
+
+
+def test_accepted_request_is_reserved_by_the_gate(gated_client):
+    test_client, gate, redis_mock, mock_task = gated_client
+    gate.check.return_value = GateResult(Verdict.ACCEPTED)
+
+    response = _post(test_client)
+
+    assert response.status_code == 202
+    gate.check.assert_awaited_once_with(
+        "some-tenant", IdempotencyKey("some-tenant", "github", "d-1")
+    )
+    redis_mock.set.assert_not_called()  # 예약은 게이트 스크립트가 이미 했다
+    mock_task.apply_async.assert_called_once()
+
+
+def test_duplicate_is_not_queued(gated_client):
+    test_client, gate, redis_mock, mock_task = gated_client
+    gate.check.return_value = GateResult(Verdict.DUPLICATE)
+
+    response = _post(test_client)
+
+    assert response.json() == {"message": "Webhook already processed."}
+    mock_task.apply_async.assert_not_called()
+
+
+def test_rate_limited_request_gets_429_with_retry_after(gated_client):
+    test_client, gate, redis_mock, mock_task = gated_client
+    gate.check.return_value = GateResult(Verdict.RATE_LIMITED, retry_after=42)
+
+    response = _post(test_client)
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "42"
+    redis_mock.set.assert_not_called()
+    mock_task.apply_async.assert_not_called()
+
+
+def test_forged_requests_never_reach_the_gate_and_hit_slowapi(gated_client):
+    test_client, gate, _, mock_task = gated_client
+    statuses = [
+        test_client.post(
+            "/webhooks/forged-tenant/github",
+            content=b"{}",
+            headers={"content-type": "application/json", "X-Hub-Signature-256": "sha256=forged"},
+        ).status_code
+        for _ in range(settings.webhook_rate_limit_per_minute + 1)
+    ]
+
+    assert set(statuses[:-1]) == {401}
+    assert statuses[-1] == 429  # 검증 전 프로세스 메모리 리밋
+    gate.check.assert_not_awaited()
+    mock_task.apply_async.assert_not_called()
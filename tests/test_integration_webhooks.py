@@ -2,6 +2,7 @@ import hashlib
 import hmac
 import json
 import time
+from datetime import date
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -171,6 +172,63 @@ def test_receive_github_webhook_valid_signature(client):
     )
 
 
+def test_receive_webhook_forwards_raw_body(client):
+    """수신 바디를 재직렬화하지 않고 원본 바이트 그대로 태스크에 넘긴다."""
+    test_client, mock_task = client
+    body = b'{"action": "opened",  "sender": {"login": "octocat"}}'
+
+    response = test_client.post(
+        "/webhooks/some-tenant/github",
+        content=body,
+        headers={
+            "content-type": "application/json",
+            "X-Hub-Signature-256": _github_signature(body),
+            "X-GitHub-Delivery": "d-raw",
+        },
+    )
+
+    assert response.status_code == 202
+    assert mock_task.apply_async.call_args.kwargs["args"] == ["mock_customer_id", body, "d-raw"]
+
+
+def test_receive_webhook_rejects_non_object_json(client):
+    """JSON 객체가 아닌 바디 → 422 (FastAPI dict 바디 검증과 동일)."""
+    test_client, mock_task = client
+    body = b"[1, 2, 3]"
+
+    response = test_client.post(
+        "/webhooks/some-tenant/github",
+        content=body,
+        headers={
+            "content-type": "application/json",
+            "X-Hub-Signature-256": _github_signature(body),
+        },
+    )
+
+    assert response.status_code == 422
+    assert response.json()["error"]["details"][0]["type"] == "dict_type"
+    mock_task.apply_async.assert_not_called()
+
+
+def test_receive_webhook_rejects_malformed_large_body(client, monkeypatch):
+    """지연 추출 임계값 이상이어도 수신은 전체 파싱 — 깨진 JSON은 큐잉 전에 422."""
+    monkeypatch.setattr(app.main.settings, "lazy_json_threshold_bytes", 16)
+    test_client, mock_task = client
+    body = b'{"commits": [1,2,,,], "zz": }'
+
+    response = test_client.post(
+        "/webhooks/some-tenant/github",
+        content=body,
+        headers={
+            "content-type": "application/json",
+            "X-Hub-Signature-256": _github_signature(body),
+        },
+    )
+
+    assert response.status_code == 422
+    mock_task.apply_async.assert_not_called()
+
+
 def test_receive_github_webhook_invalid_signature(client):
     """위조된 서명 값 → 401 (실제 hmac.compare_digest 불일치)."""
     test_client, mock_task = client
@@ -199,6 +257,28 @@ def test_receive_github_webhook_invalid_signature(client):
     assert REGISTRY.get_sample_value(_ERRORS_METRIC, labels=error_labels) == initial_error_total + 1
 
 
+@pytest.mark.parametrize(
+    ("source", "header", "value"),
+    [
+        ("github", "X-Hub-Signature-256", b"sha256=" + b"\xe9" * 64),
+        ("stripe", "Stripe-Signature", f"t={int(time.time())},v1=".encode() + b"\xe9" * 64),
+    ],
+)
+def test_non_ascii_signature_header_is_401(client, source, header, value):
+    """비ASCII 서명 헤더(latin-1 디코드) → 500이 아니라 401."""
+    test_client, mock_task = client
+    body = json.dumps({"id": "evt_1", "action": "opened"}).encode("utf-8")
+
+    response = test_client.post(
+        f"/webhooks/some-tenant/{source}",
+        content=body,
+        headers={"content-type": "application/json", header: value},
+    )
+
+    assert response.status_code == 401
+    mock_task.apply_async.assert_not_called()
+
+
 def test_receive_github_webhook_tampered_body(client):
     """유효 서명을 만든 뒤 body를 변조 → 401 (서명은 원본 바이트에만 유효)."""
     test_client, mock_task = client
@@ -276,11 +356,11 @@ def test_receive_webhook_inactive_tenant(client, async_db, active_customer):
     assert REGISTRY.get_sample_value(_ERRORS_METRIC, labels=error_labels) == initial_error_total + 1
 
 
-# ─── Stripe 실 서명 검증 (construct_event, 300s 허용오차 유지) ────────────────
+# ─── Stripe 실 서명 검증 (내장 verify_stripe_signature, 300s 허용오차 유지) ──────
 
 
 def test_receive_stripe_webhook_valid_signature(client):
-    """유효한 Stripe 서명 → 202 (실제 construct_event 실행)."""
+    """유효한 Stripe 서명 → 202 (실제 verify_stripe_signature 실행)."""
     test_client, mock_task = client
     tenant_id = "some-tenant"
     payload = {"id": "evt_test_1", "type": "customer.created"}
@@ -342,6 +422,142 @@ def test_receive_stripe_webhook_missing_signature(client):
     mock_task.apply_async.assert_not_called()
 
 
+# ─── 스트리밍 수신 (증분 HMAC + 조기 크기 거부) ───────────────────────────────
+
+
+@pytest.fixture
+def streaming(monkeypatch):
+    monkeypatch.setattr(app.main.settings, "ingest_streaming_enabled", True)
+    monkeypatch.setattr(
+        app.main.settings, "webhook_max_body_bytes", {"github": 1024, "stripe": 1024}
+    )
+
+
+def test_streaming_valid_github_signature(client, streaming):
+    """스트리밍 모드에서도 유효 서명 → 202, 원본 바이트 전달."""
+    test_client, mock_task = client
+    body = json.dumps({"action": "opened"}).encode("utf-8")
+
+    response = test_client.post(
+        "/webhooks/some-tenant/github",
+        content=body,
+        headers={
+            "content-type": "application/json",
+            "X-Hub-Signature-256": _github_signature(body),
+            "X-GitHub-Delivery": "d-stream",
+        },
+    )
+
+    assert response.status_code == 202
+    assert mock_task.apply_async.call_args.kwargs["args"][1] == body
+
+
+def test_streaming_chunked_body_verified_incrementally(client, streaming):
+    """Content-Length 없는 chunked 본문도 청크 단위 HMAC으로 검증된다."""
+    test_client, mock_task = client
+    body = json.dumps({"action": "opened", "pad": "x" * 200}).encode("utf-8")
+    chunks = [body[i : i + 50] for i in range(0, len(body), 50)]
+
+    response = test_client.post(
+        "/webhooks/some-tenant/github",
+        content=iter(chunks),
+        headers={
+            "content-type": "application/json",
+            "X-Hub-Signature-256": _github_signature(body),
+            "X-GitHub-Delivery": "d-chunked",
+        },
+    )
+
+    assert response.status_code == 202
+    assert mock_task.apply_async.call_args.kwargs["args"][1] == body
+
+
+def test_streaming_rejects_declared_oversize_body(client, streaming):
+    """Content-Length가 소스별 상한 초과 → 413 (본문 읽기 전)."""
+    test_client, mock_task = client
+    body = json.dumps({"pad": "x" * 2048}).encode("utf-8")
+
+    response = test_client.post(
+        "/webhooks/some-tenant/github",
+        content=body,
+        headers={
+            "content-type": "application/json",
+            "X-Hub-Signature-256": _github_signature(body),
+        },
+    )
+
+    assert response.status_code == 413
+    mock_task.apply_async.assert_not_called()
+
+
+def test_streaming_rejects_oversize_chunked_body(client, streaming):
+    """Content-Length 없이 상한을 넘기는 chunked 본문 → 413."""
+    test_client, mock_task = client
+    body = json.dumps({"pad": "x" * 2048}).encode("utf-8")
+
+    response = test_client.post(
+        "/webhooks/some-tenant/github",
+        content=iter([body[:1000], body[1000:]]),
+        headers={
+            "content-type": "application/json",
+            "X-Hub-Signature-256": _github_signature(body),
+        },
+    )
+
+    assert response.status_code == 413
+    mock_task.apply_async.assert_not_called()
+
+
+def test_streaming_rejects_unsigned_request(client, streaming):
+    """서명 헤더 부재 → 400 (본문 크기와 무관하게 먼저 거부)."""
+    test_client, mock_task = client
+
+    response = test_client.post(
+        "/webhooks/some-tenant/github",
+        content=b"x" * 4096,
+        headers={"content-type": "application/json"},
+    )
+
+    assert response.status_code == 400
+    mock_task.apply_async.assert_not_called()
+
+
+def test_streaming_rejects_stale_stripe_timestamp(client, streaming):
+    """허용오차 밖 Stripe 타임스탬프 → 401 (헤더 단계에서 거부)."""
+    test_client, mock_task = client
+    body = json.dumps({"id": "evt_old", "type": "customer.created"}).encode("utf-8")
+
+    response = test_client.post(
+        "/webhooks/some-tenant/stripe",
+        content=body,
+        headers={
+            "content-type": "application/json",
+            "stripe-signature": _stripe_signature(body, timestamp=int(time.time()) - 3600),
+        },
+    )
+
+    assert response.status_code == 401
+    mock_task.apply_async.assert_not_called()
+
+
+def test_streaming_signed_non_json_is_422(client, streaming):
+    """서명은 유효하지만 JSON 객체가 아닌 본문 → 검증 뒤 파싱에서 422."""
+    test_client, mock_task = client
+    body = b"not-json"
+
+    response = test_client.post(
+        "/webhooks/some-tenant/github",
+        content=body,
+        headers={
+            "content-type": "application/json",
+            "X-Hub-Signature-256": _github_signature(body),
+        },
+    )
+
+    assert response.status_code == 422
+    mock_task.apply_async.assert_not_called()
+
+
 # ─── 멱등성 (실 서명을 붙여 verify 통과 후 Redis NX 분기 검증) ─────────────────
 
 
@@ -478,6 +694,54 @@ def test_replay_event_event_not_found_for_tenant(client, db_session_mock, mocker
     assert "Event not found for this tenant" in response.text
 
 
+def test_replay_event_falls_back_to_archive(client, db_session_mock, mocker):
+    """Tests that an event no longer in the DB is replayed from its archive segment."""
+    test_client, mock_task = client
+    mock_customer = MagicMock(spec=Customer)
+    mock_customer.id = "mock_customer_id"
+    mock_customer.is_active = True
+    mocker.patch("app.main.WebhookVerifier._get_customer", return_value=mock_customer)
+    exec_result = MagicMock()
+    exec_result.scalar_one_or_none.return_value = None
+    db_session_mock.execute.return_value = exec_result
+    find_event = mocker.patch(
+        "app.main.archive.find_event",
+        return_value={"id": 7, "source": "github", "payload": {"key": "value"}},
+    )
+
+    response = test_client.post("/webhooks/some-tenant/events/7/replay?received_on=2026-01-02")
+
+    assert response.status_code == 202
+    assert find_event.call_args.kwargs["received_on"] == date(2026, 1, 2)
+    mock_task.delay.assert_called_once_with("mock_customer_id", {"key": "value"})
+
+
+def test_search_events_by_payload_path(client, mocker):
+    """Tests that admins can find a tenant's events by a provider object in the payload."""
+    test_client, _ = client
+    mock_customer = MagicMock(spec=Customer)
+    mock_customer.id = "mock_customer_id"
+    mock_customer.is_active = True
+    mocker.patch("app.main.WebhookVerifier._get_customer", return_value=mock_customer)
+    event = MagicMock(spec=WebhookEvent)
+    event.id, event.source, event.event_id = 7, "stripe", "evt_1"
+    event.status, event.received_at = "PROCESSED", "2026-10-18T00:00:00+00:00"
+    find = mocker.patch(
+        "app.main.WebhookEventRepository.find_by_payload_path", return_value=[event]
+    )
+
+    response = test_client.get(
+        "/webhooks/some-tenant/events", params={"path": "stripe_object_id", "value": "in_1"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()[0]["id"] == 7
+    assert find.call_args.kwargs["path"] == "stripe_object_id"
+    assert find.call_args.kwargs["customer_id"] == "mock_customer_id"
+    bad = test_client.get("/webhooks/some-tenant/events", params={"path": "amount", "value": "1"})
+    assert bad.status_code == 422
+
+
 def test_replay_event_data_isolation(client, db_session_mock, mocker):
     """Tests that events from other tenants return 404 (data isolation)."""
     test_client, _ = client
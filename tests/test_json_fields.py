@@ -0,0 +1,146 @@
+"""대형 본문 지연 추출 — 필요한 최상위 키만 디코드, 나머지는 건너뜀.
+
+- 결과는 orjson 전체 파싱과 같다(문자열 안 괄호·이스케이프, 이스케이프된 키 포함)
+- 너무 깊은 중첩은 전체 파싱으로 대체, 최상위가 객체가 아니면 ValueError
+- 필요한 키가 큰 값 뒤에 있거나 없으면 건너뛰기 예산을 넘는 즉시 전체 파싱으로 대체
+- 워커는 필드만 검증하고 원본 바이트를 Fragment로 적재(dict를 만들지 않음)
+- 그 바이트를 DB가 거부(DataError)하면 재시도 없이 DLQ — 일반 경로의 DataError는 그대로 재시도
+"""
+
+import uuid
+from unittest.mock import MagicMock, patch
+
+import orjson
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import create_engine, select
+from sqlalchemy.exc import DataError
+from sqlalchemy.orm import sessionmaker
+
+from app import json_fields
+from app.config import settings
+from app.database import Base, _json_serializer
+from app.models.webhook_event import WebhookEvent
+from app.services.webhook_handler import (
+    MalformedPayloadError,
+    process_github_webhook_task,
+    read_payload,
+)
+
+_INSERT = "app.services.webhook_handler.WebhookEventRepository.insert_ignore_duplicate"
+
+PUSH = {
+    "ref": "refs/heads/main",
+    "commits": [
+        {"id": f"{i:040x}", "message": 'fix {brace} [bracket] "quote" \\ slash', "n": -1.5e3}
+        for i in range(50)
+    ],
+    "action": None,
+    "sender": {"login": "octocat"},
+    "repository": {"full_name": "octocat/hello", "owner": {"a": [[[{}]]], "b": True}},
+}
+
+
+@pytest.mark.parametrize(
+    "keys",
+    [("action", "sender", "repository"), ("ref", "commits"), ("missing",), ()],
+)
+def test_extract_matches_full_parse(keys):
+    body = orjson.dumps(PUSH, option=orjson.OPT_INDENT_2)
+
+    assert json_fields.extract(body, keys) == {k: PUSH[k] for k in keys if k in PUSH}
+
+
+def test_extract_handles_escaped_keys_and_deep_nesting():
+    assert json_fields.extract(b'{"\\u0069d": "evt_1", "b": [1]}', ("id",)) == {"id": "evt_1"}
+    deep = b'{"a": ' + b"[" * 40 + b"]" * 40 + b', "id": "evt_2"}'  # _MAX_DEPTH 초과
+    assert json_fields.extract(deep, ("id",)) == {"id": "evt_2"}
+    assert json_fields.extract(b" { } ", ("id",)) == {}
+
+
+@pytest.mark.parametrize("body", [b"[]", b'"x"', b"", b'{"id": }'])
+def test_extract_rejects_non_object(body):
+    with pytest.raises(ValueError):
+        json_fields.extract(body, ("id",))
+
+
+def test_extract_falls_back_when_keys_sit_behind_the_bulk(mocker):
+    # GitHub push: action이 없어 commits 전체를 건너뛰어야 한다 — 예산을 넘으면 전체 파싱
+    parsed = mocker.spy(json_fields, "_extract_parsed")
+    push = {"repository": PUSH["repository"], "sender": PUSH["sender"], **PUSH}
+    push.pop("action")
+    keys = ("action", "sender", "repository")
+
+    assert json_fields.extract(orjson.dumps(push), keys) == {k: push[k] for k in keys[1:]}
+    parsed.assert_called_once()
+
+    # Stripe: 필요한 키가 앞에 있으면 큰 data는 보지 않는다
+    parsed.reset_mock()
+    stripe = orjson.dumps({"id": "evt_1", "type": "invoice.paid", "data": {"object": PUSH}})
+    assert json_fields.extract(stripe, ("id", "type")) == {"id": "evt_1", "type": "invoice.paid"}
+    parsed.assert_not_called()
+
+
+def test_worker_stores_original_bytes_above_threshold(monkeypatch):
+    monkeypatch.setattr(settings, "lazy_json_threshold_bytes", 16)
+    body = orjson.dumps(PUSH)
+
+    payload, fields = read_payload("github", body)
+    assert isinstance(payload, orjson.Fragment)
+    assert fields["sender"] == {"login": "octocat"}
+    with pytest.raises(ValidationError):
+        read_payload("github", orjson.dumps({"sender": {}, "commits": []}))
+
+    with (
+        patch("app.services.webhook_handler.SessionLocal", return_value=MagicMock()),
+        patch(_INSERT, return_value=1) as insert,
+    ):
+        process_github_webhook_task.run("cust-1", body)
+    assert isinstance(insert.call_args.kwargs["payload"], orjson.Fragment)
+
+
+def test_malformed_body_above_threshold_is_dead_lettered_without_retry(monkeypatch):
+    monkeypatch.setattr(settings, "lazy_json_threshold_bytes", 16)
+    # 수신을 거치지 않은 본문(재처리 등) — 앞쪽 키는 멀쩡하고 보지 않은 뒷부분이 깨졌다
+    front = {k: PUSH[k] for k in ("action", "sender", "repository")}
+    body = orjson.dumps({**front, **PUSH}).replace(b'"n":-1500.0', b'"n":nope', 1)
+    rejected = DataError("INSERT", {}, Exception("invalid input syntax for type json"))
+
+    with (
+        patch("app.services.webhook_handler.SessionLocal", return_value=MagicMock()),
+        patch(_INSERT, side_effect=[rejected, None]) as insert,
+        pytest.raises(MalformedPayloadError),
+    ):
+        process_github_webhook_task.run("cust-1", body)
+
+    assert [c.kwargs["status"] for c in insert.call_args_list] == ["PROCESSED", "FAILED"]
+    assert insert.call_args.kwargs["payload"] is None
+    assert not issubclass(MalformedPayloadError, tuple(process_github_webhook_task.autoretry_for))
+
+
+def test_data_error_below_threshold_is_still_retried():
+    rejected = DataError("INSERT", {}, Exception("value too long"))
+
+    with (
+        patch("app.services.webhook_handler.SessionLocal", return_value=MagicMock()),
+        patch(_INSERT, side_effect=rejected) as insert,
+        pytest.raises(DataError),
+    ):
+        process_github_webhook_task.run("cust-1", orjson.dumps(PUSH))
+    insert.assert_called_once()
+
+
+def test_fragment_payload_round_trips_through_json_column():
+    engine = create_engine("sqlite://", json_serializer=_json_serializer)
+    Base.metadata.create_all(engine, tables=[WebhookEvent.__table__])
+    with sessionmaker(bind=engine)() as db:
+        db.execute(
+            WebhookEvent.__table__.insert().values(
+                customer_id=uuid.uuid4(),
+                source="github",
+                payload=orjson.Fragment(orjson.dumps(PUSH)),
+                status="PROCESSED",
+            )
+        )
+        assert db.scalar(select(WebhookEvent.payload)) == PUSH
+    engine.dispose()
@@ -0,0 +1,135 @@
+"""webhook_events 범위 파티션 관리 — 기간 계산, 미리 만들기, 만료 분리, 원장 파티션 정리.
+
+- 파티션 이름이 곧 경계다(월 단위 12월 → 다음 해 1월 넘김 포함)
+- 없는 파티션만 만들고, 만료 파티션은 CONCURRENTLY(중단된 분리는 FINALIZE)로 떼어 낸다
+- 비 PostgreSQL(테스트 SQLite)에서는 유지보수 태스크가 아무것도 하지 않는다
+"""
+
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app import partitions
+from app.celery_worker import celery
+
+
+def _conn(existing: dict[str, bool] | None = None) -> MagicMock:
+    conn = MagicMock()
+
+    def execute(statement, params):
+        assert statement is partitions._LIST_PARTITIONS
+        return [
+            MagicMock(relname=name, inhdetachpending=pending)
+            for name, pending in (existing or {}).items()
+            if name.startswith(f"{params['parent']}_p")
+        ]
+
+    conn.execute.side_effect = execute
+    return conn
+
+
+def _executed(conn: MagicMock) -> list[str]:
+    return [call.args[0] for call in conn.exec_driver_sql.call_args_list]
+
+
+@pytest.mark.parametrize(
+    ("interval", "at", "start", "end", "name"),
+    [
+        ("month", "2026-12-31T23:59", "2026-12-01", "2027-01-01", "webhook_events_p2026_12"),
+        ("month", "2026-02-10T00:00", "2026-02-01", "2026-03-01", "webhook_events_p2026_02"),
+        ("day", "2026-10-18T15:00", "2026-10-18", "2026-10-19", "webhook_events_p2026_10_18"),
+    ],
+)
+def test_period_math(interval, at, start, end, name):
+    moment = datetime.fromisoformat(at).replace(tzinfo=UTC)
+    lower = partitions.period_start(moment, interval)
+
+    assert lower == datetime.fromisoformat(start).replace(tzinfo=UTC)
+    assert partitions.partition_name(lower, interval) == name
+    assert partitions.partition_bounds(name) == (
+        lower,
+        datetime.fromisoformat(end).replace(tzinfo=UTC),
+    )
+
+
+def test_partition_bounds_ignores_foreign_names():
+    assert partitions.partition_bounds("webhook_events_archive") is None
+    assert partitions.partition_bounds("webhook_event_keys_p2026_10") is None
+    assert partitions.partition_bounds("webhook_event_keys_p2026_10", partitions.KEYS_PARENT) == (
+        datetime(2026, 10, 1, tzinfo=UTC),
+        datetime(2026, 11, 1, tzinfo=UTC),
+    )
+
+
+def test_ensure_partitions_creates_only_missing():
+    conn = _conn({"webhook_events_p2026_10": False})
+    now = datetime(2026, 10, 18, tzinfo=UTC)
+
+    created = partitions.ensure_partitions(conn, now, "month", ahead=2)
+
+    assert created == ["webhook_events_p2026_11", "webhook_events_p2026_12"]
+    assert _executed(conn)[-1] == (
+        "CREATE TABLE IF NOT EXISTS webhook_events_p2026_12 PARTITION OF webhook_events "
+        "FOR VALUES FROM ('2026-12-01T00:00:00+00:00') TO ('2027-01-01T00:00:00+00:00')"
+    )
+
+
+def test_expire_partitions_detaches_and_drops_expired():
+    conn = _conn(
+        {
+            "webhook_events_p2026_07": True,  # 중단된 분리
+            "webhook_events_p2026_08": False,
+            "webhook_events_p2026_09": False,  # 상한 10-01 > cutoff
+            "webhook_events_archive": False,
+        }
+    )
+
+    expired = partitions.expire_partitions(conn, datetime(2026, 9, 15, tzinfo=UTC), "drop")
+
+    assert expired == ["webhook_events_p2026_07", "webhook_events_p2026_08"]
+    assert _executed(conn) == [
+        "ALTER TABLE webhook_events DETACH PARTITION webhook_events_p2026_07 FINALIZE",
+        "DROP TABLE webhook_events_p2026_07",
+        "ALTER TABLE webhook_events DETACH PARTITION webhook_events_p2026_08 CONCURRENTLY",
+        "DROP TABLE webhook_events_p2026_08",
+    ]
+
+
+def test_expire_dedup_keys_keeps_previous_and_current_month():
+    conn = _conn(
+        {
+            "webhook_event_keys_p2026_08": False,
+            "webhook_event_keys_p2026_09": False,  # 앞 달 — 달 경계를 넘긴 재전송 판정
+            "webhook_event_keys_p2026_10": False,
+            "webhook_events_p2026_08": False,  # 이벤트 파티션은 보존 설정 몫
+        }
+    )
+
+    expired = partitions.expire_dedup_keys(conn, datetime(2026, 10, 18, tzinfo=UTC))
+
+    assert expired == ["webhook_event_keys_p2026_08"]
+    assert _executed(conn) == [
+        "ALTER TABLE webhook_event_keys DETACH PARTITION webhook_event_keys_p2026_08 CONCURRENTLY",
+        "DROP TABLE webhook_event_keys_p2026_08",
+    ]
+
+
+def test_maintain_partitions_is_scheduled_and_skips_sqlite():
+    entry = celery.conf.beat_schedule["maintain-webhook-event-partitions"]
+    assert entry["task"] == "tasks.maintain_partitions"
+
+    with patch("app.partitions.database.engine") as engine:
+        engine.dialect.name = "sqlite"
+        partitions.maintain_partitions.run()
+    engine.connect.assert_not_called()
+
+
+def test_ensure_partitions_skips_periods_covered_by_wider_partitions():
+    # 마이그레이션은 월 단위로 만든다 — 일 단위로 바꾸면 그 달이 끝난 뒤부터 만든다
+    conn = _conn({"webhook_events_p2026_10": False})
+    now = datetime(2026, 10, 30, tzinfo=UTC)
+
+    created = partitions.ensure_partitions(conn, now, "day", ahead=3)
+
+    assert created == ["webhook_events_p2026_11_01", "webhook_events_p2026_11_02"]
@@ -0,0 +1,170 @@
+"""payload 경로 조회·인덱스 — 공급자 객체(Stripe 객체 ID·GitHub 저장소)로 이벤트 찾기.
+
+- 설정한 경로마다 `(customer_id, payload #>> '{...}') WHERE source = ...` 부분 인덱스
+- 인덱스 동기화는 부모 ON ONLY + 파티션별 CONCURRENTLY + ATTACH, 설정에서 빠진 것은 DROP
+- 조회는 인덱스와 같은 식(`#>>`)·같은 source 조건을 만들고, SQLite에서도 같은 결과
+- PostgreSQL 컬럼 타입은 JSONB
+"""
+
+import importlib.util
+import re
+import uuid
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateTable
+
+from app import partitions, payload_paths
+from app.config import Settings
+from app.database import Base
+from app.models.customer import Customer
+from app.models.webhook_event import WebhookEvent
+from app.repositories.webhook_event_repository import WebhookEventRepository
+
+
+def test_index_definitions():
+    definitions = payload_paths.index_definitions(["stripe_object_id"], gin=True)
+
+    assert definitions == {
+        "ix_webhook_events_payload_stripe_object_id": (
+            "(customer_id, (payload #>> '{data,object,id}')) WHERE source = 'stripe'"
+        ),
+        "ix_webhook_events_payload_gin": "USING gin (payload jsonb_path_ops)",
+    }
+    with pytest.raises(ValueError, match="Unknown payload path"):
+        payload_paths.index_definitions(["stripe_amount"], gin=False)
+
+
+def test_sync_indexes_builds_per_partition_and_drops_unwanted():
+    conn = MagicMock()
+
+    def execute(statement, params=None):
+        if statement is partitions._LIST_PARTITIONS:
+            return [
+                MagicMock(relname="webhook_events_p2026_10", inhdetachpending=False),
+                MagicMock(relname="webhook_events_p2026_09", inhdetachpending=True),
+            ]
+        return [
+            MagicMock(relname="ix_webhook_events_payload_stripe_type", indisvalid=True),
+            MagicMock(relname="ix_webhook_events_payload_gin", indisvalid=True),
+            MagicMock(relname="webhook_events_pkey", indisvalid=True),
+        ]
+
+    conn.execute.side_effect = execute
+
+    created, dropped = payload_paths.sync_indexes(
+        conn, ["stripe_type", "github_repository"], gin=False
+    )
+
+    assert created == ["ix_webhook_events_payload_github_repository"]
+    assert dropped == ["ix_webhook_events_payload_gin"]
+    definition = "(customer_id, (payload #>> '{repository,full_name}')) WHERE source = 'github'"
+    assert [call.args[0] for call in conn.exec_driver_sql.call_args_list] == [
+        "CREATE INDEX IF NOT EXISTS ix_webhook_events_payload_github_repository "
+        f"ON ONLY webhook_events {definition}",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+        "ix_webhook_events_p2026_10_payload_github_repository "
+        f"ON webhook_events_p2026_10 {definition}",
+        "ALTER INDEX ix_webhook_events_payload_github_repository "
+        "ATTACH PARTITION ix_webhook_events_p2026_10_payload_github_repository",
+        "DROP INDEX ix_webhook_events_payload_gin",
+    ]
+
+
+@pytest.mark.parametrize("path", list(payload_paths.PAYLOAD_PATHS))
+def test_find_by_payload_path_matches_index_expression(path):
+    db = MagicMock()
+
+    WebhookEventRepository.find_by_payload_path(db, customer_id=uuid.uuid4(), path=path, value="v")
+
+    sql = str(
+        db.execute.call_args.args[0].compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+    # as_string()은 `CAST(... AS VARCHAR)`로 감싼다 — text→varchar는 이진 호환 relabel이라
+    # 플래너가 인덱스 식과 맞출 때 벗겨 낸다. 그 안의 식·경로·source 조건이 인덱스와 같아야 한다.
+    query = re.search(
+        r"webhook_events\.source = '(\w+)' AND "
+        r"CAST\(\(webhook_events\.payload #>> '\{([^}]*)\}'\) AS VARCHAR\) = 'v'",
+        sql,
+    )
+    index = re.fullmatch(
+        r"\(customer_id, \(payload #>> '\{([^}]*)\}'\)\) WHERE source = '(\w+)'",
+        payload_paths.index_definitions([path], gin=False)[payload_paths.index_name(path)],
+    )
+    assert query and index
+    assert query[2].replace(" ", "").split(",") == index[1].split(",")
+    assert query[1] == index[2]
+    assert "webhook_events.customer_id = " in sql
+    assert "JSONB" in str(CreateTable(WebhookEvent.__table__).compile(dialect=postgresql.dialect()))
+
+
+def test_find_by_payload_path_filters_on_sqlite():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    customer_id = uuid.uuid4()
+    now = datetime.now(UTC)
+    with sessionmaker(bind=engine)() as db:
+        db.add(
+            Customer(
+                id=customer_id, tenant_id="t", name="T", webhook_secret="s", allowed_event_types=[]
+            )
+        )
+        payloads = [
+            ("stripe", {"type": "invoice.paid", "data": {"object": {"id": "in_1"}}}, 3),
+            ("stripe", {"type": "invoice.paid", "data": {"object": {"id": "in_1"}}}, 1),
+            ("stripe", {"type": "charge.failed", "data": {"object": {"id": "ch_1"}}}, 1),
+            ("github", {"data": {"object": {"id": "in_1"}}}, 1),  # 다른 source
+        ]
+        for source, payload, days_ago in payloads:
+            db.add(
+                WebhookEvent(
+                    customer_id=customer_id,
+                    source=source,
+                    payload=payload,
+                    status="PROCESSED",
+                    received_at=now - timedelta(days=days_ago),
+                )
+            )
+        db.commit()
+
+        found = WebhookEventRepository.find_by_payload_path(
+            db, customer_id=customer_id, path="stripe_object_id", value="in_1"
+        )
+        recent = WebhookEventRepository.find_by_payload_path(
+            db,
+            customer_id=customer_id,
+            path="stripe_object_id",
+            value="in_1",
+            received_after=now - timedelta(days=2),
+        )
+        other_tenant = WebhookEventRepository.find_by_payload_path(
+            db, customer_id=uuid.uuid4(), path="stripe_type", value="invoice.paid"
+        )
+
+    assert [event.id for event in found] == [2, 1]
+    assert [event.id for event in recent] == [2]
+    assert other_tenant == []
+    engine.dispose()
+
+
+def test_migration_creates_default_path_indexes():
+    # 마이그레이션은 app을 import하지 않고 DDL을 고정해 둔다 — 기본 설정과 어긋나지 않게
+    spec = importlib.util.spec_from_file_location(
+        "jsonb_migration",
+        Path(__file__).parents[1]
+        / "alembic/versions/d4b9e6a13c52_store_webhook_event_payload_as_jsonb.py",
+    )
+    assert spec and spec.loader
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    defaults = Settings.model_fields["payload_path_indexes"].default
+    assert payload_paths.index_definitions(defaults, gin=False) == migration._PATH_INDEXES
+    assert migration._GIN_INDEX == payload_paths.GIN_INDEX
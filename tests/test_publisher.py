@@ -0,0 +1,57 @@
+"""비차단 Celery 발행 — apply_async는 발행 스레드에서, 결과는 future로."""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.publisher import PublisherOverloaded, TaskPublisher
+
+
+@pytest.fixture
+def publisher():
+    publisher = TaskPublisher(threads=1, max_pending=10)
+    yield publisher
+    publisher.stop()
+
+
+async def test_publish_runs_apply_async_off_the_event_loop(publisher):
+    called_from = []
+    task = MagicMock()
+    task.apply_async.side_effect = lambda **_: called_from.append(threading.current_thread())
+
+    await publisher.publish(task, ["cust-1", b"{}", "evt-1"], queue="default")
+
+    task.apply_async.assert_called_once_with(args=["cust-1", b"{}", "evt-1"], queue="default")
+    assert called_from[0] is not threading.current_thread()
+    assert called_from[0].name.startswith("task-publisher")
+
+
+async def test_publish_failure_propagates_to_caller(publisher):
+    task = MagicMock()
+    task.apply_async.side_effect = RuntimeError("broker down")
+
+    with pytest.raises(RuntimeError, match="broker down"):
+        await publisher.publish(task, [], queue="default")
+
+
+async def test_publish_rejects_when_handoff_queue_is_full():
+    publisher = TaskPublisher(threads=1, max_pending=1)
+    release = threading.Event()
+    task = MagicMock()
+    task.apply_async.side_effect = lambda **_: release.wait(5)
+
+    # 첫 발행은 스레드를 붙잡고, 두 번째는 큐(1칸)를 채운다
+    in_flight = asyncio.ensure_future(publisher.publish(task, [], queue="default"))
+    await asyncio.sleep(0.05)
+    queued = asyncio.ensure_future(publisher.publish(task, [], queue="default"))
+    await asyncio.sleep(0.01)
+
+    try:
+        with pytest.raises(PublisherOverloaded):
+            await publisher.publish(task, [], queue="default")
+    finally:
+        release.set()
+        await asyncio.gather(in_flight, queued)
+        publisher.stop()
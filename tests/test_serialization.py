@@ -0,0 +1,65 @@
+"""태스크 메시지 orjson 직렬화 — bytes 왕복, 임계값 압축, json 메시지와 공존.
+
+- 원본 본문 bytes(UTF-8 아님 포함)가 bytes로 되돌아온다
+- 임계값 이상이면 zlib 헤더로 압축, 미만·0이면 원본 헤더
+- 워커는 전환 전 json 메시지와 orjson 메시지를 모두 디코드한다
+"""
+
+import base64
+import json
+import uuid
+
+import pytest
+from kombu.serialization import dumps, loads, prepare_accept_content
+
+from app import serialization
+from app.celery_worker import celery
+from app.config import settings
+from app.ingest_batcher import build_redis_message
+from app.serialization import CONTENT_TYPE
+from app.services.webhook_handler import process_github_webhook_task
+
+
+def test_task_arguments_round_trip_with_bytes(monkeypatch):
+    monkeypatch.setattr(settings, "task_compression_threshold_bytes", 0)
+    customer_id = uuid.uuid4()
+    body = ([str(customer_id), b'{"action":"opened"}', None], {"raw": b"\xff\x00"}, {})
+
+    content_type, encoding, data = dumps(body, serializer="orjson")
+
+    assert (content_type, encoding) == (CONTENT_TYPE, "binary")
+    assert data.startswith(b"\x00")
+    args, kwargs, embed = loads(data, content_type, encoding)
+    assert args == [str(customer_id), b'{"action":"opened"}', None]
+    assert kwargs == {"raw": b"\xff\x00"}
+    assert embed == {}
+
+
+@pytest.mark.parametrize(("threshold", "compressed"), [(64, True), (0, False)])
+def test_compression_above_threshold(monkeypatch, threshold, compressed):
+    monkeypatch.setattr(settings, "task_compression_threshold_bytes", threshold)
+    payload = json.dumps({"commits": [{"message": "fix", "author": "octocat"}] * 200}).encode()
+
+    data = serialization.dumps([["cust-1", payload], {}, {}])
+
+    assert data.startswith(b"\x01" if compressed else b"\x00")
+    assert (len(data) < len(payload)) is compressed
+    assert serialization.loads(data) == [["cust-1", payload], {}, {}]
+
+
+def test_worker_accepts_json_and_orjson_messages(monkeypatch):
+    args = ["cust-1", b'{"action":"opened"}', "evt-1"]
+    accept = prepare_accept_content(celery.conf.accept_content)
+
+    for serializer in ("json", "orjson"):
+        monkeypatch.setattr(celery.conf, "task_serializer", serializer)
+        envelope = json.loads(
+            build_redis_message(process_github_webhook_task, args, "high_priority")
+        )
+        decoded_args, _kwargs, _embed = loads(
+            base64.b64decode(envelope["body"]),
+            envelope["content-type"],
+            envelope["content-encoding"],
+            accept=accept,
+        )
+        assert decoded_args == args
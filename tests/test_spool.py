@@ -0,0 +1,178 @@
+"""fast-ack 스풀 — 로컬 append 로그와 드레이너.
+
+- append는 fsync 뒤 반환, 동시 append는 한 번의 fsync로 묶임(그룹 커밋)
+- 세그먼트 회전, 재시작 시 체크포인트부터 재개(이미 보낸 레코드 재발행 없음)
+- 잘린 꼬리는 건너뜀, 발행 실패 시 멱등키 해제 후 재시도
+- 크래시로 남은 자기 예약(같은 토큰)은 중복이 아니라 재발행
+- 디스크 오류(체크포인트 저장 등)는 드레이너를 끝내지 않고 백오프 후 재시도
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app import spool as spool_module
+from app.idempotency import IdempotencyKey
+from app.spool import Spool, SpoolDrainer, SpoolRecord, encode_record, read_records
+
+
+class _FakeIdempotency:
+    def __init__(self):
+        self.keys = {}
+        self.released = []
+
+    async def reserve(self, key, token="1"):
+        if str(key) in self.keys:
+            return False
+        self.keys[str(key)] = token
+        return True
+
+    async def holder(self, key):
+        return self.keys.get(str(key))
+
+    async def release(self, key):
+        self.released.append(str(key))
+        self.keys.pop(str(key), None)
+
+
+def _record(event_id="evt-1", body=b'{"id": "evt-1"}'):
+    return SpoolRecord("tenant-1", "stripe", event_id, "cust-1", body)
+
+
+@pytest.fixture
+def publish(mocker):
+    return mocker.patch.object(spool_module.task_publisher, "publish", AsyncMock())
+
+
+async def test_append_round_trips_and_groups_fsyncs(tmp_path, mocker):
+    spool = Spool.open(tmp_path, segment_max_bytes=1 << 20)
+    fsync = mocker.spy(spool_module.os, "fsync")
+
+    await asyncio.gather(*(spool.append(_record(f"evt-{i}")) for i in range(10)))
+
+    records = [r for r, _ in read_records(spool.segment_path(spool.active_seq), 0)]
+    assert [r.event_id for r in records] == [f"evt-{i}" for i in range(10)]
+    assert records[0].body == b'{"id": "evt-1"}'
+    assert fsync.call_count < 10  # 첫 fsync 동안 쌓인 append는 다음 fsync 한 번으로
+    spool.close()
+
+
+async def test_segments_rotate_at_size_limit(tmp_path):
+    spool = Spool.open(tmp_path, segment_max_bytes=1)
+
+    await spool.append(_record("evt-1"))
+    await spool.append(_record("evt-2"))
+
+    assert spool.segments() == [0, 1, 2]
+    spool.close()
+
+
+async def test_drainer_publishes_and_resumes_from_checkpoint(tmp_path, publish):
+    spool = Spool.open(tmp_path, segment_max_bytes=1 << 20)
+    for i in range(3):
+        await spool.append(_record(f"evt-{i}"))
+    drainer = SpoolDrainer(spool, _FakeIdempotency())
+
+    _, delivered = await drainer.drain_once(spool.load_checkpoint())
+    spool.close()
+
+    assert delivered == 3
+    args = publish.await_args_list[0].args
+    assert args[1] == ["cust-1", b'{"id": "evt-1"}', "evt-0"]
+    assert publish.await_args_list[0].kwargs == {"queue": "default"}
+
+    # 재시작 — 체크포인트 이후 레코드가 없으므로 재발행하지 않는다
+    restarted = Spool.open(tmp_path, segment_max_bytes=1 << 20)
+    _, delivered = await SpoolDrainer(restarted, _FakeIdempotency()).drain_once(
+        restarted.load_checkpoint()
+    )
+    restarted.close()
+    assert delivered == 0
+    assert publish.await_count == 3
+
+
+async def test_drainer_skips_torn_tail_of_previous_run(tmp_path, publish):
+    spool = Spool.open(tmp_path, segment_max_bytes=1 << 20)
+    await spool.append(_record("evt-1"))
+    spool.close()
+    with spool.segment_path(0).open("ab") as f:
+        f.write(encode_record(_record("evt-torn"))[:10])  # 쓰는 도중 크래시
+
+    restarted = Spool.open(tmp_path, segment_max_bytes=1 << 20)
+    await restarted.append(_record("evt-2"))
+    drainer = SpoolDrainer(restarted, _FakeIdempotency())
+    position, first = await drainer.drain_once(restarted.load_checkpoint())
+    _, second = await drainer.drain_once(position)
+    restarted.close()
+
+    assert first + second == 2
+    assert [c.args[1][2] for c in publish.await_args_list] == ["evt-1", "evt-2"]
+    assert restarted.segments() == [1]  # 다 읽은 세그먼트는 삭제
+
+
+async def test_failed_publish_releases_key_and_retries(tmp_path, publish):
+    publish.side_effect = [RuntimeError("broker down"), None]
+    spool = Spool.open(tmp_path, segment_max_bytes=1 << 20)
+    await spool.append(_record("evt-1"))
+    idempotency = _FakeIdempotency()
+    drainer = SpoolDrainer(spool, idempotency)
+    drainer.max_backoff = 0
+
+    _, delivered = await drainer.drain_once(spool.load_checkpoint())
+    spool.close()
+
+    assert delivered == 1
+    assert publish.await_count == 2
+    assert idempotency.released == [str(IdempotencyKey("tenant-1", "stripe", "evt-1"))]
+
+
+async def test_own_reservation_left_by_crash_is_republished(tmp_path, publish):
+    spool = Spool.open(tmp_path, segment_max_bytes=1 << 20)
+    await spool.append(_record("evt-1"))
+    idempotency = _FakeIdempotency()
+    key = str(IdempotencyKey("tenant-1", "stripe", "evt-1"))
+    # 이전 프로세스가 예약만 하고 발행 전에 죽음 — 같은 레코드 위치의 토큰
+    idempotency.keys[key] = f"spool:{spool.directory.name}:0:0"
+    # 다른 요청이 이미 예약한 이벤트는 중복으로 건너뜀
+    await spool.append(_record("evt-2"))
+    idempotency.keys[str(IdempotencyKey("tenant-1", "stripe", "evt-2"))] = "1"
+
+    await SpoolDrainer(spool, idempotency).drain_once(spool.load_checkpoint())
+    spool.close()
+
+    assert [c.args[1][2] for c in publish.await_args_list] == ["evt-1"]
+
+
+async def test_drainer_survives_disk_errors(tmp_path, publish, mocker):
+    spool = Spool.open(tmp_path, segment_max_bytes=1 << 20)
+    await spool.append(_record("evt-1"))
+    drainer = SpoolDrainer(spool, _FakeIdempotency(), poll_interval=0.01)
+    drainer.max_backoff = 0
+    save = mocker.patch.object(
+        spool, "save_checkpoint", side_effect=[OSError(28, "No space left on device"), None]
+    )
+
+    task = asyncio.create_task(drainer.run())
+    for _ in range(100):
+        await asyncio.sleep(0.01)
+        if save.call_count >= 2:
+            break
+    assert not task.done()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    spool.close()
+
+    assert save.call_count >= 2
+    assert publish.await_count >= 1  # 체크포인트 전에 실패한 배치는 다시 보낸다
+
+
+def test_each_process_locks_its_own_slot(tmp_path):
+    first = Spool.open(tmp_path, segment_max_bytes=1 << 20)
+    second = Spool.open(tmp_path, segment_max_bytes=1 << 20)
+
+    assert first.directory.name == "0"
+    assert second.directory.name == "1"
+    first.close()
+    second.close()
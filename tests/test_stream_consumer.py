@@ -0,0 +1,152 @@
+"""Redis Streams 전송 — XADD 필드 인코딩과 소비자 그룹 워커의 ack·회수·DLQ.
+
+- 태스크 인자가 필드로 그대로(본문 바이트 유지, None 생략) 왕복
+- 배치 적재 후 적재·중복 항목을 스트림별 XACK 한 번으로
+- 검증 실패 항목만 DLQ + ack, 일시적 DB 오류면 ack하지 않음(XAUTOCLAIM 재전달)
+- 회수한 항목 중 전달 횟수 초과분은 DLQ, 트림으로 사라진 항목은 PEL에서 정리
+- XINFO GROUPS의 lag·pending을 메트릭으로
+"""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.exc import OperationalError
+
+from app.metrics import STREAM_LAG, STREAM_PENDING_ENTRIES
+from app.models.webhook_event import WebhookEvent
+from app.services.webhook_handler import process_github_webhook_task
+from app.stream_consumer import StreamConsumer
+from app.streams import StreamPublisher, decode_entry, encode_entry
+
+STREAM = "webhooks:high_priority"
+
+
+def _fields(customer_id, body, event_id=None):
+    encoded = encode_entry(process_github_webhook_task, [customer_id, body, event_id])
+    return {k.encode(): v if isinstance(v, bytes) else v.encode() for k, v in encoded.items()}
+
+
+def test_entry_round_trips_task_arguments():
+    customer_id = uuid.uuid4()
+    fields = encode_entry(process_github_webhook_task, [customer_id, b'{"a": 1}', None, "f" * 32])
+
+    assert fields == {
+        "task": process_github_webhook_task.name,
+        "customer_id": str(customer_id),
+        "raw_payload": b'{"a": 1}',
+        "fingerprint": "f" * 32,
+    }
+    task_name, kwargs = decode_entry(
+        {k.encode(): v if isinstance(v, bytes) else v.encode() for k, v in fields.items()}
+    )
+    assert task_name == process_github_webhook_task.name
+    assert kwargs == {
+        "customer_id": str(customer_id),
+        "raw_payload": b'{"a": 1}',
+        "fingerprint": "f" * 32,
+    }
+
+
+async def test_publisher_xadds_to_priority_stream_with_length_cap():
+    redis_client = MagicMock()
+    redis_client.xadd = AsyncMock()
+
+    await StreamPublisher(redis_client, max_len=1000).publish(
+        process_github_webhook_task, ["cust-1", b"{}", "d-1"], queue="high_priority"
+    )
+
+    args, kwargs = redis_client.xadd.await_args
+    assert args[0] == STREAM
+    assert args[1]["event_id"] == "d-1"
+    assert kwargs == {"maxlen": 1000, "approximate": True}
+
+
+# ─── 소비자 ──────────────────────────────────────────────────────────────────
+
+
+def _consumer(session_factory, redis_client=None):
+    return StreamConsumer(
+        redis_client or MagicMock(),
+        ["high_priority"],
+        group="workers",
+        name="c-1",
+        session_factory=session_factory,
+    )
+
+
+def _acked(redis_client):
+    pipe = redis_client.pipeline.return_value
+    ids = [i for c in pipe.xack.call_args_list for i in c.args[2:]]
+    return ids + [i for c in redis_client.xack.call_args_list for i in c.args[2:]]
+
+
+def test_batch_is_persisted_then_acked(session_factory, customer_id, dead_letter, github_body):
+    consumer = _consumer(session_factory)
+    entries = [
+        (STREAM, "1-0", _fields(customer_id, github_body, "d-1")),
+        (STREAM, "2-0", _fields(customer_id, github_body, "d-1")),  # 배치 내 중복
+        (STREAM, "3-0", _fields(customer_id, b"[]", "d-2")),  # 검증 실패
+    ]
+
+    consumer.handle_batch(entries)
+
+    with session_factory() as db:
+        assert [e.event_id for e in db.query(WebhookEvent)] == ["d-1"]
+    assert sorted(_acked(consumer.redis)) == ["1-0", "2-0", "3-0"]
+    dead_letter.assert_called_once()
+    assert dead_letter.call_args.args[1] == "3-0"
+
+
+def test_transient_db_error_leaves_entries_pending(
+    session_factory, customer_id, github_body, mocker
+):
+    consumer = _consumer(session_factory)
+    consumer._insert_batch = mocker.Mock(
+        side_effect=OperationalError("INSERT", {}, Exception("connection reset"))
+    )
+
+    consumer.handle_batch([(STREAM, "1-0", _fields(customer_id, github_body, "d-1"))])
+
+    assert _acked(consumer.redis) == []
+
+
+def test_recover_claims_stalled_entries_and_dead_letters_exhausted(
+    session_factory, customer_id, dead_letter, github_body
+):
+    redis_client = MagicMock()
+    redis_client.xautoclaim.return_value = [
+        b"0-0",
+        [
+            (b"1-0", _fields(customer_id, github_body, "d-1")),
+            (b"2-0", _fields(customer_id, github_body, "d-2")),
+        ],
+        [b"3-0"],  # 트림으로 이미 사라진 미확인 항목
+    ]
+    redis_client.pipeline.return_value.execute.return_value = [
+        [{"message_id": b"1-0", "times_delivered": 2}],
+        [{"message_id": b"2-0", "times_delivered": 5}],  # max_retries(3) + 1 초과
+    ]
+    consumer = _consumer(session_factory, redis_client)
+
+    recovered = consumer.recover()
+
+    assert [entry_id for _, entry_id, _ in recovered] == ["1-0"]
+    assert redis_client.xautoclaim.call_args.kwargs["min_idle_time"] == 60_000
+    assert dead_letter.call_args.args[1] == "2-0"
+    assert sorted(_acked(redis_client)) == ["2-0", "3-0"]
+
+
+def test_backlog_metrics_and_age_trim(session_factory):
+    redis_client = MagicMock()
+    redis_client.xinfo_groups.return_value = [
+        {"name": b"other", "pending": 99, "lag": 99},
+        {"name": b"workers", "pending": 7, "lag": 42},
+    ]
+    consumer = _consumer(session_factory, redis_client)
+    consumer.max_age_seconds = 3600
+
+    consumer.report_backlog()
+
+    assert STREAM_PENDING_ENTRIES.labels(stream=STREAM)._value.get() == 7
+    assert STREAM_LAG.labels(stream=STREAM)._value.get() == 42
+    assert redis_client.xtrim.call_args.kwargs["minid"].endswith("-0")
@@ -0,0 +1,210 @@
+"""테넌트 캐시 — WebhookVerifier의 customers 조회 흡수.
+
+- TTL/LRU 한도, 음성 캐시(미존재 tenant_id)
+- 캐시 적중 시 DB 미조회, 비활성 테넌트는 캐시에서도 403
+- Customer 변경 커밋 시 무효화 발행(롤백 시 미발행), AsyncSession 커밋은 스레드에서 발행
+- 발행 리스너는 모델과 함께 등록 — app.tenant_cache를 import하지 않는 앱 밖 쓰기도 발행
+"""
+
+import asyncio
+import subprocess
+import sys
+import threading
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+
+from app import tenant_cache
+from app.database import AsyncBackedSession, Base, SessionLocal
+from app.dependencies import WebhookVerifier
+from app.models import customer as customer_model
+from app.models.customer import Customer
+from app.models.webhook_event import WebhookEvent  # noqa: F401 — Base 등록 필수
+from app.tenant_cache import CachedCustomer, TenantCache
+
+
+def _cached(tenant_id="tenant-1", is_active=True):
+    return CachedCustomer(
+        id=uuid.uuid4(), tenant_id=tenant_id, webhook_secret="s", is_active=is_active
+    )
+
+
+def _request_with_cache(cache):
+    return SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(tenant_cache=cache)))
+
+
+# ─── TenantCache ─────────────────────────────────────────────────────────────
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TenantCache(max_size=2, ttl=60, negative_ttl=10)
+    cache.put("a", _cached("a"))
+    cache.put("b", _cached("b"))
+    cache.get("a")  # a를 최근 사용으로
+    cache.put("c", _cached("c"))
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a")[0] is True
+    assert len(cache) == 2
+
+
+def test_cache_entry_expires_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(tenant_cache.time, "monotonic", lambda: now[0])
+    cache = TenantCache(max_size=10, ttl=60, negative_ttl=5)
+    cache.put("a", _cached("a"))
+    cache.put("ghost", None)
+
+    now[0] += 6
+    assert cache.get("a")[0] is True
+    assert cache.get("ghost") == (False, None)  # 음성 캐시는 더 짧게 만료
+
+    now[0] += 60
+    assert cache.get("a") == (False, None)
+
+
+def test_negative_entry_is_a_hit_with_none():
+    cache = TenantCache(max_size=10, ttl=60, negative_ttl=10)
+    cache.put("ghost", None)
+
+    assert cache.get("ghost") == (True, None)
+
+
+def test_put_after_concurrent_invalidation_is_dropped():
+    cache = TenantCache(max_size=10, ttl=60, negative_ttl=10)
+    version = cache.version
+    cache.invalidate("a")  # 조회 도중 무효화 도착
+    cache.put("a", _cached("a"), version=version)
+
+    assert cache.get("a") == (False, None)
+
+
+# ─── WebhookVerifier 연동 ────────────────────────────────────────────────────
+
+
+async def test_verifier_skips_db_on_cache_hit():
+    cache = TenantCache(max_size=10, ttl=60, negative_ttl=10)
+    customer = _cached()
+    cache.put("tenant-1", customer)
+    db = AsyncMock()
+
+    result = await WebhookVerifier(source="github")._resolve_customer(
+        _request_with_cache(cache), db, "tenant-1"
+    )
+
+    assert result is customer
+    db.execute.assert_not_awaited()
+
+
+async def test_verifier_caches_unknown_tenant():
+    cache = TenantCache(max_size=10, ttl=60, negative_ttl=10)
+    exec_result = MagicMock()
+    exec_result.scalar_one_or_none.return_value = None
+    db = AsyncMock()
+    db.execute.return_value = exec_result
+    verifier = WebhookVerifier(source="github")
+    request = _request_with_cache(cache)
+
+    assert await verifier._resolve_customer(request, db, "ghost") is None
+    assert await verifier._resolve_customer(request, db, "ghost") is None
+    db.execute.assert_awaited_once()
+
+
+async def test_verifier_rejects_inactive_tenant_from_cache():
+    cache = TenantCache(max_size=10, ttl=60, negative_ttl=10)
+    cache.put("tenant-1", _cached(is_active=False))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await WebhookVerifier(source="github")._resolve_customer(
+            _request_with_cache(cache), AsyncMock(), "tenant-1"
+        )
+
+    assert exc_info.value.status_code == 403
+
+
+# ─── 변경 통지 ───────────────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = SessionLocal(bind=engine)
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _add_customer(session, tenant_id="tenant-1"):
+    customer = Customer(
+        id=uuid.uuid4(),
+        tenant_id=tenant_id,
+        name="Test",
+        webhook_secret="secret",
+        allowed_event_types=[],
+    )
+    session.add(customer)
+    return customer
+
+
+def test_customer_update_publishes_invalidation_after_commit(db):
+    with patch.object(customer_model, "publish_invalidation") as publish:
+        customer = _add_customer(db)
+        db.commit()
+        publish.reset_mock()
+
+        customer.is_active = False
+        db.commit()
+
+    publish.assert_called_once_with({"tenant-1"})
+
+
+def test_rolled_back_change_is_not_published(db):
+    with patch.object(customer_model, "publish_invalidation") as publish:
+        _add_customer(db)
+        db.flush()
+        db.rollback()
+        db.commit()
+
+    assert all(call.args[0] == set() for call in publish.call_args_list)
+
+
+async def test_async_session_commit_publishes_off_the_event_loop():
+    # AsyncSessionLocal의 안쪽 동기 세션 — 커밋 훅은 이벤트 루프 스레드에서 돈다
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    published = []
+
+    def publish(tenant_ids):
+        published.append((tenant_ids, threading.current_thread()))
+
+    with (
+        patch.object(customer_model, "publish_invalidation", side_effect=publish),
+        AsyncBackedSession(bind=engine) as session,
+    ):
+        _add_customer(session)
+        session.commit()
+        assert published == []  # 루프를 막지 않고 태스크로 넘겼다
+        await asyncio.gather(*customer_model._publishing)
+    engine.dispose()
+
+    assert published[0][0] == {"tenant-1"}
+    assert published[0][1] is not threading.main_thread()
+
+
+def test_listeners_are_registered_without_importing_the_cache():
+    # seed_tenant.sh처럼 SessionLocal·Customer만 쓰는 앱 밖 스크립트
+    script = """
+import sys
+from sqlalchemy import event
+from app.database import SessionLocal
+from app.models.customer import Customer, _collect_changed_tenant, _publish_after_commit
+assert "app.tenant_cache" not in sys.modules
+assert event.contains(Customer, "after_update", _collect_changed_tenant)
+assert event.contains(SessionLocal, "after_commit", _publish_after_commit)
+"""
+    subprocess.run([sys.executable, "-c", script], check=True)
@@ -1,4 +1,5 @@
 import uuid
+from datetime import date, timedelta
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -135,3 +136,25 @@ def test_webhook_event_repo_get_for_customer_wrong_event_id(db):
     result = WebhookEventRepository.get_for_customer(db, event_id=99999, customer_id=customer.id)
 
     assert result is None
+
+
+def test_webhook_event_repo_get_for_customer_received_on(db):
+    # received_on이면 그 날 범위만 — PostgreSQL에서는 해당 파티션 하나만 읽는다
+    from sqlalchemy import text
+
+    customer = _make_customer(db)
+    evt = WebhookEventRepository.create(db, customer_id=customer.id, source="github", payload={})
+    db.flush()
+    received = date.fromisoformat(
+        db.execute(text("SELECT date(received_at) FROM webhook_events")).scalar()
+    )
+
+    found = WebhookEventRepository.get_for_customer(
+        db, event_id=evt.id, customer_id=customer.id, received_on=received
+    )
+    missed = WebhookEventRepository.get_for_customer(
+        db, event_id=evt.id, customer_id=customer.id, received_on=received - timedelta(days=1)
+    )
+
+    assert found is not None and found.id == evt.id
+    assert missed is None
@@ -0,0 +1,105 @@
+import hashlib
+import hmac
+
+import pytest
+
+from app.signatures import (
+    SignatureVerificationError,
+    StripeSignature,
+    parse_stripe_signature_header,
+    verify_github_signature,
+    verify_stripe_signature,
+)
+
+SECRET = "whsec_test"  # noqa: S105 (테스트 전용 더미)
+BODY = b'{"id": "evt_1", "type": "invoice.paid"}'
+NOW = 1_700_000_000
+
+
+def _v1(body: bytes, timestamp: int, secret: str = SECRET) -> str:
+    return hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+
+
+def test_parse_header_collects_all_v1_signatures():
+    timestamp, signatures = parse_stripe_signature_header("t=123,v1=aaa,v0=zzz,v1=bbb")
+
+    assert timestamp == 123
+    assert signatures == ["aaa", "bbb"]
+
+
+@pytest.mark.parametrize("header", ["", "v1=aaa", "t=123", "t=abc,v1=aaa", "garbage"])
+def test_parse_header_rejects_malformed(header):
+    with pytest.raises(SignatureVerificationError):
+        parse_stripe_signature_header(header)
+
+
+def test_verify_accepts_valid_signature():
+    verify_stripe_signature(BODY, f"t={NOW},v1={_v1(BODY, NOW)}", SECRET, now=NOW)
+
+
+def test_verify_accepts_any_v1_during_secret_rotation():
+    header = f"t={NOW},v1={_v1(BODY, NOW, 'whsec_old')},v1={_v1(BODY, NOW)}"
+
+    verify_stripe_signature(BODY, header, SECRET, now=NOW)
+
+
+def test_verify_rejects_tampered_body():
+    header = f"t={NOW},v1={_v1(BODY, NOW)}"
+
+    with pytest.raises(SignatureVerificationError):
+        verify_stripe_signature(BODY + b" ", header, SECRET, now=NOW)
+
+
+@pytest.mark.parametrize("skew", [301, -301])
+def test_verify_rejects_timestamp_outside_tolerance(skew):
+    timestamp = NOW - skew
+    header = f"t={timestamp},v1={_v1(BODY, timestamp)}"
+
+    with pytest.raises(SignatureVerificationError, match="tolerance"):
+        verify_stripe_signature(BODY, header, SECRET, tolerance=300, now=NOW)
+
+
+def test_verify_skips_tolerance_when_zero():
+    timestamp = NOW - 86_400
+    header = f"t={timestamp},v1={_v1(BODY, timestamp)}"
+
+    verify_stripe_signature(BODY, header, SECRET, tolerance=0, now=NOW)
+
+
+@pytest.mark.parametrize(
+    "verify",
+    [
+        lambda header: verify_github_signature(BODY, f"sha256={header}", SECRET),
+        lambda header: verify_stripe_signature(BODY, f"t={NOW},v1={header}", SECRET, now=NOW),
+    ],
+    ids=["github", "stripe"],
+)
+def test_non_ascii_signature_is_a_mismatch_not_a_type_error(verify):
+    # Starlette는 헤더를 latin-1로 디코드한다 — 비ASCII 바이트가 그대로 str로 온다
+    header = b"\xe9\xff".decode("latin-1") * 32
+
+    with pytest.raises(SignatureVerificationError):
+        verify(header)
+
+
+def test_fingerprint_is_body_digest_computed_alongside_hmac():
+    header = f"t={NOW},v1={_v1(BODY, NOW)}"
+    expected = hashlib.blake2b(BODY, digest_size=16).hexdigest()
+
+    assert verify_stripe_signature(BODY, header, SECRET, now=NOW) is None
+    assert verify_stripe_signature(BODY, header, SECRET, now=NOW, fingerprint=True) == expected
+
+    # 청크로 나눠 갱신해도 같은 지문 — 스트리밍 검증 경로
+    signature = StripeSignature(header, SECRET, now=NOW, fingerprint=True)
+    signature.update(BODY[:7])
+    signature.update(BODY[7:])
+    signature.verify()
+    assert signature.fingerprint() == expected
+
+
+def test_github_fingerprint_ignores_signature_header():
+    digest = hmac.new(SECRET.encode(), BODY, hashlib.sha256).hexdigest()
+
+    fingerprint = verify_github_signature(BODY, f"sha256={digest}", SECRET, fingerprint=True)
+
+    assert fingerprint == hashlib.blake2b(BODY, digest_size=16).hexdigest()
@@ -1,10 +1,12 @@
+import json
 from unittest.mock import MagicMock, patch
 
 import pytest
+from pydantic import ValidationError
 
 from app.metrics import CUSTOMER_WEBHOOK_ERRORS_TOTAL
-from app.models.webhook_event import WebhookEvent
-from app.services.webhook_handler import process_github_webhook_task
+from app.schemas.github_webhook import GitHubWebhookPayload
+from app.services.webhook_handler import process_github_webhook_task, validate_payload
 
 
 def _counter_value(counter, **labels):
@@ -15,6 +17,9 @@ def _counter_value(counter, **labels):
     return 0.0
 
 
+_INSERT = "app.services.webhook_handler.WebhookEventRepository.insert_ignore_duplicate"
+
+
 def test_process_github_webhook_task_success():
     """Tests the logic of the GitHub webhook task itself."""
     mock_db_session = MagicMock()
@@ -25,20 +30,42 @@ def test_process_github_webhook_task_success():
         "repository": {"full_name": "test/repo"},
     }
 
-    with patch("app.services.webhook_handler.SessionLocal", return_value=mock_db_session):
+    with (
+        patch("app.services.webhook_handler.SessionLocal", return_value=mock_db_session),
+        patch(_INSERT, return_value=1) as insert,
+    ):
         process_github_webhook_task.run(customer_id, payload)
 
-    mock_db_session.add.assert_called_once()
-    added_object = mock_db_session.add.call_args[0][0]
-    assert isinstance(added_object, WebhookEvent)
-    assert added_object.customer_id == customer_id
-    assert added_object.source == "github"
-    assert added_object.payload == payload
+    insert.assert_called_once()
+    assert insert.call_args.args == (mock_db_session,)
+    assert insert.call_args.kwargs["customer_id"] == customer_id
+    assert insert.call_args.kwargs["source"] == "github"
+    assert insert.call_args.kwargs["payload"] == payload
 
+    # INSERT ... RETURNING이 id를 돌려주므로 refresh 왕복이 없다
     mock_db_session.commit.assert_called_once()
+    mock_db_session.refresh.assert_not_called()
     mock_db_session.close.assert_called_once()
 
 
+def test_process_github_webhook_task_accepts_raw_bytes():
+    """수신 경로는 원본 JSON 바이트를 넘긴다 — 태스크가 한 번 디코드해 적재한다."""
+    mock_db_session = MagicMock()
+    payload = {
+        "action": "starred",
+        "sender": {"login": "testuser"},
+        "repository": {"full_name": "test/repo"},
+    }
+
+    with (
+        patch("app.services.webhook_handler.SessionLocal", return_value=mock_db_session),
+        patch(_INSERT, return_value=1) as insert,
+    ):
+        process_github_webhook_task.run("test_customer_123", json.dumps(payload).encode())
+
+    assert insert.call_args.kwargs["payload"] == payload
+
+
 def test_process_github_webhook_task_failure_metrics():
     """Tests that CUSTOMER_WEBHOOK_ERRORS_TOTAL is incremented on task failure."""
     mock_db_session = MagicMock()
@@ -54,8 +81,9 @@ def test_process_github_webhook_task_failure_metrics():
 
     with (
         patch("app.services.webhook_handler.SessionLocal", return_value=mock_db_session),
+        patch(_INSERT) as insert,
         patch(
-            "app.services.webhook_handler.GitHubWebhookPayload.model_validate",
+            "app.services.webhook_handler.validate_payload",
             side_effect=ValueError("Validation Error"),
         ),
         pytest.raises(ValueError),
@@ -73,12 +101,12 @@ def test_process_github_webhook_task_failure_metrics():
     )
 
     mock_db_session.close.assert_called_once()
-    mock_db_session.add.assert_not_called()
+    insert.assert_not_called()
     mock_db_session.commit.assert_not_called()
 
 
 def test_process_github_webhook_task_marks_processed():
-    """성공 처리 시 webhook_event.status가 PROCESSED로 전이된다."""
+    """성공 처리 시 webhook_event.status가 PROCESSED로 적재된다."""
     mock_db_session = MagicMock()
     payload = {
         "action": "starred",
@@ -86,16 +114,18 @@ def test_process_github_webhook_task_marks_processed():
         "repository": {"full_name": "test/repo"},
     }
 
-    with patch("app.services.webhook_handler.SessionLocal", return_value=mock_db_session):
+    with (
+        patch("app.services.webhook_handler.SessionLocal", return_value=mock_db_session),
+        patch(_INSERT, return_value=1) as insert,
+    ):
         process_github_webhook_task.run("test_customer_123", payload)
 
-    added_object = mock_db_session.add.call_args[0][0]
-    assert added_object.status == "PROCESSED"
+    assert insert.call_args.kwargs["status"] == "PROCESSED"
     mock_db_session.commit.assert_called_once()
 
 
 def test_process_github_webhook_task_marks_failed():
-    """비일시적 오류로 처리 실패 시 status가 FAILED로 전이된다."""
+    """비일시적 오류로 처리 실패 시 이벤트가 FAILED로 적재된다."""
     mock_db_session = MagicMock()
     # 첫 commit(성공 경로)은 실패, FAILED 기록용 두 번째 commit은 성공.
     mock_db_session.commit.side_effect = [RuntimeError("boom"), None]
@@ -107,12 +137,70 @@ def test_process_github_webhook_task_marks_failed():
 
     with (
         patch("app.services.webhook_handler.SessionLocal", return_value=mock_db_session),
+        patch(_INSERT, return_value=1) as insert,
         pytest.raises(RuntimeError),
     ):
         process_github_webhook_task.run("test_customer_123", payload)
 
-    # create()로 추가된 이벤트가 FAILED로 표시되어야 한다.
-    added_object = mock_db_session.add.call_args_list[0][0][0]
-    assert isinstance(added_object, WebhookEvent)
-    assert added_object.status == "FAILED"
+    # 같은 행을 FAILED로 다시 적재해야 한다.
+    assert [c.kwargs["status"] for c in insert.call_args_list] == ["PROCESSED", "FAILED"]
+    assert insert.call_args.kwargs["payload"] == payload
     mock_db_session.rollback.assert_called()
+
+
+def test_process_github_webhook_task_does_not_mark_failed_after_commit():
+    """PROCESSED 행이 커밋된 뒤(claim-check 해제 등)의 실패는 FAILED 행을 덧붙이지 않는다."""
+    mock_db_session = MagicMock()
+    payload = {
+        "action": "starred",
+        "sender": {"login": "testuser"},
+        "repository": {"full_name": "test/repo"},
+    }
+
+    with (
+        patch("app.services.webhook_handler.SessionLocal", return_value=mock_db_session),
+        patch(_INSERT, return_value=1) as insert,
+        patch(
+            "app.services.webhook_handler.claim_check.release",
+            side_effect=OSError("blob store down"),
+        ),
+        pytest.raises(OSError),
+    ):
+        process_github_webhook_task.run("test_customer_123", payload)
+
+    assert [c.kwargs["status"] for c in insert.call_args_list] == ["PROCESSED"]
+    mock_db_session.commit.assert_called_once()
+
+
+def test_process_github_webhook_task_stores_original_payload():
+    """필드만 검증하고 원본 dict를 그대로 적재한다 — 모델 사본·선언 외 필드 손실 없음."""
+    payload = {
+        "ref": "refs/heads/main",
+        "sender": {"login": "testuser"},
+        "repository": {"full_name": "test/repo"},
+        "commits": [{"id": "abc"}],
+    }
+
+    with (
+        patch("app.services.webhook_handler.SessionLocal", return_value=MagicMock()),
+        patch(_INSERT, return_value=1) as insert,
+    ):
+        process_github_webhook_task.run("test_customer_123", payload)
+
+    assert insert.call_args.kwargs["payload"] is payload
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        [],
+        {"sender": {"login": "x"}},
+        {"sender": "x", "repository": {}},
+        {"action": 1, "sender": {}, "repository": {}},
+    ],
+)
+def test_validate_payload_rejects_like_model(payload):
+    with pytest.raises(ValidationError):
+        validate_payload("github", payload)
+    with pytest.raises(ValidationError):
+        GitHubWebhookPayload.model_validate(payload)
@@ -1,10 +1,15 @@
+import threading
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from fastapi import HTTPException
+from prometheus_client import REGISTRY
 
+from app import hmac_offload
+from app.config import settings
 from app.dependencies import WebhookVerifier
 from app.models.customer import Customer
+from app.signatures import SignatureVerificationError, verify_github_signature
 
 
 @pytest.fixture
@@ -57,3 +62,48 @@ async def test_get_customer_async_raises_403_for_inactive_tenant(verifier, mock_
 
     assert exc_info.value.status_code == 403
     assert exc_info.value.detail == "Tenant is inactive."
+
+
+# ─── 대형 본문 HMAC 스레드풀 오프로드 ────────────────────────────────────────
+
+
+def _verification_count(source, mode):
+    return (
+        REGISTRY.get_sample_value("hmac_verifications_total", {"source": source, "mode": mode}) or 0
+    )
+
+
+async def test_small_body_verified_inline(monkeypatch):
+    monkeypatch.setattr(settings, "hmac_offload_threshold_bytes", 1024)
+    threads = []
+    before = _verification_count("github", "inline")
+
+    await hmac_offload.run_verification(
+        "github", 10, lambda: threads.append(threading.current_thread())
+    )
+
+    assert threads == [threading.current_thread()]
+    assert _verification_count("github", "inline") == before + 1
+
+
+async def test_large_body_verified_in_thread_pool(monkeypatch):
+    monkeypatch.setattr(settings, "hmac_offload_threshold_bytes", 1024)
+    threads = []
+    before = _verification_count("github", "offloaded")
+
+    await hmac_offload.run_verification(
+        "github", 4096, lambda: threads.append(threading.current_thread())
+    )
+
+    assert threads[0].name.startswith("hmac-verify")
+    assert _verification_count("github", "offloaded") == before + 1
+
+
+async def test_offloaded_verification_failure_propagates(monkeypatch):
+    monkeypatch.setattr(settings, "hmac_offload_threshold_bytes", 0)
+    body = b"x" * 4096
+
+    with pytest.raises(SignatureVerificationError):
+        await hmac_offload.run_verification(
+            "github", len(body), verify_github_signature, body, "sha256=" + "0" * 64, "secret"
+        )